@@ -0,0 +1,85 @@
+from display import Display
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class AssetLoader:
+    """
+    This class is used to load images on a worker thread.
+    Pages start loading the images of the next pages while they are shown,
+    so the images are already in the image cache of Display when the next
+    page is created.
+    """
+    WAIT_INTERVAL = 0.05    # Seconds between progress reports
+
+    executor = None
+    futures = {}    # Futures of the images loading, keyed like the cache
+
+    @staticmethod
+    def preload(window, images, backgrounds=()):
+        """
+        This method starts loading the images on the worker thread.
+        Images already loading or loaded are not loaded again.
+
+        input:
+        - window: the window the backgrounds are scaled to
+        - images: the list of (path, scale) of the images
+        - backgrounds: the list of paths of the backgrounds
+
+        return: dict of the futures keyed by (path, scale, size)
+        """
+        if AssetLoader.executor is None:
+            AssetLoader.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="asset-loader")
+
+        futures = {}
+        for path, scale in images:
+            key = (path, scale, None)
+            if key not in AssetLoader.futures:
+                AssetLoader.futures[key] = AssetLoader.executor.submit(
+                    Display.load_img, path, scale)
+            futures[key] = AssetLoader.futures[key]
+        for path in backgrounds:
+            key = (path, None, window.get_size())
+            if key not in AssetLoader.futures:
+                AssetLoader.futures[key] = AssetLoader.executor.submit(
+                    Display.load_bg, window, path)
+            futures[key] = AssetLoader.futures[key]
+        return futures
+
+    @staticmethod
+    def wait(on_progress=None):
+        """
+        This method blocks until every image started is loaded.
+        Errors raised while loading an image are raised here.
+
+        input:
+        - on_progress: a function called with the number of images loaded
+                       and the total number of images, while waiting
+
+        return: None
+        """
+        futures = list(AssetLoader.futures.values())
+        pending = [future for future in futures if not future.done()]
+        while pending:
+            if on_progress is not None:
+                on_progress(len(futures) - len(pending), len(futures))
+            _, pending = wait(pending, timeout=AssetLoader.WAIT_INTERVAL,
+                              return_when=FIRST_COMPLETED)
+        for future in futures:
+            future.result()
+        # The images are in the image cache from now on
+        AssetLoader.futures = {}
+
+    @staticmethod
+    def shutdown():
+        """
+        This method stops the worker thread, dropping images not loaded 
+        yet.
+
+        return: None
+        """
+        if AssetLoader.executor is not None:
+            AssetLoader.executor.shutdown(wait=False, cancel_futures=True)
+            AssetLoader.executor = None
+        AssetLoader.futures = {}
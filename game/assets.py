@@ -0,0 +1,125 @@
+import colorsys
+
+
+class Assets:
+    """
+    This class lists the image assets used by the game and the scale they
+    are drawn at.
+    Every page and game object takes its image paths from here, so tools
+    working on all the assets, such as the atlas builder, do not miss any.
+    """
+    IMG_DIR = "Project/img"
+    ATLAS_DIR = IMG_DIR + "/atlas"
+
+    # Backgrounds, scaled to the window size
+    HOME_BG = IMG_DIR + "/bg_img/home_bg.png"
+    SETUP_BG = IMG_DIR + "/bg_img/setup_bg.png"
+    END_BG = IMG_DIR + "/bg_img/end_bg.png"
+    BACKGROUNDS = [HOME_BG, SETUP_BG, END_BG]
+
+    # Home page buttons
+    START_BUTTON = IMG_DIR + "/button_img/start.png"
+    START_BUTTON_SCALE = 0.3
+    QUIT_BUTTON = IMG_DIR + "/button_img/quit.png"
+    QUIT_BUTTON_SCALE = 0.2
+
+    # Gameboard tiles, in the order of the animal type
+    CAVE_IMAGES = [IMG_DIR + "/cimg/ba_cave.png", IMG_DIR + "/cimg/bd_cave.png",
+                   IMG_DIR + "/cimg/sa_cave.png", IMG_DIR + "/cimg/sp_cave.png"]
+    VOLCANO_IMAGES = [IMG_DIR + "/vimg/ba.png", IMG_DIR + "/vimg/bd.png",
+                      IMG_DIR + "/vimg/sa.png", IMG_DIR + "/vimg/sp.png"]
+    TILE_SCALE = 0.055
+
+    # Dragons, in the order of the players
+    DRAGON_IMAGES = [IMG_DIR + "/pimg/r.png", IMG_DIR + "/pimg/y.png",
+                     IMG_DIR + "/pimg/g.png", IMG_DIR + "/pimg/b.png"]
+    DRAGON_SCALE = 0.11
+    WINNER_SCALE = 1    # The winning dragon shown on the end page
+
+    # Chit cards
+    CHIT_BACK = IMG_DIR + "/ccimg/back.png"
+    CHIT_FRONT = IMG_DIR + "/ccimg/{}{}.png"    # Name and animal number
+    CHIT_SCALE = 0.05
+    CHIT_NAMES = ["baby_d", "bat", "sal", "spi", "p"]
+    CHIT_MAX_NUM = 3
+
+    # Large boards have more animal types and players than images, the
+    # images are used again with a tint for each round of them
+    TINT_SATURATION = 0.45
+    TINT_HUE_STEP = 0.618034    # Golden ratio, so close rounds differ most
+
+    @staticmethod
+    def tint(variant):
+        """
+        This method returns the tint of a round of the images, the first
+        round is not tinted.
+
+        input:
+        - variant: how many times the images were used before
+
+        return: (r, g, b), or None for the first round
+        """
+        if variant == 0:
+            return None
+        hue = (variant * Assets.TINT_HUE_STEP) % 1.0
+        return tuple(int(channel * 255) for channel in colorsys.hsv_to_rgb(
+            hue, Assets.TINT_SATURATION, 1.0))
+
+    @staticmethod
+    def tinted(images, index):
+        """
+        This method returns the image of the index in the images, tinted
+        if the index goes past the images.
+
+        input:
+        - images: the list of image paths, such as CAVE_IMAGES
+        - index: the index of the animal type or player
+
+        return: str, (r, g, b) or None
+        """
+        return images[index % len(images)], Assets.tint(index // len(images))
+
+    @staticmethod
+    def chit_front(name, num):
+        """
+        This method returns the front image path of a chit card.
+
+        input:
+        - name: the name of the animal in the image file
+        - num: the animal number on the chit card
+
+        return: str
+        """
+        return Assets.CHIT_FRONT.format(name, num)
+
+    @staticmethod
+    def game_images():
+        """
+        This method returns the images drawn on the game page with the 
+        scale they are drawn at.
+
+        return: list of (path, scale)
+        """
+        images = [(path, Assets.TILE_SCALE)
+                  for path in Assets.CAVE_IMAGES + Assets.VOLCANO_IMAGES]
+        images += [(path, Assets.DRAGON_SCALE) for path in Assets.DRAGON_IMAGES]
+        images.append((Assets.CHIT_BACK, Assets.CHIT_SCALE))
+        images += [(Assets.chit_front(name, num), Assets.CHIT_SCALE)
+                   for name in Assets.CHIT_NAMES
+                   for num in range(1, Assets.CHIT_MAX_NUM + 1)]
+        return images
+
+    @staticmethod
+    def scaled_images():
+        """
+        This method returns every image drawn by the game with the scale
+        it is drawn at.
+        Backgrounds are not included as they are scaled to the window.
+
+        return: list of (path, scale)
+        """
+        images = [(Assets.START_BUTTON, Assets.START_BUTTON_SCALE),
+                  (Assets.QUIT_BUTTON, Assets.QUIT_BUTTON_SCALE)]
+        images += Assets.game_images()
+        images += [(path, Assets.WINNER_SCALE) for path in Assets.DRAGON_IMAGES]
+        return images
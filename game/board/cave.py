@@ -9,7 +9,7 @@ class Cave(Card, Land):
     A cave does not allow other dragons to enter.
     """
 
-    def __init__(self, id, animal, land, image_path, scale):
+    def __init__(self, id, animal, land, image_path, scale, tint=None):
         """
         This method initializes the cave object.
 
@@ -19,11 +19,12 @@ class Cave(Card, Land):
         - land: the land type of the card
         - image_path: the image path of the cave
         - scale: the scale of the cave image
+        - tint: the (r, g, b) color the image is tinted with, if any
 
         return: None
         """
         Card.__init__(self, animal)
-        Land.__init__(self, land, image_path, scale)
+        Land.__init__(self, land, image_path, scale, tint)
         self.id = id
 
     def get_id(self):
@@ -2,8 +2,11 @@ from board.cave import Cave
 from board.volcano import Volcano
 from board.land_type import LandType
 from gamecard.animal_type import AnimalType
+from assets import Assets
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from spatial_grid import SpatialGrid
 
-import random
 import pygame
 import math
 
@@ -16,10 +19,21 @@ class GameBoard:
     volcanoes on the gameboard.
     The board is represented as a list and every 7th element is a cave, 
     others are volcanoes.
+    The caves and volcanoes are drawn on two rings when they fit in the 
+    window. Larger boards, or more players, are drawn on a spiral in board 
+    order around the chit cards instead, with tiles as large as the window 
+    allows.
+    The gameboard can be seen through a camera. The tiles are indexed in a 
+    spatial grid, so a zoomed view only draws the tiles it shows.
     """
     MIN_CAVE = 4    # Minimum number of caves
+    BG_COLOR = (221, 209, 178)
+    TILE_SIZE = 56          # Width of a tile drawn at the tile scale
+    CENTER_SPACE = 300      # Width of the middle kept for the chit cards
+    GRID_TILES = 4          # Width of a cell of the spatial grid, in tiles
 
-    def __init__(self, window, players, size, animal_num):
+    def __init__(self, window, players, size, animal_num,
+                 volcano_animals=None, rng=None):
         """
         This method initializes the gameboard.
 
@@ -28,6 +42,10 @@ class GameBoard:
         - players: the list of players
         - size: the number of volcanoes
         - animal_num: the number of animal types
+        - volcano_animals: the animal type of each volcano in board order, 
+                           shuffled if None
+        - rng: the GameRng the volcanoes are shuffled with, a new one with
+               a random seed if None
 
         return: None
         """
@@ -35,14 +53,27 @@ class GameBoard:
         self.players = players
         self.size = size
         self.animal_num = animal_num
+        self.volcano_animals = volcano_animals
+        self.rng = rng if rng is not None else GameRng()
         self.player_num = len(self.players)
         # Distance between caves
         self.cave_distance = int(
             self.size / max(GameBoard.MIN_CAVE, self.player_num)) + 1
+        self.cave_num = max(GameBoard.MIN_CAVE, self.player_num)
+        # Size of the tiles against the tiles of the rings
+        self.tile_ratio = GameBoard.get_tile_ratio(
+            self.window, self.size, self.player_num)
         self.caves = self._create_caves()
         self.volcanoes = self._create_volcanoes()
-        self._set_position()    # Set caves and volcanoes' display position
         self.board = self._create_board()
+        # Tiles in the order they are drawn, caves over volcanoes
+        self.tiles = self.volcanoes + self.caves
+        # Caves and volcanoes drawn once on the background, rendered when
+        # the gameboard is first drawn or seen from another view
+        self.layer = None
+        self.layer_key = None
+        self._set_position()    # Set caves and volcanoes' display position
+        self._place_players()
 
     def get_board(self):
         """
@@ -52,6 +83,57 @@ class GameBoard:
         """
         return self.board
 
+    @staticmethod
+    def get_tile_ratio(window, size, player_num):
+        """
+        This method returns the size of the tiles of a gameboard against 
+        the tiles of the rings: 1 if the gameboard is drawn on the rings, 
+        smaller if the tiles have to be shrunk to fit the spiral in the 
+        window.
+        It does not need the gameboard, so the dragons can be scaled 
+        before it is created.
+
+        input:
+        - window: the pygame window
+        - size: the number of volcanoes
+        - player_num: the number of players
+
+        return: float
+        """
+        pitch = GameBoard._spiral_pitch(window.get_width(),
+                                        window.get_height(), size,
+                                        player_num)
+        if pitch is None:
+            return 1.0
+        return min(pitch / GameBoard.TILE_SIZE, 1.0)
+
+    @staticmethod
+    def _spiral_pitch(window_w, window_h, size, player_num):
+        """
+        This method returns the distance between the tiles of the spiral, 
+        so all the tiles fill the window around the chit cards.
+
+        input:
+        - window_w: the width of the window
+        - window_h: the height of the window
+        - size: the number of volcanoes
+        - player_num: the number of players
+
+        return: float, or None if the tiles fit on the rings
+        """
+        cave_num = max(GameBoard.MIN_CAVE, player_num)
+        radius = min(window_w, window_h) / 2 - GameBoard.TILE_SIZE / 2
+        # Radius of the rings, as in _set_cave_pos and _set_vol_pos
+        cave_radius = 43 * (cave_num // 0.6)
+        vol_radius = 43 * (size // 4.5)
+        if max(cave_radius, vol_radius) <= radius:
+            return None
+        # Every tile takes a square of the pitch in the ring around the
+        # chit cards
+        inner = GameBoard.CENTER_SPACE / 2
+        area = math.pi * (radius ** 2 - inner ** 2)
+        return min(math.sqrt(area / (size + cave_num)), GameBoard.TILE_SIZE)
+
     def get_cave_distance(self):
         """
         The getter method to return the distance between caves.
@@ -60,17 +142,71 @@ class GameBoard:
         """
         return self.cave_distance
 
-    def draw(self):
+    def draw(self, camera=None):
         """
         This method is used to draw the gameboard on the window display.
+        The caves and volcanoes do not move, so they are drawn once on a 
+        cached layer which is then copied to the window. The layer is only 
+        drawn again when the camera shows another view.
+
+        input:
+        - camera: the Camera the gameboard is seen through, at home if None
 
         return: None
         """
-        self.window.fill((221, 209, 178))
-        for volcano in self.volcanoes:
-            volcano.draw(self.window)
-        for cave in self.caves:
-            cave.draw(self.window)
+        key = None
+        if camera is not None and not camera.is_home():
+            key = camera.get_key()
+        if self.layer is None or self.layer_key != key:
+            self.layer = self._render_layer(
+                None if key is None else camera)
+            self.layer_key = key
+        self.window.blit(self.layer, (0, 0))
+
+    def get_visible_tiles(self, camera):
+        """
+        This method returns the caves and volcanoes shown by the camera, 
+        in the order they are drawn.
+        A zoomed tile covers the same region of the world as at home, so 
+        the tiles are found from the regions indexed at home.
+
+        input:
+        - camera: the Camera the gameboard is seen through
+
+        return: list
+        """
+        return [self.tiles[i] for i in self.grid.query(camera.get_viewport())]
+
+    def invalidate(self):
+        """
+        This method discards the cached gameboard layer.
+        It must be called whenever the caves or volcanoes change position 
+        so that the layer is rendered again on the next draw.
+
+        return: None
+        """
+        self.layer = None
+
+    def _render_layer(self, camera=None):
+        """
+        This method draws the background, caves and volcanoes on a new 
+        surface of the window size.
+
+        input:
+        - camera: the Camera the gameboard is seen through, only the tiles 
+                  it shows are drawn, every tile at home if None
+
+        return: Surface
+        """
+        layer = pygame.Surface(self.window.get_size()).convert()
+        layer.fill(GameBoard.BG_COLOR)
+        if camera is None:
+            for tile in self.tiles:
+                tile.draw(layer)
+            return layer
+        for tile in self.get_visible_tiles(camera):
+            tile.draw(layer, camera)
+        return layer
 
     def _create_board(self):
         """
@@ -81,14 +217,32 @@ class GameBoard:
 
         return: list
         """
-        board_size = self.size + max(GameBoard.MIN_CAVE, self.player_num)
+        board_size = self.size + self.cave_num
         board = [None] * board_size
-        cave_index_list = [i for i in range(0, board_size, self.cave_distance)]
+        self.cave_index_list = [
+            i for i in range(0, board_size, self.cave_distance)]
 
         # Place the caves on the board
         for i in range(len(self.caves)):
-            board[cave_index_list[i]] = self.caves[i]
+            board[self.cave_index_list[i]] = self.caves[i]
+
+        # Place the volcanoes on the remaining board
+        i = 0
+        for volcano in self.volcanoes:
+            while board[i] is not None:
+                i += 1
+            board[i] = volcano
+
+        return board
+
+    def _place_players(self):
+        """
+        This method puts the players on their cave.
 
+        return: None
+        """
+        cave_index_list = self.cave_index_list
+        board = self.board
         # Mark the position of the players
         for i in range(len(self.players)):
             self.players[i].set_pos(
@@ -105,15 +259,6 @@ class GameBoard:
             self.players[1].set_pos(
                 cave_index_list[2], board[cave_index_list[2]].get_pos())
 
-        # Place the volcanoes on the remaining board
-        i = 0
-        for volcano in self.volcanoes:
-            while board[i] is not None:
-                i += 1
-            board[i] = volcano
-
-        return board
-
     def _create_caves(self):
         """
         This method creates the caves.
@@ -121,37 +266,45 @@ class GameBoard:
 
         return: list
         """
-        # Load cave images path
-        cave_images_path = ["Project/img/cimg/ba_cave.png", "Project/img/cimg/bd_cave.png",
-                            "Project/img/cimg/sa_cave.png", "Project/img/cimg/sp_cave.png"]
         # Create caves
         caves = []
-        scale = 0.055
-        for i in range(max(GameBoard.MIN_CAVE, self.player_num)):
+        scale = Assets.TILE_SCALE * self.tile_ratio
+        for i in range(self.cave_num):
+            animal = GameState.cave_animal(i, self.animal_num)
+            path, tint = Assets.tinted(Assets.CAVE_IMAGES, animal.index())
             caves.append(
-                Cave(i, AnimalType(i), LandType.CAVE, cave_images_path[i], scale))
+                Cave(i, animal, LandType.CAVE, path, scale, tint))
 
         return caves
 
     def _create_volcanoes(self):
         """
         This method creates the volcanoes and shuffle the position.
+        If the animal type of each volcano is given, the volcanoes follow 
+        that order instead.
 
         return: list
         """
-        # Load volcano images
-        volcano_images_path = ["Project/img/vimg/ba.png", "Project/img/vimg/bd.png",
-                               "Project/img/vimg/sa.png", "Project/img/vimg/sp.png"]
         # Create volcanoes
         volcanoes = []
-        scale = 0.055
+        scale = Assets.TILE_SCALE * self.tile_ratio
+        if self.volcano_animals is not None:
+            for animal in self.volcano_animals:
+                path, tint = Assets.tinted(Assets.VOLCANO_IMAGES,
+                                           animal.index())
+                volcanoes.append(
+                    Volcano(animal, LandType.VOLCANO, path, scale, tint))
+            return volcanoes
+
         # A total of (board_size/animal_num) volcanoes will be created for
         # each type of animal
         for i in range(self.animal_num):
+            path, tint = Assets.tinted(Assets.VOLCANO_IMAGES, i)
             for _ in range(int(self.size//self.animal_num)):
                 volcanoes.append(
-                    Volcano(AnimalType(i), LandType.VOLCANO, volcano_images_path[i], scale))
-        random.shuffle(volcanoes)
+                    Volcano(AnimalType.animal(i), LandType.VOLCANO, path,
+                            scale, tint))
+        self.rng.shuffle(volcanoes)
         return volcanoes
 
     def _set_position(self):
@@ -163,8 +316,46 @@ class GameBoard:
         window_w = self.window.get_width()
         window_h = self.window.get_height()
 
-        self._set_cave_pos(window_w, window_h)
-        self._set_vol_pos(window_w, window_h)
+        pitch = GameBoard._spiral_pitch(window_w, window_h, self.size,
+                                        self.player_num)
+        if pitch is None:
+            self._set_cave_pos(window_w, window_h)
+            self._set_vol_pos(window_w, window_h)
+        else:
+            self._set_spiral_pos(window_w, window_h, pitch)
+        # Index the region of every tile at home
+        self.grid = SpatialGrid(
+            GameBoard.TILE_SIZE * self.tile_ratio * GameBoard.GRID_TILES)
+        for tile in self.tiles:
+            self.grid.insert(tile.get_rect())
+        self.invalidate()
+
+    def _set_spiral_pos(self, window_w, window_h, pitch):
+        """
+        This method sets the display position of the caves and volcanoes 
+        on a spiral, in board order, starting around the chit cards.
+        The turns of the spiral are one pitch apart and so are the tiles 
+        along it, so the tiles do not overlap whatever the board size.
+
+        input:
+        - window_w: the width of the window
+        - window_h: the height of the window
+        - pitch: the distance between the tiles
+
+        return: None
+        """
+        center_x = window_w // 2
+        center_y = window_h // 2
+        radius = GameBoard.CENTER_SPACE / 2
+        # The radius grows by one pitch every turn
+        growth = pitch / (2 * math.pi)
+        angle = 0.0
+        for tile in self.board:
+            tile.set_pos(center_x + radius * math.cos(angle),
+                         center_y + radius * math.sin(angle))
+            step = pitch / radius
+            angle += step
+            radius += growth * step
 
     def _set_cave_pos(self, window_w, window_h):
         """
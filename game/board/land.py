@@ -10,7 +10,7 @@ class Land(Drawable, ABC):
     This is where the dragon stands on or started from.
     """
 
-    def __init__(self, land, image_path, scale):
+    def __init__(self, land, image_path, scale, tint=None):
         """
         This method initializes the land object.
 
@@ -18,10 +18,11 @@ class Land(Drawable, ABC):
         - land: the land type of the card
         - image_path: the image path of the land
         - scale: the scale of the land image
+        - tint: the (r, g, b) color the image is tinted with, if any
 
         return: None
         """
-        super().__init__(image_path, scale)
+        super().__init__(image_path, scale, tint)
         self.land_type = land
         self.occupied = False
 
@@ -8,7 +8,7 @@ class Volcano(Card, Land):
     A volcano is where the dragon walks on the board.
     """
 
-    def __init__(self, animal, land, image_path, scale):
+    def __init__(self, animal, land, image_path, scale, tint=None):
         """
         This method initializes the volcano object.
 
@@ -17,11 +17,12 @@ class Volcano(Card, Land):
         - land: the land type of the card
         - image_path: the image path of the volcano
         - scale: the scale of the volcano image
+        - tint: the (r, g, b) color the image is tinted with, if any
 
         return: None
         """
         Card.__init__(self, animal)
-        Land.__init__(self, land, image_path, scale)
+        Land.__init__(self, land, image_path, scale, tint)
         self.dragon_id = None
 
     def can_enter(self, player):
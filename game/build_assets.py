@@ -0,0 +1,210 @@
+from assets import Assets
+from sprite_atlas import SpriteAtlas
+
+import argparse
+import hashlib
+import json
+import os
+import pygame
+
+
+class AtlasBuilder:
+    """
+    This class bakes every image used by the game into sprite atlases.
+    Images drawn at the same scale are packed into one atlas, and the
+    backgrounds are packed at the window size. A manifest records where
+    each sprite is in the atlases.
+    The atlases are only rebuilt if the content of a source image, the
+    list of images or the window size changed.
+
+    Run from the folder containing the Project folder:
+        python Project/game/build_assets.py
+    """
+    MAX_SHEET_WIDTH = 1024  # Sprites are packed in rows up to this width
+    PADDING = 1             # Empty pixels between two sprites
+
+    def __init__(self, window_size):
+        """
+        This method initializes the atlas builder.
+
+        input:
+        - window_size: the (width, height) the backgrounds are scaled to
+
+        return: None
+        """
+        self.window_size = tuple(window_size)
+
+    def build(self, force=False):
+        """
+        This method builds the atlases and the manifest.
+
+        input:
+        - force: rebuild even if nothing changed
+
+        return: bool, True if the atlases were rebuilt
+        """
+        sources = {}
+        for path in self._source_paths():
+            with open(path, "rb") as file:
+                sources[path] = {"sha1": hashlib.sha1(file.read()).hexdigest(),
+                                 "stamp": SpriteAtlas.source_stamp(path)}
+        content_hash = self._content_hash(sources)
+
+        old = self._read_manifest()
+        if (not force and old.get("hash") == content_hash and
+                all(os.path.exists(os.path.join(Assets.ATLAS_DIR, sheet))
+                    for sheet in old.get("sheets", {}))):
+            # Only the modification times may differ, keep the atlases
+            old["sources"] = sources
+            self._write_manifest(old)
+            return False
+
+        os.makedirs(Assets.ATLAS_DIR, exist_ok=True)
+        groups = {}     # Sprites of each atlas keyed by atlas file name
+        for path, scale in Assets.scaled_images():
+            groups.setdefault(f"scale_{scale}.png", []).append(
+                (SpriteAtlas.sprite_key(path, scale=scale),
+                 self._scale(path, scale)))
+        width, height = self.window_size
+        for path in Assets.BACKGROUNDS:
+            image = pygame.transform.smoothscale(pygame.image.load(path),
+                                                 self.window_size)
+            groups.setdefault(f"window_{width}x{height}.png", []).append(
+                (SpriteAtlas.sprite_key(path, size=self.window_size), image))
+
+        sheets = {}
+        sprites = {}
+        for sheet_name, group in groups.items():
+            sheet, rects = self._pack(group)
+            pygame.image.save(sheet, os.path.join(Assets.ATLAS_DIR, sheet_name))
+            sheets[sheet_name] = list(sheet.get_size())
+            for key, rect in rects.items():
+                sprites[key] = {"sheet": sheet_name, "rect": list(rect)}
+
+        # Remove the atlases of an earlier build that are not used anymore
+        for sheet_name in old.get("sheets", {}):
+            if sheet_name not in sheets:
+                try:
+                    os.remove(os.path.join(Assets.ATLAS_DIR, sheet_name))
+                except OSError:
+                    pass
+
+        self._write_manifest({"version": SpriteAtlas.VERSION,
+                              "hash": content_hash,
+                              "window": list(self.window_size),
+                              "sources": sources, "sheets": sheets,
+                              "sprites": sprites})
+        return True
+
+    def _source_paths(self):
+        """
+        This method returns the path of every source image, sorted.
+
+        return: list
+        """
+        return sorted({path for path, _ in Assets.scaled_images()} |
+                      set(Assets.BACKGROUNDS))
+
+    def _content_hash(self, sources):
+        """
+        This method returns the hash identifying the content of a build.
+
+        input:
+        - sources: the hash of every source image keyed by path
+
+        return: str
+        """
+        content = hashlib.sha1()
+        content.update(json.dumps([SpriteAtlas.VERSION, self.window_size,
+                                   Assets.scaled_images()]).encode())
+        for path in sorted(sources):
+            content.update(f"{path}:{sources[path]['sha1']}".encode())
+        return content.hexdigest()
+
+    def _scale(self, path, scale):
+        """
+        This method loads the image and scales it the same way as
+        Display.load_img.
+
+        input:
+        - path: the path of the image
+        - scale: the scale of the image
+
+        return: Surface
+        """
+        image = pygame.image.load(path)
+        return pygame.transform.smoothscale(
+            image, (int(image.get_width() * scale),
+                    int(image.get_height() * scale)))
+
+    def _pack(self, group):
+        """
+        This method packs the sprites in rows, tallest first, into one
+        atlas image.
+
+        input:
+        - group: the list of (key, image) to pack
+
+        return: Surface, dict of the rect of each key
+        """
+        padding = AtlasBuilder.PADDING
+        sheet_width = max([AtlasBuilder.MAX_SHEET_WIDTH] +
+                          [image.get_width() for _, image in group])
+        rects = {}
+        x = y = row_height = 0
+        for key, image in sorted(group, key=lambda item: -item[1].get_height()):
+            w, h = image.get_size()
+            if x + w > sheet_width:
+                x = 0
+                y += row_height + padding
+                row_height = 0
+            rects[key] = (x, y, w, h)
+            x += w + padding
+            row_height = max(row_height, h)
+
+        sheet = pygame.Surface((sheet_width, y + row_height), pygame.SRCALPHA, 32)
+        images = dict(group)
+        for key, rect in rects.items():
+            # Copy the pixels as they are, including their transparency
+            sheet.blit(images[key], rect[:2], special_flags=pygame.BLEND_RGBA_MAX)
+        return sheet, rects
+
+    def _read_manifest(self):
+        """
+        This method reads the manifest of the previous build.
+
+        return: dict, empty if there is none
+        """
+        try:
+            with open(SpriteAtlas.MANIFEST) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest):
+        """
+        This method writes the manifest.
+
+        input:
+        - manifest: the manifest to write
+
+        return: None
+        """
+        with open(SpriteAtlas.MANIFEST, "w") as file:
+            json.dump(manifest, file, indent=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bake the game images into pre-scaled sprite atlases.")
+    parser.add_argument("--window", default="800x600",
+                        help="the window size the backgrounds are scaled to")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild even if no image changed")
+    args = parser.parse_args()
+
+    window_size = [int(n) for n in args.window.lower().split("x")]
+    if AtlasBuilder(window_size).build(args.force):
+        print(f"Atlases written to {Assets.ATLAS_DIR}")
+    else:
+        print("Atlases are up to date")
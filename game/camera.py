@@ -0,0 +1,147 @@
+import math
+import pygame
+
+
+class Camera:
+    """
+    This class is used to pan and zoom over the gameboard.
+    The gameboard is laid out in world coordinates, which are the window
+    coordinates when the camera is at home: not zoomed and centered on
+    the window. The camera maps them to the window and back.
+    The zoom goes by steps, so the images scaled for a zoom level can be
+    cached and used again whenever the camera comes back to it.
+    """
+    ZOOM_STEP = 1.25    # Zoom factor of one step
+    MIN_MAX_ZOOM = 4.0  # Smallest zoom limit, for the boards of the rings
+
+    def __init__(self, width, height, max_zoom=MIN_MAX_ZOOM):
+        """
+        This method initializes the camera at home.
+
+        input:
+        - width: the width of the window
+        - height: the height of the window
+        - max_zoom: the largest zoom, which is rounded up to a step
+
+        return: None
+        """
+        self.width = width
+        self.height = height
+        self.max_level = math.ceil(
+            math.log(max(max_zoom, 1.0)) / math.log(Camera.ZOOM_STEP))
+        self.reset()
+
+    def reset(self):
+        """
+        This method puts the camera back at home.
+
+        return: None
+        """
+        self.level = 0
+        self.zoom = 1.0
+        self.center_x = self.width / 2
+        self.center_y = self.height / 2
+
+    def is_home(self):
+        """
+        This method checks if the camera is at home, where world and
+        window coordinates are the same.
+
+        return: bool
+        """
+        return (self.level == 0 and self.center_x == self.width / 2 and
+                self.center_y == self.height / 2)
+
+    def get_key(self):
+        """
+        This method returns what the camera shows, to tell when a view
+        drawn before can be used again.
+
+        return: tuple
+        """
+        return (self.level, self.center_x, self.center_y)
+
+    def to_screen(self, x, y):
+        """
+        This method converts a world position to the window.
+
+        input:
+        - x: the world x-coordinate
+        - y: the world y-coordinate
+
+        return: (float, float)
+        """
+        return ((x - self.center_x) * self.zoom + self.width / 2,
+                (y - self.center_y) * self.zoom + self.height / 2)
+
+    def to_world(self, x, y):
+        """
+        This method converts a window position to the world.
+
+        input:
+        - x: the window x-coordinate
+        - y: the window y-coordinate
+
+        return: (float, float)
+        """
+        return ((x - self.width / 2) / self.zoom + self.center_x,
+                (y - self.height / 2) / self.zoom + self.center_y)
+
+    def get_viewport(self):
+        """
+        This method returns the region of the world shown in the window.
+
+        return: Rect
+        """
+        left, top = self.to_world(0, 0)
+        right, bottom = self.to_world(self.width, self.height)
+        return pygame.Rect(math.floor(left), math.floor(top),
+                           math.ceil(right - left) + 1,
+                           math.ceil(bottom - top) + 1)
+
+    def pan(self, dx, dy):
+        """
+        This method moves the view by a distance in the window.
+        The center of the view stays on the world of the window, so the
+        gameboard cannot be lost off screen.
+
+        input:
+        - dx: the distance to move the view right, in window pixels
+        - dy: the distance to move the view down, in window pixels
+
+        return: bool, whether the view moved
+        """
+        old = self.get_key()
+        self.center_x = min(max(self.center_x + dx / self.zoom, 0),
+                            self.width)
+        self.center_y = min(max(self.center_y + dy / self.zoom, 0),
+                            self.height)
+        if self.level == 0:
+            # The whole world is shown when not zoomed
+            self.center_x = self.width / 2
+            self.center_y = self.height / 2
+        return self.get_key() != old
+
+    def zoom_at(self, steps, x, y):
+        """
+        This method zooms in or out by steps, keeping the world position
+        under the window position in place, such as the one under the
+        mouse.
+
+        input:
+        - steps: the number of steps, negative to zoom out
+        - x: the window x-coordinate kept in place
+        - y: the window y-coordinate kept in place
+
+        return: bool, whether the view changed
+        """
+        level = min(max(self.level + steps, 0), self.max_level)
+        if level == self.level:
+            return False
+        world_x, world_y = self.to_world(x, y)
+        self.level = level
+        self.zoom = Camera.ZOOM_STEP ** level
+        # Move the view so the world position is back under (x, y)
+        screen_x, screen_y = self.to_screen(world_x, world_y)
+        self.pan(screen_x - x, screen_y - y)
+        return True
@@ -0,0 +1,72 @@
+import pygame
+
+
+class DirtyTracker:
+    """
+    This class is used to collect the regions of the window that changed
+    since the last display update.
+    Only those regions need to be redrawn and presented, which is much
+    cheaper than updating the whole window when a single object changed.
+    If too many regions changed, or something was drawn over the whole
+    window, the tracker asks for a full update instead.
+    """
+    MAX_RECTS = 32  # Above this number of regions a full update is cheaper
+
+    def __init__(self):
+        """
+        This method initializes the dirty tracker.
+        A full update is needed at the start as nothing is drawn yet.
+
+        return: None
+        """
+        self.rects = []
+        self.full = True
+
+    def mark(self, rect):
+        """
+        This method marks the region of the window as changed.
+
+        input:
+        - rect: the changed region
+
+        return: None
+        """
+        if self.full:
+            return
+        if len(self.rects) >= DirtyTracker.MAX_RECTS:
+            self.mark_all()
+        else:
+            self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        """
+        This method marks the whole window as changed.
+
+        return: None
+        """
+        self.full = True
+        self.rects = []
+
+    def flush(self):
+        """
+        This method returns the changed regions and resets the tracker.
+        Overlapping regions are merged so that no pixel is redrawn twice.
+        None is returned if the whole window has to be updated.
+
+        return: list or None
+        """
+        if self.full:
+            self.full = False
+            self.rects = []
+            return None
+
+        merged = []
+        for rect in self.rects:
+            # Keep merging until the rect no longer overlaps another one
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        self.rects = []
+        return merged
@@ -1,3 +1,6 @@
+from surface_cache import SurfaceCache
+from sprite_atlas import SpriteAtlas
+
 import pygame
 import sys
 
@@ -7,6 +10,15 @@ class Display:
     This class is basically the utility class.
     It is used to manipulate the display of the game.
     """
+    # Loaded images are shared by every drawable using the same asset
+    IMAGE_CACHE_BUDGET = 64 * 1024 * 1024   # In bytes
+    image_cache = SurfaceCache(IMAGE_CACHE_BUDGET)
+    # Rendered text is reused by labels drawn again on every frame
+    TEXT_CACHE_BUDGET = 4 * 1024 * 1024     # In bytes
+    text_cache = SurfaceCache(TEXT_CACHE_BUDGET)
+    FONT_FAMILY = 'arial'
+    fonts = {}  # Resolved fonts keyed by (family, size)
+
     @staticmethod
     def draw_text(window, text, size, color, x, y, update_display=True):
         """
@@ -23,8 +35,7 @@ class Display:
 
         return: None
         """
-        font = pygame.font.SysFont('arial', size)
-        text_output = font.render(text, True, color)
+        text_output = Display.render_text(text, size, color)
         text_rect = text_output.get_rect()
         text_rect.center = (x, y)
         window.blit(text_output, text_rect)
@@ -32,6 +43,44 @@ class Display:
         if update_display:
             pygame.display.update()
 
+    @staticmethod
+    def get_font(size, family=None):
+        """
+        This method returns the font of the family in the size.
+        Looking up a system font is slow, so each font is only resolved 
+        once.
+
+        input:
+        - size: the size of the font
+        - family: the font family, the default family if None
+
+        return: The font
+        """
+        key = (family or Display.FONT_FAMILY, size)
+        font = Display.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(key[0], size)
+            Display.fonts[key] = font
+        return font
+
+    @staticmethod
+    def render_text(text, size, color):
+        """
+        This method renders the text in the default font.
+        The rendered text is cached, so it must not be drawn on.
+
+        input:
+        - text: the text to render
+        - size: the size of the text
+        - color: the color of the text
+
+        return: The rendered text surface
+        """
+        color = tuple(color)
+        return Display.text_cache.get(
+            (text, size, color),
+            lambda: Display.get_font(size).render(text, True, color))
+
     @staticmethod
     def draw_img(window, image, x, y):
         """
@@ -54,35 +103,60 @@ class Display:
         """
         This method loads the background image from the path and 
         scale the image.
+        The scaled image is cached, so it must not be drawn on.
 
         input:
         - path: the path of the background image
 
         return: The scaled background image
         """
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.smoothscale(
-            img, (window.get_width(), window.get_height()))
-        return img
+        size = (window.get_width(), window.get_height())
+
+        def loader():
+            img = SpriteAtlas.get(path, size=size)
+            if img is None:
+                img = pygame.image.load(path).convert_alpha()
+                img = pygame.transform.smoothscale(img, size)
+            return img
+
+        return Display.image_cache.get((path, None, size), loader)
 
     @staticmethod
-    def load_img(path, scale):
+    def load_img(path, scale, tint=None):
         """
         This method loads the image from the path and scale the 
         image.
+        The scaled image is taken from the sprite atlases if they have it.
+        The scaled image is cached and shared with every caller loading the 
+        same path at the same scale, so it must not be drawn on.
+        A tinted image is made once from the scaled image and cached too.
 
         input:
         - path: the path of the image
         - scale: the scale of the image
+        - tint: the (r, g, b) color the image is multiplied by, if any
 
         return: The scaled image
         """
-        img = pygame.image.load(path).convert_alpha()
-        width = img.get_width()
-        height = img.get_height()
-        scale_img = pygame.transform.smoothscale(
-            img, (int(width * scale), int(height * scale)))
-        return scale_img
+        if tint is not None:
+            def tinter():
+                img = Display.load_img(path, scale).copy()
+                img.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+                return img
+
+            return Display.image_cache.get((path, scale, None, tint), tinter)
+
+        def loader():
+            img = SpriteAtlas.get(path, scale=scale)
+            if img is not None:
+                return img
+            img = pygame.image.load(path).convert_alpha()
+            width = img.get_width()
+            height = img.get_height()
+            return pygame.transform.smoothscale(
+                img, (int(width * scale), int(height * scale)))
+
+        return Display.image_cache.get((path, scale, None), loader)
 
     @staticmethod
     def quit():
@@ -91,5 +165,8 @@ class Display:
 
         return: None
         """
+        # The import is done inside the method to avoid circular import
+        from asset_loader import AssetLoader
+        AssetLoader.shutdown()
         pygame.quit()
         sys.exit()
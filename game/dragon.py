@@ -1,4 +1,5 @@
 from drawable import Drawable
+from assets import Assets
 from board.land_type import LandType
 
 
@@ -9,7 +10,7 @@ class Dragon(Drawable):
     It is the thing that moves around the board.
     """
 
-    def __init__(self, id, img_path, scale):
+    def __init__(self, id, img_path, scale, tint=None):
         """
         This method initializes the dragon object.
 
@@ -17,10 +18,11 @@ class Dragon(Drawable):
         - id: the id of the dragon
         - img_path: the path of the dragon image
         - scale: the scale of the dragon image
+        - tint: the (r, g, b) color the image is tinted with, if any
 
         return: None
         """
-        super().__init__(img_path, scale)
+        super().__init__(img_path, scale, tint)
         self.id = id
         self.img_path = img_path
         self.board_pos = None
@@ -41,6 +43,28 @@ class Dragon(Drawable):
         """
         return self.img_path
 
+    def get_image(self, zoom):
+        """
+        The dragon grows with the zoom, but not past the size it has on 
+        the boards of the rings.
+
+        input:
+        - zoom: the zoom of the camera
+
+        return: Surface
+        """
+        zoom = max(1.0, min(zoom, Assets.DRAGON_SCALE / self.scale))
+        return super().get_image(zoom)
+
+    def get_tint(self):
+        """
+        The getter method to return the color the dragon image is tinted
+        with.
+
+        return: tuple, or None if not tinted
+        """
+        return self.tint
+
     def set_id(self, id):
         """
         The setter method to set the id of the dragon.
@@ -1,42 +1,91 @@
 from abc import ABC, abstractmethod
 from display import Display
+from dirty_tracker import DirtyTracker
 
 
 class Drawable(ABC):
     """
     Represents an abstract class for a drawable object.
     A drawable object is an object that can be drawn on the screen.
+    Every change to the display of a drawable object is recorded in the 
+    shared dirty tracker so that only the changed regions are redrawn.
     """
+    dirty_tracker = DirtyTracker()
 
-    def __init__(self, image_path, scale):
+    def __init__(self, image_path, scale, tint=None):
         """
         Initializes the drawable object.
 
         input:
         - image_path: the image path of the drawable object
         - scale: the scale of the drawable object's image
+        - tint: the (r, g, b) color the image is tinted with, if any
 
         return: None
         """
-        self.image = Display.load_img(image_path, scale)
+        self.image = Display.load_img(image_path, scale, tint)
+        self.image_path = image_path
+        self.scale = scale
+        self.tint = tint
         self.x = None
         self.y = None
 
-    def draw(self, window):
+    def draw(self, window, camera=None):
         """
         Call Display static method to draw the image on the 
         window.
 
         input:
         - window: the window to draw the image on
+        - camera: the Camera the object is seen through, the object is 
+                  drawn at its own position and size if None
 
         return: None
         """
-        Display.draw_img(window, self.image, self.x, self.y)
+        if camera is None:
+            Display.draw_img(window, self.image, self.x, self.y)
+            return
+        x, y = camera.to_screen(self.x, self.y)
+        Display.draw_img(window, self.get_image(camera.zoom), x, y)
+
+    def get_image(self, zoom):
+        """
+        Get the image the object was created with, scaled by the zoom.
+        The zoomed images are cached like the others, so each zoom level 
+        is only scaled once.
+
+        input:
+        - zoom: the zoom of the camera
+
+        return: Surface
+        """
+        if zoom == 1:
+            return self.image
+        return Display.load_img(self.image_path, self.scale * zoom, self.tint)
+
+    def get_rect(self):
+        """
+        Get the region of the window covered by the drawable object.
+
+        return: Rect
+        """
+        return self.image.get_rect(center=(self.x, self.y))
+
+    def mark_dirty(self):
+        """
+        Mark the region covered by the drawable object as changed.
+        Nothing is marked if the object has not been positioned yet.
+
+        return: None
+        """
+        if self.x is not None:
+            Drawable.dirty_tracker.mark(self.get_rect())
 
     def set_pos(self, x, y):
         """
         Set the display coordinate of the drawable object.
+        Both the old and the new region of the object are marked as 
+        changed.
 
         input:
         - x: the x-coordinate of the object for display
@@ -44,5 +93,7 @@ class Drawable(ABC):
 
         return: None
         """
+        self.mark_dirty()
         self.x = x
         self.y = y
+        self.mark_dirty()
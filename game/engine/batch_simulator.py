@@ -0,0 +1,335 @@
+from engine.game_state import GameState
+from engine.simulator import SimulationStats, Simulator
+from engine.transition_table import TransitionTable
+from gamecard.animal_type import AnimalType
+
+import numpy as np
+
+
+class BatchSimulator:
+    """
+    This class plays many games at once in lockstep with NumPy.
+    Every game of the batch is a row of the arrays, and one step flips a
+    chit card in every game with array operations, following the same
+    rules as GameState.apply_flip. Players pick a hidden chit card at
+    random.
+    A finished game is recorded and its row starts a new game, so the
+    batch stays full until the last games.
+    """
+    EMPTY = GameState.NO_SEAT   # Occupant of an empty tile
+    NO_WINNER = -1
+    MAX_DECK = 16       # Largest deck chit cards can be picked at random in
+    PICK_TABLE = None   # Built on first use by pick_table
+
+    def __init__(self, player_num, size=24, animal_num=4, batch=4096,
+                 seed=None):
+        """
+        This method initializes the simulator with an empty batch.
+
+        input:
+        - player_num: the number of players
+        - size: the number of volcanoes
+        - animal_num: the number of animal types on the volcanoes
+        - batch: the number of games played at once
+        - seed: the seed of the random number generator, random if None
+
+        return: None
+        """
+        deck = GameState.standard_deck(animal_num)
+        if len(deck) > BatchSimulator.MAX_DECK:
+            raise ValueError(
+                f"{animal_num} animal types make a deck of {len(deck)} chit "
+                f"cards, the lockstep simulator picks from at most "
+                f"{BatchSimulator.MAX_DECK}")
+        layout = GameState(player_num, size, animal_num, deck=[])
+        self.player_num = player_num
+        self.size = size
+        self.animal_num = animal_num
+        self.batch = batch
+        self.rng = np.random.default_rng(seed)
+
+        # Board layout shared by every game
+        self.board_size = layout.board_size
+        self.homes = np.array(layout.homes, dtype=np.int64)
+        self.lands = np.frombuffer(layout.lands, dtype=np.int8).copy()
+        self.owners = np.array(layout.owners, dtype=np.int8)
+        self._set_table(layout.table)
+        self.volcano_tiles = np.flatnonzero(self.lands == GameState.VOLCANO)
+        self.volcanoes = np.repeat(
+            np.array([AnimalType.animal(animal).value
+                      for animal in range(animal_num)], np.int8),
+            size // animal_num)
+        self.card_animals = np.array([a.value for a, _ in deck], np.int8)
+        self.card_steps = np.array([n for _, n in deck], np.int8)
+        deck_size = len(deck)
+
+        # State of every game, one row per game
+        self.animals = np.zeros((batch, self.board_size), np.int8)
+        self.animals[:, layout.cave_positions] = np.array(
+            [layout.animals[pos] for pos in layout.cave_positions], np.int8)
+        self.deck_animals = np.zeros((batch, deck_size), np.int8)
+        self.deck_steps = np.zeros((batch, deck_size), np.int8)
+        self.positions = np.zeros((batch, player_num), np.int64)
+        self.occupants = np.full((batch, self.board_size),
+                                 BatchSimulator.EMPTY, np.int8)
+        self.revealed = np.zeros(batch, np.int64)  # Bit mask of the chit cards
+        self.revealed_num = np.zeros(batch, np.int64)
+        self.current = np.zeros(batch, np.int64)
+        self.winner = np.full(batch, BatchSimulator.NO_WINNER, np.int64)
+        self.live = np.zeros(batch, bool)   # Rows holding a game
+
+        # Counters of every game for the statistics
+        self.turns = np.zeros(batch, np.int64)
+        self.flips = np.zeros(batch, np.int64)
+        self.penalties = np.zeros(batch, np.int64)
+        self.penalty_moves = np.zeros(batch, np.int64)
+
+    @staticmethod
+    def from_states(states):
+        """
+        This method creates a batch holding a copy of each game state, in
+        the same order.
+
+        input:
+        - states: the list of GameState, with the same layout and deck
+                  size
+
+        return: BatchSimulator
+        """
+        first = states[0]
+        sim = BatchSimulator(first.player_num, first.size, first.animal_num,
+                             len(states))
+        sim.deck_animals = np.zeros((len(states), len(first.deck_animals)),
+                                    np.int8)
+        sim.deck_steps = np.zeros_like(sim.deck_animals)
+        sim._set_table(first.table)
+        for row, state in enumerate(states):
+            sim.animals[row] = state.animals
+            sim.deck_animals[row] = np.frombuffer(state.deck_animals, np.int8)
+            sim.deck_steps[row] = np.frombuffer(state.deck_steps, np.int8)
+            sim.positions[row] = state.positions
+            sim.occupants[row] = state.occupants
+            sim.revealed[row] = sum(1 << card for card, revealed in
+                                    enumerate(state.revealed) if revealed)
+            sim.revealed_num[row] = state.revealed_num
+            sim.current[row] = state.current_player
+            if state.winner is not None:
+                sim.winner[row] = state.winner
+        sim.live[:] = True
+        return sim
+
+    def run(self, games):
+        """
+        This method plays the games and returns their statistics.
+
+        input:
+        - games: the number of games to play
+
+        return: SimulationStats
+        """
+        stats = SimulationStats(self.player_num)
+        started = min(games, self.batch)
+        self._new_games(np.arange(started))
+        while self.live.any():
+            self.step()
+            done = self.live & ((self.winner != BatchSimulator.NO_WINNER) |
+                                (self.flips >= Simulator.MAX_FLIPS))
+            if not done.any():
+                continue
+            rows = np.flatnonzero(done)
+            for row in rows:
+                winner = int(self.winner[row])
+                stats.add_game(None if winner == BatchSimulator.NO_WINNER
+                               else winner, int(self.turns[row]),
+                               int(self.flips[row]), int(self.penalties[row]),
+                               int(self.penalty_moves[row]))
+            self.live[rows] = False
+            # Start the remaining games in the rows freed
+            new = rows[:games - started]
+            started += len(new)
+            self._new_games(new)
+        return stats
+
+    def step(self, cards=None):
+        """
+        This method flips a chit card in every game being played.
+        The 2 dimensional arrays are read through flat indexes, which is
+        several times faster than indexing them by row and column.
+
+        input:
+        - cards: the index of the chit card to flip in each row, a hidden
+                 chit card picked at random if None
+
+        return: None
+        """
+        g = np.flatnonzero(self.live &
+                           (self.winner == BatchSimulator.NO_WINNER))
+        if len(g) == 0:
+            return
+        n = self.board_size
+        deck_size = self.deck_animals.shape[1]
+        revealed = self.revealed[g]
+        revealed_num = self.revealed_num[g]
+        if cards is None:
+            if deck_size > BatchSimulator.MAX_DECK:
+                raise ValueError("the deck is too large to pick at random")
+            # Pick the r-th hidden chit card, r taken at random
+            r = (self.rng.random(len(g)) *
+                 (deck_size - revealed_num)).astype(np.int64)
+            cards = self.pick_table()[revealed * deck_size + r]
+        else:
+            cards = np.asarray(cards)[g]
+        cards = cards.astype(np.int64)
+
+        revealed |= (1 << cards).astype(revealed.dtype)
+        revealed_num += 1
+        self.flips[g] += 1
+        card_index = g * deck_size + cards
+        animal = self.deck_animals.ravel()[card_index]
+        step = self.deck_steps.ravel()[card_index].astype(np.int64)
+        seat = self.current[g]
+        seat_index = g * self.player_num + seat
+        pos = self.positions.ravel()[seat_index]
+        board = g * n   # Flat index of the first tile of each game
+
+        pirate = animal == AnimalType.DRAGON_PIRATE.value
+        match = ~pirate & (self.animals.ravel()[board + pos] == animal)
+        end_turn = ~pirate & ~match
+
+        # Destination of the moves, as GameState.apply_flip
+        movers = np.flatnonzero(pirate | match)
+        i = ((seat[movers] * n + pos[movers]) * self.table_width +
+             np.where(pirate[movers], -step[movers], step[movers]) +
+             self.max_step)
+        destination = self.destinations[i]
+        flags = self.flags[i]
+        end_turn[movers] |= (flags & (TransitionTable.END_TURN |
+                                      TransitionTable.BLOCKED)) != 0
+        end_game = np.zeros(len(g), bool)
+        end_game[movers] = (flags & TransitionTable.END_GAME) != 0
+        moving = ((flags & (TransitionTable.END_TURN |
+                            TransitionTable.BLOCKED)) == 0) & \
+            (destination != TransitionTable.NO_MOVE)
+
+        # Move the players, as GameState._move. The destination is the
+        # player's cave or a volcano, which may be occupied
+        m = movers[moving]
+        bm, sm, dm = board[m], seat[m], destination[moving]
+        displace = ((self.lands[dm] == GameState.VOLCANO) &
+                    (self.occupants.ravel()[bm + dm] != BatchSimulator.EMPTY))
+        bd = bm[displace]
+        others = self.occupants.ravel()[bd + dm[displace]].astype(np.int64)
+        self._place(g[m], sm, dm)
+        if len(others):
+            # Nearest free volcano before the destination, jumping over
+            # the occupied ones
+            tiles = self.prev_volcanoes[dm[displace]]
+            busy = np.flatnonzero(self.occupants.ravel()[bd + tiles] !=
+                                  BatchSimulator.EMPTY)
+            while len(busy):
+                tiles[busy] = self.prev_volcanoes[tiles[busy]]
+                busy = busy[self.occupants.ravel()[bd[busy] + tiles[busy]] !=
+                            BatchSimulator.EMPTY]
+            self._place(g[m[displace]], others, tiles)
+
+        self.penalties[g] += pirate
+        moved_all = np.zeros(len(g), bool)
+        moved_all[m] = True
+        self.penalty_moves[g] += pirate & moved_all
+
+        self.winner[g[end_game]] = seat[end_game]
+        next_player = ~end_game & (end_turn | (revealed_num == deck_size))
+        self.turns[g] += next_player | end_game
+        self.current[g] = np.where(next_player,
+                                   (seat + 1) % self.player_num, seat)
+        self.revealed[g] = np.where(next_player, 0, revealed)
+        self.revealed_num[g] = np.where(next_player, 0, revealed_num)
+
+    @classmethod
+    def pick_table(cls):
+        """
+        This method returns the table of the r-th hidden chit card of a
+        standard deck, indexed by revealed mask * deck size + r.
+        The table is built once.
+
+        return: array
+        """
+        if cls.PICK_TABLE is None:
+            deck_size = BatchSimulator.MAX_DECK
+            masks = np.arange(1 << deck_size)
+            hidden = ((masks[:, None] >> np.arange(deck_size)) & 1) == 0
+            counts = hidden.cumsum(axis=1)
+            table = np.zeros((1 << deck_size, deck_size), np.int8)
+            for r in range(deck_size):
+                table[:, r] = (counts > r).argmax(axis=1)
+            cls.PICK_TABLE = table.ravel()
+        return cls.PICK_TABLE
+
+    def _set_table(self, table):
+        """
+        This method sets the transition table the moves and the volcano
+        before each tile are looked up in.
+
+        input:
+        - table: the TransitionTable of the layout
+
+        return: None
+        """
+        self.destinations = np.array(table.destinations, np.int64)
+        self.flags = np.frombuffer(bytes(table.flags), np.uint8)
+        self.table_width = table.width
+        self.max_step = table.max_step
+        self.prev_volcanoes = np.array(table.prev_volcanoes, np.int64)
+
+    def _place(self, g, seat, tile):
+        """
+        This method moves the players from their tile to the tiles, as
+        GameState._place.
+
+        input:
+        - g: the rows of the games, each row at most once
+        - seat: the seat of the player in each game
+        - tile: the board index of the new tile in each game
+
+        return: None
+        """
+        occupants = self.occupants.ravel()
+        board = g * self.board_size
+        seat_index = g * self.player_num + seat
+        old = self.positions.ravel()[seat_index]
+        left = occupants[board + old] == seat
+        occupants[(board + old)[left]] = BatchSimulator.EMPTY
+        occupants[board + tile] = seat
+        self.positions.ravel()[seat_index] = tile
+
+    def _new_games(self, rows):
+        """
+        This method starts a new game with a shuffled board and deck in
+        each row.
+
+        input:
+        - rows: the rows of the games
+
+        return: None
+        """
+        count = len(rows)
+        if count == 0:
+            return
+        order = self.rng.random((count, self.size)).argsort(axis=1)
+        self.animals[rows[:, None], self.volcano_tiles] = self.volcanoes[order]
+        order = self.rng.random((count, len(self.card_animals))).argsort(axis=1)
+        self.deck_animals[rows] = self.card_animals[order]
+        self.deck_steps[rows] = self.card_steps[order]
+
+        self.positions[rows] = self.homes
+        self.occupants[rows] = BatchSimulator.EMPTY
+        self.occupants[rows[:, None], self.homes] = np.arange(self.player_num)
+        self.revealed[rows] = 0
+        self.revealed_num[rows] = 0
+        self.current[rows] = 0
+        self.winner[rows] = BatchSimulator.NO_WINNER
+        self.turns[rows] = 0
+        self.flips[rows] = 0
+        self.penalties[rows] = 0
+        self.penalty_moves[rows] = 0
+        self.live[rows] = True
@@ -0,0 +1,250 @@
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from engine.mcts_policy import MctsPolicy
+from engine.transposition_table import TranspositionTable
+
+
+class ExpectimaxPolicy:
+    """
+    This class is a card picking policy that remembers every chit card
+    flipped and searches the rest of the turn with expectimax.
+    A chit card seen before is known, the others may be any chit card not
+    seen yet, with a probability given by how many are left. Hidden chit
+    cards known to be alike, or never seen, lead to the same positions, so
+    only one of them is searched.
+    A turn ends on a mismatch, so the search goes down the flips of the
+    turn until it ends, or until the depth, and the positions are then
+    valued by how far each dragon is from his cave.
+    The positions searched are kept in a transposition table keyed by
+    their Zobrist hash, which is updated with each flip instead of hashing
+    the whole position again.
+    """
+    USES_JOURNAL = True     # The chit cards flipped are read in the journal
+    WIN = 1000.0            # Value of winning the game
+    KEY_BITS = 64
+
+    def __init__(self, rng=None, depth=4, table_bits=16):
+        """
+        This method initializes the policy.
+
+        input:
+        - rng: the random number generator, a GameRng with a random seed
+               if None, which breaks the ties between chit cards
+        - depth: the largest number of flips searched
+        - table_bits: the transposition table has 2 ** table_bits slots
+
+        return: None
+        """
+        self.rng = rng if rng is not None else GameRng()
+        self.depth = depth
+        self.table = TranspositionTable(table_bits)
+        self.zobrist = None     # Keys of the layout searched, made on use
+        self.layout = None
+
+    def choose(self, state):
+        """
+        This method picks the chit card to flip.
+
+        input:
+        - state: the game state
+
+        return: int, the index of the chit card
+        """
+        hidden = state.hidden_cards()
+        if len(hidden) == 1:
+            return hidden[0]
+        board = state.copy()
+        known, _, pool = MctsPolicy.knowledge(state)
+        self.kinds = sorted(set(pool))
+        self.left = [pool.count(kind) for kind in self.kinds]
+        self.known = known
+        self.deck_animals = bytearray(state.deck_animals)
+        self.deck_steps = bytearray(state.deck_steps)
+        board.deck_animals = self.deck_animals
+        board.deck_steps = self.deck_steps
+        self.table.new_search()
+        key = self._root_key(board)
+
+        values = {}
+        for card in self._candidates(board):
+            values[card] = self._flip_value(board, card, self.depth, key)
+        board.undone.clear()
+        best = max(values.values())
+        cards = [card for card in hidden if card in values and
+                 values[card] >= best - 1e-9]
+        # The chit cards alike to the best ones can be flipped too
+        kinds = set(known.get(card) for card in cards)
+        return self.rng.choice([card for card in hidden
+                                if known.get(card) in kinds])
+
+    def _candidates(self, board):
+        """
+        This method returns the hidden chit cards worth searching: the
+        first known one of each kind and the first unknown one, as the
+        others lead to the same positions.
+
+        input:
+        - board: the game state searched on
+
+        return: list of chit card indexes
+        """
+        cards = []
+        kinds = set()
+        for card in board.hidden_cards():
+            kind = self.known.get(card)
+            if kind not in kinds:
+                kinds.add(kind)
+                cards.append(card)
+        return cards
+
+    def _value(self, board, depth, key):
+        """
+        This method returns the value of the best chit card for the
+        current player, whose turn goes on.
+
+        input:
+        - board: the game state searched on
+        - depth: the number of flips left to search
+        - key: the Zobrist hash of the position
+
+        return: float
+        """
+        value = self.table.probe(key, depth)
+        if value is not None:
+            return value
+        value = max(self._flip_value(board, card, depth, key)
+                    for card in self._candidates(board))
+        self.table.store(key, depth, value)
+        return value
+
+    def _flip_value(self, board, card, depth, key):
+        """
+        This method returns the expected value of flipping the chit card.
+        An unknown chit card is any kind of chit card left, weighted by how
+        many are left. A chit card not matching ends the turn without
+        moving, so it is valued without being flipped.
+
+        input:
+        - board: the game state searched on
+        - card: the index of the chit card
+        - depth: the number of flips left to search
+        - key: the Zobrist hash of the position
+
+        return: float
+        """
+        seat = board.current_player
+        animal = board.animals[board.occupancy.positions[seat]]
+        if card in self.known:
+            if self.known[card][0] not in (animal, GameState.PIRATE):
+                return self._evaluate(board, seat)
+            return self._outcome(board, card, depth, key)
+
+        total = sum(self.left)
+        value = 0.0
+        mismatches = 0
+        card_keys = self.zobrist[2]
+        for kind, count in enumerate(self.left):
+            if not count:
+                continue
+            # Every chit card not matching ends the turn the same way
+            if self.kinds[kind][0] not in (animal, GameState.PIRATE):
+                mismatches += count
+                continue
+            self.deck_animals[card], self.deck_steps[card] = self.kinds[kind]
+            # The key tells apart which kinds of chit cards are left
+            self.left[kind] -= 1
+            value += count / total * self._outcome(
+                board, card, depth, key ^ card_keys[kind][count - 1])
+            self.left[kind] += 1
+        if mismatches:
+            value += mismatches / total * self._evaluate(board, seat)
+        return value
+
+    def _outcome(self, board, card, depth, key):
+        """
+        This method flips the chit card, values the position reached and
+        undoes the flip.
+
+        input:
+        - board: the game state searched on
+        - card: the index of the chit card, dealt in the deck
+        - depth: the number of flips left to search
+        - key: the Zobrist hash of the position before the flip
+
+        return: float
+        """
+        seat = board.current_player
+        result = board.apply_flip(card)
+        if result.end_game:
+            # Winning sooner is better, as the turn may end before
+            value = ExpectimaxPolicy.WIN + depth
+        elif result.end_turn or depth <= 1:
+            value = self._evaluate(board, seat)
+        else:
+            tile_keys, revealed_keys = self.zobrist[0], self.zobrist[1]
+            key ^= revealed_keys[card]
+            for dragon, old, new in result.moves:
+                key ^= tile_keys[dragon][old] ^ tile_keys[dragon][new]
+            value = self._value(board, depth - 1, key)
+        board.undo()
+        return value
+
+    def _evaluate(self, board, seat):
+        """
+        This method values the position for the player: how much further
+        the other dragons are from their cave than his dragon, on average.
+
+        input:
+        - board: the game state searched on
+        - seat: the seat of the player
+
+        return: float
+        """
+        n = board.board_size
+        homes = board.homes
+        distances = [(homes[dragon] - pos) % n or n for dragon, pos in
+                     enumerate(board.occupancy.positions)]
+        others = (sum(distances) - distances[seat]) / (board.player_num - 1)
+        return others - distances[seat]
+
+    def _root_key(self, board):
+        """
+        This method returns the Zobrist hash of the position: the seat to
+        play, the tile of each dragon, the chit cards revealed and the
+        chit cards known.
+        The keys are made again when the layout changes.
+
+        input:
+        - board: the game state searched on
+
+        return: int
+        """
+        layout = (board.player_num, board.board_size, len(board.revealed))
+        if self.layout != layout:
+            rng = GameRng(GameRng.derive(0, "zobrist", *layout))
+            bits = ExpectimaxPolicy.KEY_BITS
+            deck_size = len(board.revealed)
+            tile_keys = [[rng.getrandbits(bits) for _ in range(n)]
+                         for n in [board.board_size] * board.player_num]
+            revealed_keys = [rng.getrandbits(bits) for _ in range(deck_size)]
+            # Keys of the kinds of chit cards, by how many are left
+            card_keys = [[rng.getrandbits(bits) for _ in range(deck_size)]
+                         for _ in range(deck_size)]
+            known_keys = [rng.getrandbits(bits) for _ in range(deck_size)]
+            seat_keys = [rng.getrandbits(bits)
+                         for _ in range(board.player_num)]
+            self.zobrist = (tile_keys, revealed_keys, card_keys, known_keys,
+                            seat_keys)
+            self.layout = layout
+
+        tile_keys, revealed_keys, card_keys, known_keys, seat_keys = \
+            self.zobrist
+        key = seat_keys[board.current_player]
+        for dragon, pos in enumerate(board.occupancy.positions):
+            key ^= tile_keys[dragon][pos]
+        for card, revealed in enumerate(board.revealed):
+            if revealed:
+                key ^= revealed_keys[card]
+        for card, (animal, step) in self.known.items():
+            key ^= GameRng.derive(known_keys[card], animal, step)
+        return key or 1
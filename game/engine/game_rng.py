@@ -0,0 +1,55 @@
+import hashlib
+import random
+
+
+class GameRng(random.Random):
+    """
+    This class is the random number generator of a game.
+    It is seeded explicitly, so a game can be played again from its seed.
+    Independent streams, such as one for the board and one for the chit
+    cards, or one per simulated game, are split from it by name: a stream
+    only depends on the seed and its name, not on how many numbers were
+    drawn from other streams or in which process.
+    """
+    SEED_BITS = 63
+
+    def __init__(self, seed=None):
+        """
+        This method initializes the generator.
+
+        input:
+        - seed: the int seed, a new random seed if None
+
+        return: None
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(GameRng.SEED_BITS)
+        self.seed_value = int(seed)
+        super().__init__(self.seed_value)
+
+    def spawn(self, *names):
+        """
+        This method returns the independent stream with the names.
+
+        input:
+        - names: the names of the stream, such as ("game", 12)
+
+        return: GameRng
+        """
+        return GameRng(GameRng.derive(self.seed_value, *names))
+
+    @staticmethod
+    def derive(seed, *names):
+        """
+        This method returns the seed of the stream with the names split
+        from the seed.
+
+        input:
+        - seed: the seed of the parent stream
+        - names: the names of the stream
+
+        return: int
+        """
+        key = repr((seed,) + names).encode()
+        digest = hashlib.blake2b(key, digest_size=8).digest()
+        return int.from_bytes(digest, "big") >> (64 - GameRng.SEED_BITS)
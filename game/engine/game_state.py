@@ -0,0 +1,462 @@
+from board.land_type import LandType
+from engine.game_rng import GameRng
+from engine.occupancy_index import OccupancyIndex
+from engine.transition_table import TransitionTable
+from gamecard.animal_type import AnimalType
+
+from array import array
+from collections import namedtuple
+
+
+# The outcome of flipping a chit card
+# - card: the index of the chit card flipped
+# - animal: the animal type on the chit card
+# - step: the animal number on the chit card
+# - moves: the list of (seat, from, to) board moves caused by the flip
+# - end_turn: whether the turn changed to the next player
+# - end_game: whether the player reached his cave and won
+FlipResult = namedtuple("FlipResult",
+                        ["card", "animal", "step", "moves", "end_turn",
+                         "end_game"])
+
+
+class GameState:
+    """
+    This class is the rules engine of the game, without any display.
+    It holds the board, the dragon positions, the chit card deck and the
+    current player as plain data, so games can be played and simulated
+    without pygame.
+    Tiles are stored as compact arrays of small ints indexed by board
+    index, so a game only takes a few hundred bytes. The land types and
+    the cave owners only depend on the number of players and volcanoes,
+    so they are shared by every game with the same layout.
+    The rules are the same as ForwardAction, BackwardAction and
+    Dragon.move, and the destination of a move is looked up in the
+    TransitionTable of the layout. Players are identified by their seat, from 0 to the
+    number of players - 1.
+    Every chit card flipped is kept in a journal with the moves it caused,
+    so flips can be undone and redone in place, without copying the state.
+    """
+    MIN_CAVE = 4    # Minimum number of caves
+    VOLCANO = LandType.VOLCANO.value
+    CAVE = LandType.CAVE.value
+    PIRATE = AnimalType.DRAGON_PIRATE.value
+    ANIMAL_TYPES = list(AnimalType)     # Faster than AnimalType(value)
+    MAX_ANIMALS = len(AnimalType) - 1   # Animal types but the dragon pirate
+    NO_SEAT = -1    # Owner of a volcano, occupant of an empty tile
+    layouts = {}    # Board layouts keyed by (player number, size)
+
+    __slots__ = ["player_num", "size", "animal_num", "seed", "cave_distance",
+                 "board_size", "cave_positions", "homes", "lands", "owners",
+                 "table", "animals", "deck_animals", "deck_steps",
+                 "occupancy", "revealed", "revealed_num", "current_player",
+                 "winner", "history", "undone"]
+
+    def __init__(self, player_num, size=24, animal_num=4, deck=None,
+                 rng=None, journal=True):
+        """
+        This method initializes the game state with a shuffled board and
+        chit card deck.
+
+        input:
+        - player_num: the number of players
+        - size: the number of volcanoes
+        - animal_num: the number of animal types on the volcanoes
+        - deck: the list of (animal type, animal number) of the chit
+                cards, the standard deck shuffled if None
+        - rng: the GameRng the board and the deck are shuffled with, a
+               new one with a random seed if None
+        - journal: whether the flips are kept so they can be undone
+
+        return: None
+        """
+        if size % animal_num != 0:
+            raise ValueError("size must be a multiple of animal_num")
+        if animal_num > GameState.MAX_ANIMALS:
+            raise ValueError(f"at most {GameState.MAX_ANIMALS} animal types")
+        self.player_num = player_num
+        self.size = size
+        self.animal_num = animal_num
+        if rng is None:
+            rng = GameRng()
+        # The seed the game can be played again from
+        self.seed = rng.seed_value
+        (self.cave_distance, self.board_size, self.cave_positions,
+         self.homes, self.lands, self.owners) = GameState._layout(player_num,
+                                                                  size)
+        self.animals = self._create_animals(rng.spawn("board"))
+
+        if deck is None:
+            deck = GameState.standard_deck(animal_num)
+            rng.spawn("deck").shuffle(deck)
+        self.deck_animals = bytes(AnimalType(animal).value
+                                  for animal, _ in deck)
+        self.deck_steps = bytes(num for _, num in deck)
+        self.table = TransitionTable.get(
+            self.board_size, self.cave_positions, self.homes, self.owners,
+            max(self.deck_steps, default=TransitionTable.MAX_STEP))
+
+        # Board index of each player and seat on each tile
+        self.occupancy = OccupancyIndex(self.board_size, self.homes,
+                                        self.table.prev_volcanoes)
+        self.revealed = bytearray(len(self.deck_animals))
+        self.revealed_num = 0
+        self.current_player = 0
+        self.winner = None
+        # Flips applied, as (FlipResult, chit cards revealed before the
+        # turn changed or None), and chit card indexes of the flips undone
+        self.history = [] if journal else None
+        self.undone = []
+
+    @property
+    def positions(self):
+        """
+        This method returns the board index of each player.
+
+        return: array
+        """
+        return self.occupancy.positions
+
+    @property
+    def occupants(self):
+        """
+        This method returns the seat of the player on each tile, NO_SEAT
+        if the tile is empty.
+
+        return: array
+        """
+        return self.occupancy.occupants
+
+    @staticmethod
+    def standard_deck(animal_num=4):
+        """
+        This method returns the 16 chit cards of the game, in the order
+        Game creates them: 1 to 3 of each animal and two chit cards of 1
+        and 2 dragon pirates.
+        With more than 4 animal types, 1 to 3 of each other animal are
+        added after the 4 animals of the game.
+
+        input:
+        - animal_num: the number of animal types on the volcanoes
+
+        return: list of (AnimalType, int)
+        """
+        deck = []
+        for i in range(1, 4):
+            deck += [(AnimalType.BABY_DRAGON, i), (AnimalType.BAT, i),
+                     (AnimalType.SALAMANDER, i), (AnimalType.SPIDER, i)]
+            deck += [(AnimalType.animal(animal), i)
+                     for animal in range(4, animal_num)]
+            if i < 3:
+                deck += [(AnimalType.DRAGON_PIRATE, i)] * 2
+        return deck
+
+    @property
+    def deck(self):
+        """
+        This method returns the chit cards of the game in the order they
+        are laid out.
+
+        return: list of (int, int), the animal type value and number
+        """
+        return list(zip(self.deck_animals, self.deck_steps))
+
+    def is_over(self):
+        """
+        This method checks if a player has won.
+
+        return: bool
+        """
+        return self.winner is not None
+
+    def volcano_animals(self):
+        """
+        This method returns the animal type of the volcanoes in board
+        order, skipping the caves.
+
+        return: list of AnimalType
+        """
+        return [AnimalType(self.animals[i]) for i in range(self.board_size)
+                if self.lands[i] == GameState.VOLCANO]
+
+    def hidden_cards(self):
+        """
+        This method returns the indexes of the chit cards not revealed in
+        the current turn.
+
+        return: list
+        """
+        return [i for i, revealed in enumerate(self.revealed) if not revealed]
+
+    def apply_flip(self, card_index):
+        """
+        This method flips the chit card for the current player and applies
+        its effect:
+            - a dragon pirate moves the player backwards
+            - a matching animal moves the player forwards
+            - otherwise the turn ends
+        The turn also ends if the player cannot move, or once every chit
+        card is revealed.
+        Flipping another chit card than the next one to redo clears the
+        flips undone.
+
+        input:
+        - card_index: the index of the chit card in the deck
+
+        return: FlipResult
+        """
+        if self.winner is not None:
+            raise ValueError("the game is over")
+        if self.revealed[card_index]:
+            raise ValueError(f"chit card {card_index} is already revealed")
+
+        undone = self.undone
+        if undone:
+            if undone[-1] == card_index:
+                undone.pop()
+            else:
+                undone.clear()
+        revealed = self.revealed
+        revealed[card_index] = 1
+        self.revealed_num += 1
+        animal = self.deck_animals[card_index]
+        step = self.deck_steps[card_index]
+        seat = self.current_player
+        pos = self.occupancy.positions[seat]
+        moves = []
+        end_turn = False
+        end_game = False
+
+        # When the animal type does not match
+        if animal != GameState.PIRATE and self.animals[pos] != animal:
+            end_turn = True
+
+        # When card drawn is a penalty card or the animal type matches
+        else:
+            # The table is built for the largest step of the deck
+            table = self.table
+            signed_step = -step if animal == GameState.PIRATE else step
+            i = ((seat * self.board_size + pos) * table.width + signed_step +
+                 table.max_step)
+            destination = table.destinations[i]
+            flags = table.flags[i]
+            end_game = (flags & TransitionTable.END_GAME) != 0
+            if flags & (TransitionTable.END_TURN | TransitionTable.BLOCKED):
+                end_turn = True
+            elif destination != TransitionTable.NO_MOVE:
+                end_turn = self._move(seat, destination, moves)
+
+        if end_game:
+            self.winner = seat
+        elif end_turn or self.revealed_num == len(self.revealed):
+            end_turn = True
+            self._next_player()
+
+        result = FlipResult(card_index, GameState.ANIMAL_TYPES[animal], step,
+                            moves, end_turn, end_game)
+        if self.history is not None:
+            # The chit cards revealed are only kept when the turn changed,
+            # as _next_player replaced them
+            self.history.append((result, revealed if end_turn else None))
+        return result
+
+    def copy(self):
+        """
+        This method returns a copy of the game state that can be played
+        on without changing this one. The layout, the animals and the deck
+        are shared, as playing never changes them.
+
+        return: GameState
+        """
+        state = object.__new__(GameState)
+        for name in GameState.__slots__:
+            setattr(state, name, getattr(self, name))
+        state.occupancy = OccupancyIndex(self.board_size,
+                                         self.occupancy.positions,
+                                         self.table.prev_volcanoes)
+        state.revealed = bytearray(self.revealed)
+        if self.history is not None:
+            # undo makes the chit cards revealed of the journal current
+            # again, so they are not shared
+            state.history = [
+                (result, None if revealed is None else bytearray(revealed))
+                for result, revealed in self.history]
+        state.undone = list(self.undone)
+        return state
+
+    def undo(self):
+        """
+        This method takes back the last chit card flipped: the dragons
+        move back in reverse order, the chit card is hidden again and the
+        turn goes back to the player who flipped it.
+        Only the tiles and dragons the flip changed are restored.
+
+        return: FlipResult, the flip undone
+        """
+        if not self.history:
+            raise ValueError("there is no flip to undo")
+        result, revealed = self.history.pop()
+        if result.end_turn:
+            self.current_player = (self.current_player - 1) % self.player_num
+            self.revealed = revealed
+            self.revealed_num = len(revealed) - revealed.count(0)
+        self.winner = None
+        occupancy = self.occupancy
+        for seat, old, _ in reversed(result.moves):
+            occupancy.place(seat, old)
+        self.revealed[result.card] = 0
+        self.revealed_num -= 1
+        self.undone.append(result.card)
+        return result
+
+    def redo(self):
+        """
+        This method flips again the last chit card undone. The rules are
+        deterministic, so the flip has the same effect as before.
+
+        return: FlipResult
+        """
+        if not self.undone:
+            raise ValueError("there is no flip to redo")
+        return self.apply_flip(self.undone[-1])
+
+    def can_enter(self, tile, seat):
+        """
+        This method checks if the player can enter the tile.
+        A cave can only be entered by its owner, a volcano only if it is
+        not occupied.
+
+        input:
+        - tile: the board index of the tile
+        - seat: the seat of the player
+
+        return: bool
+        """
+        if self.lands[tile] == GameState.CAVE:
+            return self.owners[tile] == seat
+        return self.occupancy.is_free(tile)
+
+    @staticmethod
+    def _layout(player_num, size):
+        """
+        This method returns the board layout for the number of players and
+        volcanoes, created once and shared by the games using it.
+        Caves are placed every cave distance as GameBoard does. With 2
+        players, the caves of the players are opposite to each other.
+
+        input:
+        - player_num: the number of players
+        - size: the number of volcanoes
+
+        return: tuple of the cave distance, the board size, the cave
+                positions, the home of each seat, the land type of each
+                tile and the owner seat of each tile
+        """
+        layout = GameState.layouts.get((player_num, size))
+        if layout is None:
+            cave_num = max(GameState.MIN_CAVE, player_num)
+            cave_distance = int(size / cave_num) + 1
+            board_size = size + cave_num
+            cave_positions = tuple(
+                range(0, board_size, cave_distance))[:cave_num]
+            if player_num == 2:
+                homes = (cave_positions[0], cave_positions[2])
+            else:
+                homes = cave_positions[:player_num]
+
+            lands = bytearray([GameState.VOLCANO]) * board_size
+            for pos in cave_positions:
+                lands[pos] = GameState.CAVE
+            owners = array("b", [GameState.NO_SEAT]) * board_size
+            for seat, pos in enumerate(homes):
+                owners[pos] = seat
+            layout = (cave_distance, board_size, cave_positions, homes,
+                      bytes(lands), owners)
+            GameState.layouts[(player_num, size)] = layout
+        return layout
+
+    def _create_animals(self, rng):
+        """
+        This method creates the animal type of every tile. The caves hold
+        the animal of their position and the shuffled volcanoes fill the
+        remaining tiles.
+
+        input:
+        - rng: the random number generator the volcanoes are shuffled with
+
+        return: array
+        """
+        volcanoes = [AnimalType.animal(animal).value
+                     for animal in range(self.animal_num)
+                     for _ in range(self.size // self.animal_num)]
+        rng.shuffle(volcanoes)
+        volcano_iter = iter(volcanoes)
+        animals = array("b", bytes(self.board_size))
+        cave = 0
+        for pos in range(self.board_size):
+            if self.lands[pos] == GameState.VOLCANO:
+                animals[pos] = next(volcano_iter)
+            else:
+                animals[pos] = GameState.cave_animal(cave,
+                                                     self.animal_num).value
+                cave += 1
+        return animals
+
+    @staticmethod
+    def cave_animal(cave, animal_num):
+        """
+        This method returns the animal type of a cave. The 4 caves of the
+        game hold the 4 animals, the caves of large boards go through the
+        animal types again.
+
+        input:
+        - cave: the index of the cave
+        - animal_num: the number of animal types on the volcanoes
+
+        return: AnimalType
+        """
+        return AnimalType.animal(cave % max(animal_num, GameState.MIN_CAVE))
+
+    def _move(self, seat, destination, moves):
+        """
+        This method moves the player to the destination.
+        A player landing on a volcano occupied by another dragon takes it,
+        and the other dragon moves back to the nearest volcano not
+        occupied, found through the occupancy index. Unlike Dragon.move,
+        which moved it to the volcano just before even if a third dragon
+        was on it, so two dragons shared a tile, occupied volcanoes are
+        skipped.
+        The move fails and the turn ends if the destination is another
+        player's cave, which the transition table already flags.
+
+        input:
+        - seat: the seat of the player
+        - destination: the board index of the destination
+        - moves: the list the (seat, from, to) moves are added to
+
+        return: bool, True if the turn ends
+        """
+        occupancy = self.occupancy
+        if not self.can_enter(destination, seat):
+            if self.lands[destination] != GameState.VOLCANO:
+                return True
+            # Displace the dragon on the volcano
+            other = occupancy.occupants[destination]
+            moves.append(occupancy.place(seat, destination))
+            moves.append(occupancy.place(
+                other, occupancy.free_volcano_before(destination)))
+            return False
+
+        moves.append(occupancy.place(seat, destination))
+        return False
+
+    def _next_player(self):
+        """
+        This method changes the turn to the next player and hides every
+        chit card again.
+
+        return: None
+        """
+        self.current_player = (self.current_player + 1) % self.player_num
+        self.revealed = bytearray(len(self.revealed))
+        self.revealed_num = 0
@@ -0,0 +1,272 @@
+from engine.game_rng import GameRng
+
+from concurrent.futures import ProcessPoolExecutor, wait
+import math
+import os
+import time
+
+
+class MctsNode:
+    """
+    This class is a node of the search tree: the chit card flipped to
+    reach it, and how often the flip was tried and won.
+    """
+    __slots__ = ["seat", "children", "visits", "wins", "avails"]
+
+    def __init__(self, seat):
+        """
+        This method initializes the node.
+
+        input:
+        - seat: the seat of the player who flipped the chit card, None
+                for the root
+
+        return: None
+        """
+        self.seat = seat
+        self.children = {}  # Nodes keyed by chit card index
+        self.visits = 0
+        self.wins = 0
+        # Number of times the node could be picked, as a chit card can be
+        # revealed in some searches and hidden in others
+        self.avails = 1
+
+
+class MctsPolicy:
+    """
+    This class is a card picking policy that searches which chit card to
+    flip with Monte Carlo tree search.
+    The player only knows the chit cards flipped so far, read from the
+    journal of the game state, so every search deals the other chit cards
+    at random (information set MCTS). The rollouts play random flips on a
+    copy of the game state with the real rules, and are undone through its
+    journal instead of copying the state again.
+    With several workers, each process searches its own tree for the
+    same time (root parallelization) and the visits of the chit cards are
+    added. The search stops before the time budget, and late searches are
+    left out, so a move never takes longer than the budget. Every search
+    also stops at the deadline of the move, even if its process started
+    it late, so the workers are free for the next move.
+    """
+    USES_JOURNAL = True     # The chit cards flipped are read in the journal
+    EXPLORATION = 0.7       # UCB exploration constant
+    ROLLOUT_FLIPS = 2000    # Rollouts longer than this end without winner
+    MARGIN = 0.05           # Part of the budget kept to merge the searches
+
+    def __init__(self, rng=None, budget=1.0, iterations=None, workers=1,
+                 mp_context=None):
+        """
+        This method initializes the policy.
+
+        input:
+        - rng: the random number generator, a GameRng with a random seed
+               if None
+        - budget: the time budget of a move in seconds
+        - iterations: the largest number of searches of a move in each
+                      process, only limited by the budget if None
+        - workers: the number of processes searching, the number of
+                   cores if None
+        - mp_context: the multiprocessing context the workers are started
+                      with, the default one if None
+
+        return: None
+        """
+        self.rng = rng if rng is not None else GameRng()
+        self.budget = budget
+        self.iterations = iterations
+        self.workers = workers or os.cpu_count() or 1
+        self.mp_context = mp_context
+        self.executor = None    # Pool of the other workers, made on use
+
+    def start(self):
+        """
+        This method makes the pool of the other workers, if there are any
+        and it is not made yet.
+
+        return: None
+        """
+        if self.workers > 1 and self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers - 1,
+                                                mp_context=self.mp_context)
+
+    def choose(self, state):
+        """
+        This method picks the chit card to flip.
+
+        input:
+        - state: the game state
+
+        return: int, the index of the chit card
+        """
+        hidden = state.hidden_cards()
+        if len(hidden) == 1:
+            return hidden[0]
+        start = time.perf_counter()
+        budget = self.budget * (1 - MctsPolicy.MARGIN)
+        # The wall clock is the same in every process
+        deadline = time.time() + budget
+        futures = []
+        if self.workers > 1:
+            self.start()
+            futures = [self.executor.submit(
+                MctsPolicy.search, state, self.rng.getrandbits(63), budget,
+                self.iterations, deadline) for _ in range(self.workers - 1)]
+        # This process searches too while the others run
+        stats = MctsPolicy.search(state, self.rng.getrandbits(63), budget,
+                                  self.iterations)
+        if futures:
+            left = self.budget - (time.perf_counter() - start)
+            done, late = wait(futures, timeout=max(left, 0))
+            # The searches not started are dropped, the running ones stop
+            # at the deadline on their own
+            for future in late:
+                future.cancel()
+            for future in done:
+                for card, (visits, wins) in future.result().items():
+                    total = stats.get(card, (0, 0))
+                    stats[card] = (total[0] + visits, total[1] + wins)
+        return max(hidden, key=lambda card: stats.get(card, (0, 0)))
+
+    def close(self):
+        """
+        This method stops the processes of the other workers.
+
+        return: None
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    @staticmethod
+    def search(state, seed, budget, iterations=None, deadline=None):
+        """
+        This method searches the chit card to flip for the current player
+        until the budget is spent.
+
+        input:
+        - state: the game state
+        - seed: the seed of the random number generator of the search
+        - budget: the time of the search in seconds
+        - iterations: the largest number of searches, no limit if None
+        - deadline: the wall clock time the search stops at, even if the
+                    budget is not spent, no deadline if None
+
+        return: dict of chit card index to (visits, wins) of the root
+        """
+        stop = time.perf_counter() + budget
+        if deadline is not None:
+            stop = min(stop, time.perf_counter() + deadline - time.time())
+        rng = GameRng(seed)
+        board = state.copy()
+        known, unknown, pool = MctsPolicy.knowledge(state)
+        deck_animals = bytearray(len(state.deck_animals))
+        deck_steps = bytearray(len(state.deck_steps))
+        for card, (animal, step) in known.items():
+            deck_animals[card] = animal
+            deck_steps[card] = step
+
+        root = MctsNode(None)
+        count = 0
+        while iterations is None or count < iterations:
+            if count and time.perf_counter() >= stop:
+                break
+            count += 1
+            # Deal the chit cards not known yet
+            rng.shuffle(pool)
+            for card, (animal, step) in zip(unknown, pool):
+                deck_animals[card] = animal
+                deck_steps[card] = step
+            board.deck_animals = bytes(deck_animals)
+            board.deck_steps = bytes(deck_steps)
+            MctsPolicy._iterate(board, root, rng)
+        return {card: (node.visits, node.wins)
+                for card, node in root.children.items()}
+
+    @staticmethod
+    def knowledge(state):
+        """
+        This method splits the chit cards in the ones the players have
+        seen, flipped in the journal or revealed in this turn, and the
+        others.
+
+        input:
+        - state: the game state
+
+        return: dict of known chit card index to (animal type value,
+                animal number), list of the unknown chit card indexes,
+                list of the (animal type value, animal number) of the
+                unknown chit cards
+        """
+        seen = set(i for i, revealed in enumerate(state.revealed)
+                   if revealed)
+        if state.history:
+            seen.update(result.card for result, _ in state.history)
+        deck = list(zip(state.deck_animals, state.deck_steps))
+        known = {card: deck[card] for card in seen}
+        unknown = [card for card in range(len(deck)) if card not in seen]
+        # Every player knows what the deck is made of
+        pool = sorted(deck)
+        for card in known.values():
+            pool.remove(card)
+        return known, unknown, pool
+
+    @staticmethod
+    def _iterate(board, root, rng):
+        """
+        This method plays one search from the root: the tree is walked
+        down with UCB, a new node is added, the game is played to the end
+        at random and the result is counted in every node walked. The
+        board is then put back with the journal.
+
+        input:
+        - board: the game state searched on, with a dealt deck
+        - root: the root MctsNode
+        - rng: the random number generator
+
+        return: None
+        """
+        node = root
+        path = []
+        flips = 0
+        # Walk down the tree while every hidden chit card has a node
+        while board.winner is None:
+            hidden = board.hidden_cards()
+            untried = [card for card in hidden if card not in node.children]
+            if untried:
+                card = rng.choice(untried)
+                child = MctsNode(board.current_player)
+                node.children[card] = child
+                board.apply_flip(card)
+                flips += 1
+                path.append(child)
+                break
+            log = math.log
+            best = None
+            best_score = -1.0
+            for card in hidden:
+                child = node.children[card]
+                score = (child.wins / child.visits + MctsPolicy.EXPLORATION *
+                         math.sqrt(log(child.avails) / child.visits))
+                child.avails += 1
+                if score > best_score:
+                    best, best_score = card, score
+            node = node.children[best]
+            board.apply_flip(best)
+            flips += 1
+            path.append(node)
+
+        # Play the rest of the game at random
+        rollout = 0
+        while board.winner is None and rollout < MctsPolicy.ROLLOUT_FLIPS:
+            board.apply_flip(rng.choice(board.hidden_cards()))
+            rollout += 1
+
+        winner = board.winner
+        for node in path:
+            node.visits += 1
+            if node.seat == winner:
+                node.wins += 1
+        root.visits += 1
+        for _ in range(flips + rollout):
+            board.undo()
+        board.undone.clear()
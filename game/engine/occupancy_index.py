@@ -0,0 +1,79 @@
+from array import array
+
+
+class OccupancyIndex:
+    """
+    This class is the occupancy of the board: the tile of each dragon and
+    the dragon on each tile.
+    Both maps are only changed together by place, so they always agree.
+    A dragon pushed off a volcano goes back to the nearest volcano that is
+    not occupied, found with the previous volcano jump table of the
+    layout: caves are skipped in one jump, and only occupied volcanoes,
+    at most one per dragon, are jumped over.
+    """
+    EMPTY = -1  # Dragon on a tile without dragon
+
+    __slots__ = ["positions", "occupants", "prev_volcanoes"]
+
+    def __init__(self, board_size, positions, prev_volcanoes):
+        """
+        This method initializes the occupancy with the dragons on their
+        tiles.
+
+        input:
+        - board_size: the number of tiles on the board
+        - positions: the board index of each dragon
+        - prev_volcanoes: the board index of the volcano before each tile
+
+        return: None
+        """
+        self.positions = array("i", positions)
+        self.occupants = array("b", [OccupancyIndex.EMPTY]) * board_size
+        for dragon, tile in enumerate(self.positions):
+            self.occupants[tile] = dragon
+        self.prev_volcanoes = prev_volcanoes
+
+    def is_free(self, tile):
+        """
+        This method checks if no dragon is on the tile.
+
+        input:
+        - tile: the board index of the tile
+
+        return: bool
+        """
+        return self.occupants[tile] == OccupancyIndex.EMPTY
+
+    def place(self, dragon, tile):
+        """
+        This method moves the dragon from its tile to the tile.
+
+        input:
+        - dragon: the seat of the dragon
+        - tile: the board index of the new tile
+
+        return: tuple of (dragon, old tile, new tile)
+        """
+        old = self.positions[dragon]
+        if self.occupants[old] == dragon:
+            self.occupants[old] = OccupancyIndex.EMPTY
+        self.occupants[tile] = dragon
+        self.positions[dragon] = tile
+        return dragon, old, tile
+
+    def free_volcano_before(self, tile):
+        """
+        This method finds the nearest volcano before the tile that is not
+        occupied.
+
+        input:
+        - tile: the board index of the tile
+
+        return: int
+        """
+        prev_volcanoes = self.prev_volcanoes
+        occupants = self.occupants
+        tile = prev_volcanoes[tile]
+        while occupants[tile] != OccupancyIndex.EMPTY:
+            tile = prev_volcanoes[tile]
+        return tile
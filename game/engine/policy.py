@@ -0,0 +1,44 @@
+from engine.expectimax_policy import ExpectimaxPolicy
+from engine.game_rng import GameRng
+from engine.mcts_policy import MctsPolicy
+
+
+class RandomPolicy:
+    """
+    This class is a card picking policy that flips one of the hidden chit
+    cards at random, as a player who does not remember the cards would.
+    A policy only needs a choose method taking the game state and
+    returning the index of the chit card to flip, and to tell if it reads
+    the journal of the game state.
+    """
+    USES_JOURNAL = False    # Whether the flips of the game are read
+
+    def __init__(self, rng=None):
+        """
+        This method initializes the policy.
+
+        input:
+        - rng: the random number generator, a GameRng with a random seed
+               if None
+
+        return: None
+        """
+        self.rng = rng if rng is not None else GameRng()
+
+    def choose(self, state):
+        """
+        This method picks the chit card to flip.
+
+        input:
+        - state: the game state
+
+        return: int, the index of the chit card
+        """
+        return self.rng.choice(state.hidden_cards())
+
+
+# Policies that can be picked by name, as policies are created again in
+# each simulation process. A policy is created with the random number
+# generator it may use
+POLICIES = {"random": RandomPolicy, "mcts": MctsPolicy,
+            "expectimax": ExpectimaxPolicy}
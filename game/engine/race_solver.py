@@ -0,0 +1,234 @@
+from engine.game_state import GameState
+from engine.transition_table import TransitionTable
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+
+class RaceSolver:
+    """
+    This class computes exactly how many turns a player needs to reach his
+    cave on a given board, with chit cards picked at random.
+    The turns of a player form a Markov chain over his board index at the
+    start of a turn. The outcomes of a turn are found by going through
+    every (board index, chit cards left) state a turn can reach, each state
+    once, and the chain is solved with sparse matrices.
+    The race of each seat is solved alone, as if the dragons never meet,
+    so pushing a dragon off a volcano is not taken into account.
+    """
+    FINISHED = -1   # Outcome of a turn where the player reaches his cave
+
+    def __init__(self, state):
+        """
+        This method initializes the solver for the board and the deck of
+        the game state.
+
+        input:
+        - state: the GameState of the board, only its layout, volcanoes
+                 and deck are used
+
+        return: None
+        """
+        self.state = state
+        self.board_size = state.board_size
+        # Identical chit cards are grouped, as only how many are left
+        # matters when picking one at random
+        kinds = {}
+        for card in zip(state.deck_animals, state.deck_steps):
+            kinds[card] = kinds.get(card, 0) + 1
+        self.kind_animals = np.array([animal for animal, _ in kinds])
+        self.kind_steps = np.array(
+            [-step if animal == GameState.PIRATE else step
+             for animal, step in kinds])
+        # The chit cards left are a number, with the count of each kind as
+        # a digit of its own base
+        self.bases = np.array(list(kinds.values())) + 1
+        self.radixes = np.concatenate(([1], np.cumprod(self.bases)[:-1]))
+        self.deck = int(np.sum((self.bases - 1) * self.radixes))
+        self.deck_size = len(state.deck_animals)
+
+        table = state.table
+        self.destinations = np.array(table.destinations, np.int64)
+        self.flags = np.frombuffer(bytes(table.flags), np.uint8)
+        self.table_width = table.width
+        self.max_step = table.max_step
+        self.animals = np.array(state.animals)
+        self.outcomes = {}      # Turn outcomes of each seat
+        self.matrices = {}      # Transition matrix of each seat
+
+    def turn_outcomes(self, seat, pos):
+        """
+        This method returns the probability of each outcome of a turn
+        started on the board index with every chit card hidden.
+
+        input:
+        - seat: the seat of the player
+        - pos: the board index of the player
+
+        return: dict of the board index at the end of the turn, or
+                FINISHED, to its probability
+        """
+        column = self._turn_outcomes(seat)[:, [pos]].tocoo()
+        return {RaceSolver.FINISHED if end == self.board_size else int(end):
+                float(probability)
+                for end, probability in zip(column.row, column.data)
+                if probability}
+
+    def transition_matrix(self, seat):
+        """
+        This method returns the matrix of the probability to go from one
+        board index to another in one turn. The last row and column are
+        the finished state, which is never left.
+
+        input:
+        - seat: the seat of the player
+
+        return: csr_matrix, indexed by [from, to]
+        """
+        matrix = self.matrices.get(seat)
+        if matrix is None:
+            finished = self.board_size
+            outcomes = self._turn_outcomes(seat).T
+            matrix = sparse.vstack(
+                [outcomes,
+                 sparse.csr_matrix(([1.0], ([0], [finished])),
+                                   shape=(1, finished + 1))]).tocsr()
+            self.matrices[seat] = matrix
+        return matrix
+
+    def expected_turns(self, seat):
+        """
+        This method returns the expected number of turns for the player
+        to reach his cave from the start of the game.
+
+        input:
+        - seat: the seat of the player
+
+        return: float
+        """
+        n = self.board_size
+        transient = self.transition_matrix(seat)[:n, :n]
+        # Expected turns t from each board index: t = 1 + Q t
+        turns = spsolve(sparse.identity(n, format="csc") - transient.tocsc(),
+                        np.ones(n))
+        return float(turns[self.state.homes[seat]])
+
+    def finish_distribution(self, seat, max_turns):
+        """
+        This method returns the probability that the player reaches his
+        cave on each turn.
+
+        input:
+        - seat: the seat of the player
+        - max_turns: the number of turns computed
+
+        return: array, the probability of finishing on turn 1, 2, ...
+        """
+        matrix = self.transition_matrix(seat).T.tocsr()
+        probability = np.zeros(self.board_size + 1)
+        probability[self.state.homes[seat]] = 1.0
+        finished = np.zeros(max_turns + 1)
+        for turn in range(1, max_turns + 1):
+            probability = matrix @ probability
+            finished[turn] = probability[self.board_size]
+        return np.diff(finished)
+
+    def win_probabilities(self, max_turns=2000):
+        """
+        This method returns the probability of each seat winning, seats
+        playing in order, when the races are independent.
+
+        input:
+        - max_turns: the number of turns computed for each seat
+
+        return: list of float
+        """
+        finish = [self.finish_distribution(seat, max_turns)
+                  for seat in range(self.state.player_num)]
+        # Probability that a seat has not finished after each turn
+        left = [1.0 - np.concatenate(([0.0], np.cumsum(f))) for f in finish]
+        wins = []
+        for seat in range(self.state.player_num):
+            # Seat wins on turn t if the seats before did not finish by
+            # turn t and the seats after did not finish by turn t - 1
+            others = np.ones(max_turns)
+            for other in range(self.state.player_num):
+                if other < seat:
+                    others *= left[other][1:]
+                elif other > seat:
+                    others *= left[other][:-1]
+            wins.append(float(np.sum(finish[seat] * others)))
+        return wins
+
+    def _turn_outcomes(self, seat):
+        """
+        This method plays a turn from every board index at once and
+        returns the probability of each outcome.
+        The states of a turn are the board index and the chit cards left.
+        They are played one flip at a time for every start together, and
+        the states reached in several ways are merged, so each state is
+        only played once. A state is only reached from a few starts, so the
+        probabilities are kept in sparse matrices.
+
+        input:
+        - seat: the seat of the player
+
+        return: csr_matrix, the probability of ending on each board index,
+                or finished in the last row, indexed by [end, start]
+        """
+        outcomes = self.outcomes.get(seat)
+        if outcomes is not None:
+            return outcomes
+
+        n = self.board_size
+        finished = n
+        outcomes = sparse.csr_matrix((n + 1, n))
+        pos = np.arange(n)
+        left = np.full(n, self.deck)
+        # Probability of each state for each start
+        mass = sparse.identity(n, format="csr")
+        for hidden in range(self.deck_size, 0, -1):
+            states = np.arange(len(pos))
+            counts = left[:, None] // self.radixes % self.bases
+            playable = ((self.kind_animals == self.animals[pos][:, None]) |
+                        (self.kind_animals == GameState.PIRATE)) & (counts > 0)
+            # Any other chit card does not match and ends the turn here
+            ended = (hidden - np.sum(counts * playable, axis=1)) / hidden
+
+            rows, kinds = np.nonzero(playable)
+            weights = counts[rows, kinds] / hidden
+            from_pos = pos[rows]
+            i = ((seat * n + from_pos) * self.table_width +
+                 self.kind_steps[kinds] + self.max_step)
+            destination = self.destinations[i]
+            flags = self.flags[i]
+            win = (flags & TransitionTable.END_GAME) != 0
+            stay = (flags & (TransitionTable.END_TURN |
+                             TransitionTable.BLOCKED)) != 0
+            new_pos = np.where(stay | (destination == TransitionTable.NO_MOVE),
+                               from_pos, destination)
+            # Every chit card is revealed, the turn ends
+            end = win | stay | (hidden == 1)
+
+            # Mass of the states reaching the end of the turn
+            outcomes += sparse.csr_matrix(
+                (np.concatenate((ended, weights[end])),
+                 (np.concatenate((pos, np.where(win, finished,
+                                                new_pos)[end])),
+                  np.concatenate((states, rows[end])))),
+                shape=(n + 1, len(pos))) @ mass
+
+            # Mass of the states of the next flip, merging equal states
+            go_on = ~end
+            key = new_pos[go_on] * (self.deck + 1) + (
+                left[rows] - self.radixes[kinds])[go_on]
+            key, inverse = np.unique(key, return_inverse=True)
+            mass = sparse.csr_matrix(
+                (weights[go_on], (inverse, rows[go_on])),
+                shape=(len(key), len(pos))) @ mass
+            pos = key // (self.deck + 1)
+            left = key % (self.deck + 1)
+
+        self.outcomes[seat] = outcomes
+        return outcomes
@@ -0,0 +1,367 @@
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from engine.occupancy_index import OccupancyIndex
+
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+import struct
+
+
+# The state at the start of a turn, kept every few turns in the log
+# - turn: the number of the turn
+# - flip: the number of chit cards flipped before the turn
+# - current_player: the seat of the player of the turn
+# - positions: the board index of each player
+Keyframe = namedtuple("Keyframe", ["turn", "flip", "current_player",
+                                   "positions"])
+
+
+class ReplayLog:
+    """
+    This class holds the binary format of the replay log of a game.
+    The log starts with a header: the settings and the seed of the game,
+    then the animal type of every tile and the chit cards in the order
+    they are laid out, so a log still replays if the way boards are
+    shuffled changes.
+    A record follows for each chit card flipped: its index, a byte of
+    flags with the number of moves, and the seat and the new board index
+    of each move. A keyframe record, the positions at the start of a
+    turn, is written every few turns so a replay can start from there
+    instead of the start of the game. Board indexes are written as
+    variable length ints, so a flip usually takes 2 to 5 bytes.
+    """
+    MAGIC = b"FDRL"
+    VERSION = 1
+    # Magic, version, players, animal types, volcanoes, seed, tiles,
+    # chit cards, turns between keyframes
+    HEADER = struct.Struct("<4sBBBIQIBH")
+    MAX_SEED = 1 << 64  # Seeds are written as unsigned 64 bit ints
+    KEYFRAME = 0xFF     # First byte of a keyframe record, never a chit card
+    END_TURN = 1        # Flags of a flip record
+    END_GAME = 2
+    MOVES_SHIFT = 2     # The number of moves is kept above the flags
+
+    @staticmethod
+    def write_varint(out, value):
+        """
+        This method appends an unsigned int, 7 bits per byte.
+
+        input:
+        - out: the bytearray written to
+        - value: the int
+
+        return: None
+        """
+        while value >= 0x80:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+
+    @staticmethod
+    def read_varint(data, offset):
+        """
+        This method reads an unsigned int written by write_varint.
+
+        input:
+        - data: the bytes read from
+        - offset: the index of the first byte of the int
+
+        return: int, and the index after the int
+        """
+        value = 0
+        shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, offset
+            shift += 7
+
+
+class ReplayWriter:
+    """
+    This class writes the replay log of a game as it is played.
+    The log is flushed at the end of every turn, so a game that crashed
+    can still be replayed up to its last turn.
+    """
+    KEYFRAME_TURNS = 16     # Turns between keyframes
+
+    def __init__(self, path, state, keyframe_turns=KEYFRAME_TURNS):
+        """
+        This method creates the log file and writes the header.
+
+        input:
+        - path: the path of the log file
+        - state: the game state, before any chit card is flipped
+        - keyframe_turns: the number of turns between keyframes
+
+        return: None
+        """
+        if not 0 <= state.seed < ReplayLog.MAX_SEED:
+            raise ValueError(f"the seed {state.seed} cannot be written in "
+                             f"a replay log")
+        self.state = state
+        self.keyframe_turns = keyframe_turns
+        self.turn = 0
+        self.flip = 0
+        self.file = open(path, "wb")
+        header = bytearray(ReplayLog.HEADER.pack(
+            ReplayLog.MAGIC, ReplayLog.VERSION, state.player_num,
+            state.animal_num, state.size, state.seed, state.board_size,
+            len(state.deck_animals), keyframe_turns))
+        header += bytes(state.animals)
+        header += state.deck_animals + state.deck_steps
+        self.file.write(header)
+
+    def record(self, result):
+        """
+        This method writes the chit card flipped, once it is applied to
+        the game state, and a keyframe if a turn starts that needs one.
+
+        input:
+        - result: the FlipResult of the flip
+
+        return: None
+        """
+        flags = ((ReplayLog.END_TURN if result.end_turn else 0) |
+                 (ReplayLog.END_GAME if result.end_game else 0))
+        out = bytearray((result.card,
+                         flags | len(result.moves) << ReplayLog.MOVES_SHIFT))
+        for seat, _, tile in result.moves:
+            out.append(seat)
+            ReplayLog.write_varint(out, tile)
+        self.flip += 1
+        if result.end_turn:
+            self.turn += 1
+            if self.turn % self.keyframe_turns == 0:
+                out.append(ReplayLog.KEYFRAME)
+                ReplayLog.write_varint(out, self.turn)
+                ReplayLog.write_varint(out, self.flip)
+                out.append(self.state.current_player)
+                for tile in self.state.positions:
+                    ReplayLog.write_varint(out, tile)
+        self.file.write(out)
+        if result.end_turn or result.end_game:
+            self.file.flush()
+
+    def close(self):
+        """
+        This method closes the log file.
+
+        return: None
+        """
+        self.file.close()
+
+
+class Replay:
+    """
+    This class reads a replay log and plays the game again without
+    display, at the speed of the game state.
+    Reading the log only splits it into records, the game is played when
+    a state is asked for. The state at the start of any turn is played
+    from the last keyframe before it, so seeking in a long game does not
+    play it again from the start.
+    A log cut in the middle of a record, as when the game crashed while
+    it was written, is read up to the end of the last turn flushed.
+    """
+
+    def __init__(self, data):
+        """
+        This method reads the log.
+
+        input:
+        - data: the bytes of the log
+
+        return: None
+        """
+        if len(data) < ReplayLog.HEADER.size:
+            raise ValueError("the replay log is cut off in its header")
+        (magic, version, self.player_num, self.animal_num, self.size,
+         self.seed, board_size, deck_size, self.keyframe_turns) = \
+            ReplayLog.HEADER.unpack_from(data)
+        if magic != ReplayLog.MAGIC or version != ReplayLog.VERSION:
+            raise ValueError("not a replay log of this version")
+        offset = ReplayLog.HEADER.size
+        if len(data) < offset + board_size + 2 * deck_size:
+            raise ValueError("the replay log is cut off in its header")
+        self.animals = data[offset:offset + board_size]
+        offset += board_size
+        deck_animals = data[offset:offset + deck_size]
+        deck_steps = data[offset + deck_size:offset + 2 * deck_size]
+        offset += 2 * deck_size
+        self.byte_num = len(data)
+
+        # Every game of the replay starts from a copy of this state
+        self.start = GameState(self.player_num, self.size, self.animal_num,
+                               list(zip(deck_animals, deck_steps)),
+                               GameRng(self.seed), journal=False)
+        self.start.animals = array("b", self.animals)
+
+        self.data = data
+        self.cards = bytearray()    # Chit card of each flip
+        self.offsets = array("I")   # Index of the record of each flip
+        self.turn_starts = [0]      # Number of flips before each turn
+        self.keyframes = [Keyframe(0, 0, 0, tuple(self.start.positions))]
+        self.truncated = False      # Whether the log ends in a record
+        try:
+            self._scan(offset)
+        except IndexError:
+            # The writer flushes the log at the end of every turn, so the
+            # turn cut off is dropped
+            self.truncated = True
+            flip = self.turn_starts[-1]
+            del self.cards[flip:]
+            del self.offsets[flip:]
+
+    def _scan(self, offset):
+        """
+        This method splits the records of the log, from the first one.
+
+        input:
+        - offset: the index of the first record
+
+        return: None
+        """
+        data = self.data
+        read_varint = ReplayLog.read_varint
+        while offset < len(data):
+            card = data[offset]
+            if card == ReplayLog.KEYFRAME:
+                turn, offset = read_varint(data, offset + 1)
+                flip, offset = read_varint(data, offset)
+                current_player = data[offset]
+                offset += 1
+                positions = []
+                for _ in range(self.player_num):
+                    tile, offset = read_varint(data, offset)
+                    positions.append(tile)
+                self.keyframes.append(Keyframe(turn, flip, current_player,
+                                               tuple(positions)))
+                continue
+            self.cards.append(card)
+            self.offsets.append(offset)
+            info = data[offset + 1]
+            offset += 2
+            # The moves are only read when checked, skip them
+            for _ in range(info >> ReplayLog.MOVES_SHIFT):
+                offset += 1
+                while data[offset] & 0x80:
+                    offset += 1
+                offset += 1
+            if info & ReplayLog.END_TURN:
+                self.turn_starts.append(len(self.cards))
+
+    @staticmethod
+    def load(path):
+        """
+        This method reads the log file.
+
+        input:
+        - path: the path of the log file
+
+        return: Replay
+        """
+        with open(path, "rb") as file:
+            return Replay(file.read())
+
+    @property
+    def flip_num(self):
+        """
+        This method returns the number of chit cards flipped in the log.
+
+        return: int
+        """
+        return len(self.cards)
+
+    @property
+    def turn_num(self):
+        """
+        This method returns the number of turns started in the log.
+
+        return: int
+        """
+        return len(self.turn_starts)
+
+    def turn_of(self, flip):
+        """
+        This method returns the turn of a flip.
+
+        input:
+        - flip: the number of chit cards flipped before
+
+        return: int
+        """
+        return bisect_right(self.turn_starts, flip) - 1
+
+    def state_at(self, turn):
+        """
+        This method returns the game state at the start of the turn,
+        played from the last keyframe before it.
+
+        input:
+        - turn: the number of the turn, from 0
+
+        return: GameState
+        """
+        if not 0 <= turn < self.turn_num:
+            raise ValueError(f"the log has turns 0 to {self.turn_num - 1}")
+        keyframe = self.keyframes[bisect_right(
+            [keyframe.turn for keyframe in self.keyframes], turn) - 1]
+        state = self.start.copy()
+        state.current_player = keyframe.current_player
+        state.occupancy = OccupancyIndex(state.board_size, keyframe.positions,
+                                         state.table.prev_volcanoes)
+        return self.play(state, keyframe.flip, self.turn_starts[turn])
+
+    def play(self, state=None, start=0, stop=None, check=True):
+        """
+        This method flips the chit cards of the log on the game state.
+        Each flip is checked against the log, so a game played again with
+        other rules stops where it no longer matches.
+
+        input:
+        - state: the game state after the first start flips, the start of
+                 the game if None
+        - start: the number of the first flip
+        - stop: the number of flips after the last one, the end of the
+                log if None
+        - check: whether the moves are checked against the log
+
+        return: GameState
+        """
+        if state is None:
+            state = self.start.copy()
+        if stop is None:
+            stop = self.flip_num
+        cards = self.cards
+        for flip in range(start, stop):
+            result = state.apply_flip(cards[flip])
+            if check and self._read_flip(flip) != (
+                    result.end_turn, result.end_game,
+                    [(seat, tile) for seat, _, tile in result.moves]):
+                raise ValueError(f"flip {flip} does not match the log")
+        return state
+
+    def _read_flip(self, flip):
+        """
+        This method reads the outcome of a flip in the log.
+
+        input:
+        - flip: the number of the flip
+
+        return: bool whether the turn ended, bool whether the game ended,
+                list of (seat, new board index) of the moves
+        """
+        data = self.data
+        offset = self.offsets[flip] + 1
+        info = data[offset]
+        offset += 1
+        moves = []
+        for _ in range(info >> ReplayLog.MOVES_SHIFT):
+            seat = data[offset]
+            tile, offset = ReplayLog.read_varint(data, offset + 1)
+            moves.append((seat, tile))
+        return (bool(info & ReplayLog.END_TURN),
+                bool(info & ReplayLog.END_GAME), moves)
@@ -0,0 +1,273 @@
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from engine.policy import POLICIES
+from gamecard.animal_type import AnimalType
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import os
+import sys
+
+
+class SimulationStats:
+    """
+    This class holds the statistics of simulated games.
+    Statistics of batches played in different processes are merged into
+    one.
+    """
+
+    def __init__(self, player_num):
+        """
+        This method initializes empty statistics.
+
+        input:
+        - player_num: the number of players
+
+        return: None
+        """
+        self.player_num = player_num
+        self.games = 0
+        self.unfinished = 0         # Games stopped at the flip limit
+        self.wins = [0] * player_num    # Games won by each seat
+        self.turns = Counter()      # Number of games of each length in turns
+        self.flips = 0
+        self.penalties = 0          # Dragon pirate chit cards flipped
+        self.penalty_moves = 0      # Dragon pirates that moved a player back
+        self.longest = None         # (turns, seed) of the longest game
+
+    def add_game(self, winner, turns, flips, penalties, penalty_moves,
+                 seed=None):
+        """
+        This method adds the outcome of one game.
+
+        input:
+        - winner: the seat of the winner, None if the game did not finish
+        - turns: the number of turns played
+        - flips: the number of chit cards flipped
+        - penalties: the number of dragon pirates flipped
+        - penalty_moves: the number of dragon pirates that moved a player
+        - seed: the seed the game can be played again from, if known
+
+        return: None
+        """
+        if seed is not None and (self.longest is None or
+                                 turns > self.longest[0]):
+            self.longest = (turns, seed)
+        self.games += 1
+        if winner is None:
+            self.unfinished += 1
+        else:
+            self.wins[winner] += 1
+            self.turns[turns] += 1
+        self.flips += flips
+        self.penalties += penalties
+        self.penalty_moves += penalty_moves
+
+    def merge(self, other):
+        """
+        This method adds the statistics of another batch.
+
+        input:
+        - other: the SimulationStats to add
+
+        return: None
+        """
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.turns.update(other.turns)
+        self.flips += other.flips
+        self.penalties += other.penalties
+        self.penalty_moves += other.penalty_moves
+        if other.longest is not None and (self.longest is None or
+                                          other.longest > self.longest):
+            self.longest = other.longest
+
+    def turn_percentile(self, percent):
+        """
+        This method returns the game length in turns below which the
+        percentage of finished games are.
+
+        input:
+        - percent: the percentage, from 0 to 100
+
+        return: int, or None if no game finished
+        """
+        finished = self.games - self.unfinished
+        if finished == 0:
+            return None
+        rank = max(1, -(-finished * percent // 100))    # Rounded up
+        count = 0
+        for turns in sorted(self.turns):
+            count += self.turns[turns]
+            if count >= rank:
+                return turns
+
+    def report(self, file=sys.stdout):
+        """
+        This method prints the win rate by seat, the distribution of the
+        game length and the frequency of the penalties.
+
+        input:
+        - file: the file to print to
+
+        return: None
+        """
+        games = max(self.games, 1)
+        print(f"Games played: {self.games} ({self.unfinished} unfinished)",
+              file=file)
+        print("Win rate by seat", file=file)
+        for seat, wins in enumerate(self.wins):
+            print(f"  player {seat + 1}: {wins / games:7.2%}", file=file)
+
+        finished = self.games - self.unfinished
+        if finished:
+            mean = sum(turns * n for turns, n in self.turns.items()) / finished
+            print("Game length in turns", file=file)
+            print(f"  mean {mean:.1f}, min {min(self.turns)}, "
+                  f"median {self.turn_percentile(50)}, "
+                  f"90% {self.turn_percentile(90)}, max {max(self.turns)}",
+                  file=file)
+            if self.longest is not None:
+                print(f"  longest game: {self.longest[0]} turns, "
+                      f"--replay {self.longest[1]}", file=file)
+        print(f"Chit cards flipped per game: {self.flips / games:.1f}",
+              file=file)
+        flips = max(self.flips, 1)
+        print(f"Dragon pirates: {self.penalties / flips:.2%} of the flips, "
+              f"{self.penalties / games:.1f} per game, "
+              f"{self.penalty_moves / max(self.penalties, 1):.2%} "
+              f"moved a player back", file=file)
+
+
+class Simulator:
+    """
+    This class plays complete games without display to check the balance
+    of the board parameters.
+    Games are split into batches played in parallel by a pool of
+    processes. Each game has its own random stream split from the seed of
+    the simulation by the game number, so a simulation gives the same
+    statistics whatever the number of processes, and any game can be
+    played again from its seed.
+    """
+    BATCH_SIZE = 250    # Games played by a process at a time
+    MAX_FLIPS = 100000  # Games longer than this are stopped
+
+    def __init__(self, player_num, size=24, animal_num=4, policy="random",
+                 workers=None):
+        """
+        This method initializes the simulator.
+
+        input:
+        - player_num: the number of players
+        - size: the number of volcanoes
+        - animal_num: the number of animal types on the volcanoes
+        - policy: the name of the card picking policy in POLICIES
+        - workers: the number of processes, the number of cores if None
+
+        return: None
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy}")
+        if size % animal_num != 0:
+            raise ValueError("size must be a multiple of animal_num")
+        self.player_num = player_num
+        self.size = size
+        self.animal_num = animal_num
+        self.policy = policy
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, games, seed=None):
+        """
+        This method plays the games and returns their statistics.
+
+        input:
+        - games: the number of games to play
+        - seed: the seed of the simulation, random if None
+
+        return: SimulationStats
+        """
+        seed = GameRng(seed).seed_value
+        batches = [(self.player_num, self.size, self.animal_num, self.policy,
+                    seed, start, min(Simulator.BATCH_SIZE, games - start))
+                   for start in range(0, games, Simulator.BATCH_SIZE)]
+
+        stats = SimulationStats(self.player_num)
+        if self.workers == 1 or len(batches) == 1:
+            for batch in batches:
+                stats.merge(Simulator.play_batch(batch))
+        else:
+            with ProcessPoolExecutor(self.workers) as executor:
+                for batch_stats in executor.map(Simulator.play_batch, batches):
+                    stats.merge(batch_stats)
+        return stats
+
+    @staticmethod
+    def game_seed(seed, game):
+        """
+        This method returns the seed of a game of a simulation.
+
+        input:
+        - seed: the seed of the simulation
+        - game: the number of the game in the simulation
+
+        return: int
+        """
+        return GameRng.derive(seed, "game", game)
+
+    @staticmethod
+    def play_batch(batch):
+        """
+        This method plays a batch of games in the current process.
+
+        input:
+        - batch: the tuple of the number of players, the number of
+                 volcanoes, the number of animal types, the policy name,
+                 the seed of the simulation, the number of the first game
+                 and the number of games
+
+        return: SimulationStats
+        """
+        player_num, size, animal_num, policy_name, seed, start, games = batch
+        stats = SimulationStats(player_num)
+        for game in range(start, start + games):
+            game_seed = Simulator.game_seed(seed, game)
+            state, counts = Simulator.play_game(player_num, size, animal_num,
+                                                policy_name, game_seed)
+            stats.add_game(state.winner, *counts, seed=game_seed)
+        return stats
+
+    @staticmethod
+    def play_game(player_num, size, animal_num, policy_name, seed):
+        """
+        This method plays one game from its seed.
+
+        input:
+        - player_num: the number of players
+        - size: the number of volcanoes
+        - animal_num: the number of animal types on the volcanoes
+        - policy_name: the name of the card picking policy in POLICIES
+        - seed: the seed of the game
+
+        return: GameState, tuple of the number of turns, chit cards
+                flipped, dragon pirates flipped and dragon pirates that
+                moved a player
+        """
+        rng = GameRng(seed)
+        policy = POLICIES[policy_name](rng.spawn("policy"))
+        # The journal is only kept for the policies reading it
+        state = GameState(player_num, size, animal_num, rng=rng,
+                          journal=policy.USES_JOURNAL)
+        pirate = AnimalType.DRAGON_PIRATE
+        turns = flips = penalties = penalty_moves = 0
+        while state.winner is None and flips < Simulator.MAX_FLIPS:
+            result = state.apply_flip(policy.choose(state))
+            flips += 1
+            if result.animal is pirate:
+                penalties += 1
+                if result.moves:
+                    penalty_moves += 1
+            if result.end_turn or result.end_game:
+                turns += 1
+        return state, (turns, flips, penalties, penalty_moves)
@@ -0,0 +1,379 @@
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from engine.policy import POLICIES
+from engine.simulator import Simulator
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import ast
+import itertools
+import json
+import os
+
+
+class EloRatings:
+    """
+    This class holds the Elo rating of every entrant of a tournament,
+    updated after each game.
+    A game with more than 2 players counts as the winner beating each
+    other player, each of these results weighing 1 / (players - 1).
+    """
+    START = 1500.0  # Rating of a new entrant
+    K = 16.0        # Largest change of a rating after a game
+
+    def __init__(self, names):
+        """
+        This method initializes the ratings of the entrants.
+
+        input:
+        - names: the names of the entrants
+
+        return: None
+        """
+        self.ratings = {name: EloRatings.START for name in names}
+        self.games = {name: 0 for name in names}
+        self.wins = {name: 0 for name in names}
+
+    def add_game(self, seats, winner):
+        """
+        This method updates the ratings with the outcome of a game.
+
+        input:
+        - seats: the name of the entrant of each seat
+        - winner: the seat of the winner, None if the game did not finish
+
+        return: None
+        """
+        for name in seats:
+            self.games[name] += 1
+        if winner is None:
+            return
+        best = seats[winner]
+        self.wins[best] += 1
+        k = EloRatings.K / (len(seats) - 1)
+        for name in seats:
+            if name == best:
+                continue
+            expected = 1 / (1 + 10 ** ((self.ratings[name] -
+                                        self.ratings[best]) / 400))
+            change = k * (1 - expected)
+            self.ratings[best] += change
+            self.ratings[name] -= change
+
+    def standings(self):
+        """
+        This method returns the entrants from the best rated to the worst.
+
+        return: list of (name, rating, games, wins)
+        """
+        return sorted(((name, rating, self.games[name], self.wins[name])
+                       for name, rating in self.ratings.items()),
+                      key=lambda entry: (-entry[1], entry[0]))
+
+    def report(self, file=None):
+        """
+        This method prints the standings.
+
+        input:
+        - file: the stream to print to, the standard output if None
+
+        return: None
+        """
+        width = max(len(name) for name in self.ratings)
+        print(f"{'entrant':<{width}}    elo  games  win rate", file=file)
+        for name, rating, games, wins in self.standings():
+            rate = wins / games if games else 0.0
+            print(f"{name:<{width}} {rating:6.0f} {games:6d} {rate:9.1%}",
+                  file=file)
+
+
+class Tournament:
+    """
+    This class plays bots against each other without display and rates
+    them.
+    An entrant is a policy of POLICIES with its parameters, written as
+    "name" or "name:key=value,key=value", such as "mcts:budget=0.1".
+    Every round, the entrants are grouped by round robin, every group of
+    players, or by Swiss pairing, entrants of close ratings together. A
+    group plays one game with every rotation of the seats on the same
+    board and chit cards, so no entrant gains from his seat, such as the
+    opposite caves of 2 players.
+    Each game is written to the results file when it finishes, and the
+    ratings are updated. A tournament stopped halfway goes on from its
+    results file, playing only the games missing.
+    """
+    PAIRINGS = ["round-robin", "swiss"]
+
+    def __init__(self, entrants, player_num=2, size=24, animal_num=4,
+                 pairing="round-robin", workers=None):
+        """
+        This method initializes the tournament.
+
+        input:
+        - entrants: the list of entrant names
+        - player_num: the number of players of a game
+        - size: the number of volcanoes
+        - animal_num: the number of animal types on the volcanoes
+        - pairing: how entrants are grouped, one of PAIRINGS
+        - workers: the number of processes, the number of cores if None
+
+        return: None
+        """
+        if len(set(entrants)) != len(entrants):
+            raise ValueError("entrants must be different")
+        if len(entrants) < player_num:
+            raise ValueError(f"at least {player_num} entrants are needed")
+        if pairing not in Tournament.PAIRINGS:
+            raise ValueError(f"unknown pairing {pairing}")
+        for entrant in entrants:
+            name, kwargs = Tournament.parse_entrant(entrant)
+            # Check the parameters before any game is played
+            try:
+                POLICIES[name](GameRng(0), **kwargs)
+            except TypeError as error:
+                raise ValueError(f"entrant {entrant}: {error}") from None
+        self.entrants = list(entrants)
+        self.player_num = player_num
+        self.size = size
+        self.animal_num = animal_num
+        self.pairing = pairing
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, rounds, path, seed=None):
+        """
+        This method plays the rounds, or the games missing in the results
+        file, and returns the ratings.
+
+        input:
+        - rounds: the number of rounds
+        - path: the path of the results file, a JSON object per line
+        - seed: the seed of the tournament, the one of the results file or
+                random if None
+
+        return: EloRatings
+        """
+        header, records = Tournament.load(path)
+        settings = {"entrants": self.entrants, "players": self.player_num,
+                    "size": self.size, "animals": self.animal_num,
+                    "pairing": self.pairing}
+        if header is None:
+            seed = GameRng(seed).seed_value
+            header = dict(settings, seed=seed)
+            with open(path, "w") as file:
+                file.write(json.dumps(header) + "\n")
+        else:
+            if seed is not None and seed != header["seed"]:
+                raise ValueError("the results file has another seed")
+            if {key: header[key] for key in settings} != settings:
+                raise ValueError("the results file is of another tournament")
+            seed = header["seed"]
+
+        ratings = EloRatings(self.entrants)
+        played = {}     # Seats of the games played, keyed by game key
+        groups = {}     # Groups of the rounds started, keyed by round
+        for record in records:
+            if "groups" in record:
+                groups[record["round"]] = [tuple(group) for group in
+                                           record["groups"]]
+            else:
+                ratings.add_game(record["seats"], record["winner"])
+                played[tuple(record["key"])] = record["seats"]
+
+        with open(path, "a") as file:
+            executor = None
+            if self.workers > 1:
+                executor = ProcessPoolExecutor(self.workers)
+            try:
+                for round_num in range(rounds):
+                    if round_num not in groups:
+                        # The groups are kept before the games, so a round
+                        # goes on with the same groups
+                        groups[round_num] = self._groups(ratings, played)
+                        file.write(json.dumps(
+                            {"round": round_num,
+                             "groups": groups[round_num]}) + "\n")
+                    tasks = self._tasks(round_num, groups[round_num], seed,
+                                        played)
+                    for record in self._play(tasks, executor):
+                        file.write(json.dumps(record) + "\n")
+                        # Flushed so the game is kept if stopped here
+                        file.flush()
+                        ratings.add_game(record["seats"], record["winner"])
+                        played[tuple(record["key"])] = record["seats"]
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
+        return ratings
+
+    @staticmethod
+    def load(path):
+        """
+        This method reads the results file of a tournament. A last line
+        cut off when the tournament was stopped is left out.
+
+        input:
+        - path: the path of the results file
+
+        return: dict of the settings, None if there is no file, and the
+                list of the records of the rounds and the games
+        """
+        if not os.path.exists(path):
+            return None, []
+        with open(path) as file:
+            lines = file.read().splitlines()
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+        if records and lines[-1] and len(records) < len(lines):
+            # Rewrite the file without the line cut off
+            with open(path, "w") as file:
+                file.writelines(json.dumps(record) + "\n"
+                                for record in records)
+        if not records:
+            return None, []
+        return records[0], records[1:]
+
+    @staticmethod
+    def parse_entrant(entrant):
+        """
+        This method splits an entrant into its policy name and parameters.
+
+        input:
+        - entrant: the entrant name, such as "mcts:budget=0.1"
+
+        return: str, dict of the parameters
+        """
+        name, _, params = entrant.partition(":")
+        if name not in POLICIES:
+            raise ValueError(f"unknown policy {name}")
+        kwargs = {}
+        for param in filter(None, params.split(",")):
+            key, _, value = param.partition("=")
+            try:
+                kwargs[key] = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                kwargs[key] = value
+        return name, kwargs
+
+    @staticmethod
+    def play_game(task):
+        """
+        This method plays one game of the tournament in the current
+        process.
+
+        input:
+        - task: the tuple of the game key, the entrant of each seat, the
+                number of volcanoes, the number of animal types and the
+                seed of the game
+
+        return: dict, the record of the game
+        """
+        key, seats, size, animal_num, seed = task
+        rng = GameRng(seed)
+        policies = []
+        for seat, entrant in enumerate(seats):
+            name, kwargs = Tournament.parse_entrant(entrant)
+            policies.append(POLICIES[name](rng.spawn("policy", seat),
+                                           **kwargs))
+        # Every rotation plays the same board and chit cards
+        state = GameState(len(seats), size, animal_num, rng=rng,
+                          journal=any(policy.USES_JOURNAL
+                                      for policy in policies))
+        turns = flips = 0
+        while state.winner is None and flips < Simulator.MAX_FLIPS:
+            result = state.apply_flip(
+                policies[state.current_player].choose(state))
+            flips += 1
+            if result.end_turn or result.end_game:
+                turns += 1
+        for policy in policies:
+            if hasattr(policy, "close"):
+                policy.close()
+        return {"key": list(key), "seats": list(seats),
+                "winner": state.winner, "turns": turns, "flips": flips,
+                "seed": seed}
+
+    def _groups(self, ratings, played):
+        """
+        This method groups the entrants playing together in the next
+        round.
+        Swiss pairing groups the best rated entrant with the next ones he
+        did not play yet, if any. With a number of entrants that does not
+        divide in groups, the lowest rated ones sit the round out.
+
+        input:
+        - ratings: the EloRatings before the round
+        - played: the seats of the games played, keyed by game key
+
+        return: list of tuples of entrant names
+        """
+        if self.pairing == "round-robin":
+            return list(itertools.combinations(self.entrants,
+                                               self.player_num))
+
+        met = set()
+        for seats in played.values():
+            met.update(itertools.permutations(seats, 2))
+        left = [name for name, _, _, _ in ratings.standings()]
+        groups = []
+        while len(left) >= self.player_num:
+            group = [left.pop(0)]
+            # Prefer the entrants not met yet, then the closest rated
+            for name in sorted(left, key=lambda other: any(
+                    (member, other) in met for member in group)):
+                if len(group) == self.player_num:
+                    break
+                group.append(name)
+            for name in group[1:]:
+                left.remove(name)
+            groups.append(tuple(group))
+        return groups
+
+    def _tasks(self, round_num, groups, seed, played):
+        """
+        This method returns the games of the round not played yet: every
+        rotation of the seats of every group.
+
+        input:
+        - round_num: the number of the round
+        - groups: the tuples of entrant names of the round
+        - seed: the seed of the tournament
+        - played: the seats of the games played, keyed by game key
+
+        return: list of tasks of play_game
+        """
+        tasks = []
+        for match, group in enumerate(groups):
+            game_seed = GameRng.derive(seed, "round", round_num, match)
+            for rotation in range(self.player_num):
+                key = (round_num, match, rotation)
+                if key in played:
+                    continue
+                seats = tuple(group[rotation:] + group[:rotation])
+                tasks.append((key, seats, self.size, self.animal_num,
+                              game_seed))
+        return tasks
+
+    @staticmethod
+    def _play(tasks, executor):
+        """
+        This method plays the games, yielding each record as soon as its
+        game finishes.
+
+        input:
+        - tasks: the tasks of play_game
+        - executor: the process pool, the games are played in this process
+                    if None
+
+        return: generator of dict
+        """
+        if executor is None:
+            for task in tasks:
+                yield Tournament.play_game(task)
+            return
+        futures = [executor.submit(Tournament.play_game, task)
+                   for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,230 @@
+from array import array
+
+
+class TransitionTable:
+    """
+    This class holds the destination of every move on a board layout, so
+    a move is resolved with one lookup instead of being computed on every
+    chit card flipped.
+    A move is looked up by the seat of the player, his board index and a
+    signed step, positive for a matching animal and negative for a dragon
+    pirate. The rules are the ones of ForwardAction and BackwardAction,
+    with the cave of each seat taken from the layout instead of the
+    player id.
+    Only the caves are fixed on a board, so a volcano at the destination
+    may still be occupied, which is checked when the player moves. The
+    table also holds the volcano before each tile, used to find where a
+    dragon pushed off a volcano goes.
+    Tables are built once per layout and shared.
+    """
+    NO_MOVE = -1    # Destination when the player does not move
+    END_TURN = 1    # The player stays and his turn ends
+    END_GAME = 2    # The player lands on his cave and wins
+    BLOCKED = 4     # The destination is another player's cave
+    MAX_STEP = 3    # Largest animal number on a chit card
+
+    tables = {}     # Tables keyed by (cave positions, homes, max step)
+
+    def __init__(self, board_size, cave_positions, homes, owners,
+                 max_step=MAX_STEP):
+        """
+        This method builds the table of the board layout.
+
+        input:
+        - board_size: the number of tiles on the board
+        - cave_positions: the board index of every cave
+        - homes: the board index of the cave of each seat
+        - owners: the owner seat of every tile, negative if none
+        - max_step: the largest step of a move
+
+        return: None
+        """
+        self.board_size = board_size
+        self.max_step = max_step
+        self.width = 2 * max_step + 1   # Entries per position
+        self.caves = set(cave_positions)
+        self.homes = tuple(homes)
+        self.owners = owners
+        # Board index of the last cave at or before each tile
+        self.prev_caves = []
+        prev_cave = max(cave_positions)
+        for tile in range(board_size):
+            if tile in self.caves:
+                prev_cave = tile
+            self.prev_caves.append(prev_cave)
+
+        # Board index of the nearest volcano before each tile, to find
+        # where a dragon pushed off a volcano goes
+        self.prev_volcanoes = array("i", [0]) * board_size
+        for tile in range(board_size):
+            prev = (tile - 1) % board_size
+            while prev in self.caves:
+                prev = (prev - 1) % board_size
+            self.prev_volcanoes[tile] = prev
+
+        # Moves only depend on the seat near a cave, so the moves of the
+        # first seat are copied for the others and only the moves starting
+        # near a cave are found again, which keeps large boards fast
+        near = sorted(set((cave + offset) % board_size
+                          for cave in self.caves
+                          for offset in range(-max_step - 1, max_step + 2)))
+        block = board_size * self.width
+        self.destinations = array("i", [TransitionTable.NO_MOVE]) * (
+            block * len(self.homes))
+        self.flags = bytearray(block * len(self.homes))
+        for seat in range(len(self.homes)):
+            if seat == 0:
+                positions = range(board_size)
+            else:
+                self.destinations[seat * block:(seat + 1) * block] = \
+                    self.destinations[:block]
+                self.flags[seat * block:(seat + 1) * block] = \
+                    self.flags[:block]
+                positions = near
+            for pos in positions:
+                i = (seat * board_size + pos) * self.width
+                for step in range(-max_step, max_step + 1):
+                    if step > 0:
+                        destination, flags = self._forward(seat, pos, step)
+                    elif step < 0:
+                        destination, flags = self._backward(seat, pos, -step)
+                    else:
+                        destination, flags = TransitionTable.NO_MOVE, 0
+                    if (destination != TransitionTable.NO_MOVE and
+                            not self._can_enter_cave(destination, seat)):
+                        flags |= TransitionTable.BLOCKED
+                    self.destinations[i + step + max_step] = destination
+                    self.flags[i + step + max_step] = flags
+
+    @staticmethod
+    def get(board_size, cave_positions, homes, owners,
+            max_step=MAX_STEP):
+        """
+        This method returns the table of the board layout, built on first
+        use.
+
+        input:
+        - board_size: the number of tiles on the board
+        - cave_positions: the board index of every cave
+        - homes: the board index of the cave of each seat
+        - owners: the owner seat of every tile, negative if none
+        - max_step: the largest step of a move
+
+        return: TransitionTable
+        """
+        key = (board_size, tuple(cave_positions), tuple(homes), max_step)
+        table = TransitionTable.tables.get(key)
+        if table is None:
+            table = TransitionTable(board_size, cave_positions, homes, owners,
+                                    max_step)
+            TransitionTable.tables[key] = table
+        return table
+
+    def index(self, seat, pos, step):
+        """
+        This method returns the index of a move in the table.
+
+        input:
+        - seat: the seat of the player
+        - pos: the board index of the player
+        - step: the signed number of steps
+
+        return: int
+        """
+        if not -self.max_step <= step <= self.max_step:
+            raise ValueError(f"step {step} is larger than {self.max_step}")
+        return (seat * self.board_size + pos) * self.width + step + \
+            self.max_step
+
+    def lookup(self, seat, pos, step):
+        """
+        This method returns the destination of a move and its flags.
+
+        input:
+        - seat: the seat of the player
+        - pos: the board index of the player
+        - step: the signed number of steps
+
+        return: int, int (destination or NO_MOVE, flags)
+        """
+        i = self.index(seat, pos, step)
+        return self.destinations[i], self.flags[i]
+
+    def _can_enter_cave(self, tile, seat):
+        """
+        This method checks if the tile is not another player's cave.
+
+        input:
+        - tile: the board index of the tile
+        - seat: the seat of the player
+
+        return: bool
+        """
+        return tile not in self.caves or self.owners[tile] == seat
+
+    def _forward(self, seat, pos, step):
+        """
+        This method finds the destination of a forward move, as
+        ForwardAction does.
+        A cave passed or landed on that is not the player's is skipped.
+        A player passing his own cave stays and his turn ends, a player
+        landing exactly on it wins.
+
+        input:
+        - seat: the seat of the player
+        - pos: the board index of the player
+        - step: the number of steps
+
+        return: int, int (destination or NO_MOVE, flags)
+        """
+        n = self.board_size
+        destination = (pos + step) % n
+        # If destination is not a cave
+        if destination not in self.caves:
+            prev_cave = self.prev_caves[destination]
+            # If the player passed a cave
+            if step > (destination - prev_cave) % n:
+                # If the cave passed is the player's cave, the player stays
+                if self._can_enter_cave(prev_cave, seat):
+                    return TransitionTable.NO_MOVE, TransitionTable.END_TURN
+                destination = (destination + 1) % n
+            return destination, 0
+
+        # If destination is the player's cave, the player wins
+        if destination == self.homes[seat]:
+            return destination, TransitionTable.END_GAME
+        # Otherwise skip the other player's cave
+        return (destination + 1) % n, 0
+
+    def _backward(self, seat, pos, step):
+        """
+        This method finds the destination of a backward move, as
+        BackwardAction does.
+        A player in his own cave does not move. A player passing his own
+        cave stops in it, another player's cave is skipped.
+
+        input:
+        - seat: the seat of the player
+        - pos: the board index of the player
+        - step: the number of steps
+
+        return: int, int (destination or NO_MOVE, flags)
+        """
+        if pos == self.homes[seat]:
+            return TransitionTable.NO_MOVE, 0
+
+        n = self.board_size
+        destination = (pos - step) % n
+        # If destination is not a cave
+        if destination not in self.caves:
+            prev_cave = self.prev_caves[pos]
+            # If the player passed a cave
+            if step >= (pos - prev_cave) % n:
+                if not self._can_enter_cave(prev_cave, seat):
+                    destination = (destination - 1) % n
+                else:
+                    destination = prev_cave
+        # If player lands on other player's cave, move one step backward
+        elif not self._can_enter_cave(destination, seat):
+            destination = (destination - 1) % n
+        return destination, 0
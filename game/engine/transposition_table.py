@@ -0,0 +1,77 @@
+from array import array
+
+
+class TranspositionTable:
+    """
+    This class caches the value of the positions searched, keyed by their
+    Zobrist hash, so a position reached by several flip orders is only
+    searched once.
+    The table has a fixed number of slots and a key only goes in the slot
+    of its low bits. A slot is replaced by a deeper search, or by any
+    search once its entry is from an older move.
+    """
+    EMPTY = 0   # Key of an empty slot, a hash is never 0
+
+    __slots__ = ["mask", "keys", "values", "depths", "ages", "age"]
+
+    def __init__(self, bits=16):
+        """
+        This method initializes an empty table.
+
+        input:
+        - bits: the table has 2 ** bits slots
+
+        return: None
+        """
+        size = 1 << bits
+        self.mask = size - 1
+        self.keys = array("Q", [TranspositionTable.EMPTY]) * size
+        self.values = array("d", [0.0]) * size
+        self.depths = array("b", [0]) * size
+        self.ages = array("H", [0]) * size
+        self.age = 0
+
+    def new_search(self):
+        """
+        This method starts a new move, so the entries of the previous ones
+        can be replaced first.
+
+        return: None
+        """
+        self.age = (self.age + 1) & 0xFFFF
+
+    def probe(self, key, depth):
+        """
+        This method returns the value of the position if it was searched
+        at least as deep.
+
+        input:
+        - key: the Zobrist hash of the position
+        - depth: the depth of the search needed
+
+        return: float, or None if not found
+        """
+        slot = key & self.mask
+        if self.keys[slot] == key and self.depths[slot] >= depth:
+            return self.values[slot]
+        return None
+
+    def store(self, key, depth, value):
+        """
+        This method keeps the value of the position, unless its slot holds
+        a deeper search of the current move.
+
+        input:
+        - key: the Zobrist hash of the position
+        - depth: the depth of the search
+        - value: the value of the position
+
+        return: None
+        """
+        slot = key & self.mask
+        if self.ages[slot] == self.age and self.depths[slot] > depth:
+            return
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.depths[slot] = depth
+        self.ages[slot] = self.age
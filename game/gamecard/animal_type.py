@@ -6,9 +6,50 @@ class AnimalType(enum.Enum):
     Enum class to represent the type of animal in the game.
     Animal type that represent reward (allow movement) is put at the front.
     Animal type that represent penalty is put at the back.
+    Large boards use more animal types, numbered after the dragon pirate
+    so the values of the original ones do not change.
     """
     BAT = 0
     BABY_DRAGON = 1
     SALAMANDER = 2
     SPIDER = 3
     DRAGON_PIRATE = 4   # Penalty
+    # Animal types of the large boards, drawn with tinted images
+    ANIMAL_5 = 5
+    ANIMAL_6 = 6
+    ANIMAL_7 = 7
+    ANIMAL_8 = 8
+    ANIMAL_9 = 9
+    ANIMAL_10 = 10
+    ANIMAL_11 = 11
+    ANIMAL_12 = 12
+    ANIMAL_13 = 13
+    ANIMAL_14 = 14
+    ANIMAL_15 = 15
+    ANIMAL_16 = 16
+
+    @staticmethod
+    def animal(index):
+        """
+        This method returns the animal type with the index, counting only
+        the reward animal types.
+
+        input:
+        - index: the index of the animal type, from 0
+
+        return: AnimalType
+        """
+        if index < AnimalType.DRAGON_PIRATE.value:
+            return AnimalType(index)
+        return AnimalType(index + 1)
+
+    def index(self):
+        """
+        This method returns the index of the reward animal type, the
+        opposite of animal.
+
+        return: int
+        """
+        if self.value < AnimalType.DRAGON_PIRATE.value:
+            return self.value
+        return self.value - 1
@@ -2,8 +2,6 @@ from button import Button
 from gamecard.card import Card
 from display import Display
 
-import pygame
-
 
 class ChitCard(Button, Card):
     """
@@ -15,7 +13,8 @@ class ChitCard(Button, Card):
     Penalty animal type : dragon pirate
     """
 
-    def __init__(self, front_image_path, back_image_path, scale, animal, animal_num):
+    def __init__(self, front_image_path, back_image_path, scale, animal, animal_num,
+                 front_tint=None):
         """
         This method initializes the chit card object.
 
@@ -25,6 +24,8 @@ class ChitCard(Button, Card):
         - scale: the scale of the chit card image
         - animal: the animal type of the chit card
         - animal_num: the animal number on the chit card
+        - front_tint: the (r, g, b) color the front image is tinted with, 
+                      if any
 
         return: None
         """
@@ -32,30 +33,24 @@ class ChitCard(Button, Card):
         Card.__init__(self, animal)
         self.animal_num = animal_num
         self.reveal = False  # To detect whether the card is flipped
-        self.front_image = Display.load_img(front_image_path, scale)
+        self.front_image = Display.load_img(front_image_path, scale,
+                                            front_tint)
         self.back_image = Display.load_img(back_image_path, scale)
 
-    def is_clicked(self):
+    def flip(self):
         """
-        This method checks if the chit card is clicked.
-        If the chit card is clicked, the method returns True and the front 
-        image of the chit card is shown.
-        It cannot be clicked anymore until the next player's turn.
+        This method flips the chit card to show its front image.
+        A chit card already revealed cannot be flipped until it is reset.
 
-        return: bool
+        return: bool, True if the chit card is flipped
         """
-        rect = self.image.get_rect()
-        rect.center = (self.x, self.y)
-
-        pos = pygame.mouse.get_pos()
-        if rect.collidepoint(pos):
-            if pygame.mouse.get_pressed()[0] and not self.clicked and not self.reveal:
-                self.clicked = True
-                self.reveal = True
-                self.image = self.front_image
-                return True
-        if not pygame.mouse.get_pressed()[0]:
-            self.clicked = False
+        if self.reveal:
+            return False
+        self.reveal = True
+        self.mark_dirty()
+        self.image = self.front_image
+        self.mark_dirty()
+        return True
 
     def get_animal_num(self):
         """
@@ -73,5 +68,8 @@ class ChitCard(Button, Card):
 
         return: None
         """
+        if self.reveal:
+            self.mark_dirty()
+            self.image = self.back_image
+            self.mark_dirty()
         self.reveal = False
-        self.image = self.back_image
@@ -1,5 +1,6 @@
 from gamepage.page import Page
 from display import Display
+from assets import Assets
 
 import pygame
 
@@ -11,7 +12,8 @@ class End(Page):
     the home page if they want to play the game again.
     """
 
-    def __init__(self, page_controller, window, winner_img_path):
+    def __init__(self, page_controller, window, winner_img_path,
+                 winner_tint=None):
         """
         This method initializes the end page.
 
@@ -19,11 +21,14 @@ class End(Page):
         - page_controller: the page controller of the game
         - window: the window of the game
         - winner_img_path: the image path of the winning player
+        - winner_tint: the color the image of the winning player is 
+                       tinted with, if any
 
         return: None
         """
         super().__init__(page_controller, window)
         self.winner_img_path = winner_img_path
+        self.winner_tint = winner_tint
 
     def run(self):
         """
@@ -34,29 +39,33 @@ class End(Page):
 
         return: None
         """
-        end_bg = Display.load_bg(self.window, 'Project/img/bg_img/end_bg.png')
+        end_bg = Display.load_bg(self.window, Assets.END_BG)
 
-        run = True
-        while run:
-            self.window.blit(end_bg, (0, 0))
-            Display.draw_text(self.window, "Game Winner:", 40, (0, 0, 0),
-                              self.window.get_width()//6, 
-                              self.window.get_height()//15, False)
-            Display.draw_text(self.window, "Press SPACE to play again", 18, (0, 0, 0),
-                              self.window.get_width()//2, 
-                              self.window.get_height()*2.9//3, False)
-
-            # Load player image (token)
-            winner_img = Display.load_img(self.winner_img_path, 1)
-            # Draw player image (token)
-            Display.draw_img(self.window, winner_img, self.window.get_width()//2, 
-                             self.window.get_height()//2)
+        # The page does not change, so draw it once
+        frame = self.compose(end_bg)
+        Display.draw_text(frame, "Game Winner:", 40, (0, 0, 0),
+                          self.window.get_width()//6, 
+                          self.window.get_height()//15, False)
+        Display.draw_text(frame, "Press SPACE to play again", 18, (0, 0, 0),
+                          self.window.get_width()//2, 
+                          self.window.get_height()*2.9//3, False)
 
-            pygame.display.update()
+        # Load player image (token)
+        winner_img = Display.load_img(self.winner_img_path,
+                                      Assets.WINNER_SCALE, self.winner_tint)
+        # Draw player image (token)
+        Display.draw_img(frame, winner_img, self.window.get_width()//2, 
+                         self.window.get_height()//2)
 
-            for event in pygame.event.get():
+        self.present(frame)
+        run = True
+        while run:
+            # The page is static, so wait for the next event
+            for event in self.scheduler.tick(idle=True):
                 if event.type == pygame.QUIT:
                     Display.quit()
+                elif self.is_exposed(event):
+                    self.present(frame)
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
                         run = False
@@ -1,15 +1,24 @@
 from gamepage.page import Page
-from gamepage.end import End
 from display import Display
+from assets import Assets
+from asset_loader import AssetLoader
+from camera import Camera
 from dragon import Dragon
+from drawable import Drawable
+from input_dispatcher import InputDispatcher
 from board.gameboard import GameBoard
 from gamecard.chit_card import ChitCard
 from gamecard.animal_type import AnimalType
-from action.forward_action import ForwardAction
-from action.backward_action import BackwardAction
-
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from engine.mcts_policy import MctsPolicy
+from engine.replay_log import ReplayWriter
+
+from concurrent.futures import ThreadPoolExecutor
+import math
+import multiprocessing
+import os
 import pygame
-import random
 import time
 
 
@@ -18,11 +27,45 @@ class Game(Page):
     This class is used to create a game object.
     The game object is the main object that controls the game.
     It is responsible for creating the gameboard, dragons and chit cards.
-    It controls the overall game logic.
+    The game logic is handled by the game state, the game object shows 
+    the game state and passes the chit cards clicked to it.
+    The computer players pick their chit card with a MctsPolicy searching
+    in a thread, so the window keeps handling events while they think.
+    Its worker processes are spawned rather than forked, as forking the 
+    window and its threads is not safe.
+    The gameboard is seen through a camera: the mouse wheel or +/- zoom, 
+    dragging with the right mouse button or the arrow keys pan, and Home 
+    goes back to the whole gameboard. The chit cards stay in place.
+    Every chit card flipped is written to a replay log. A game played 
+    again from its log flips its chit cards by itself: Page Up and Page 
+    Down go to the previous or next turn, 10 turns with Shift, and Space 
+    pauses.
     """
+    MESSAGE_DELAY = 1000    # How long a message is shown, in milliseconds
+    BOT_BUDGET = 1.0        # How long a computer player thinks, in seconds
+    BOT_POLL = 30           # How often the search is checked, in milliseconds
+    # Processes searching for a computer player, every core but one,
+    # which is left to the window
+    BOT_WORKERS = max((os.cpu_count() or 1) - 1, 1)
+    CHIT_INTERVAL = 75      # The interval between each chit card
+    MIN_DRAGON_RATIO = 0.5  # Dragons shrink with the tiles, but not below
+    PAN_DISTANCE = 50       # How far an arrow key moves the view, in pixels
+    # Direction the view moves for each arrow key
+    PAN_KEYS = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0),
+                pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+    ZOOM_IN_KEYS = (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS)
+    ZOOM_OUT_KEYS = (pygame.K_MINUS, pygame.K_KP_MINUS)
+    REPLAY_DELAY = 300      # Time between the flips of a replay, in ms
+    SEEK_KEYS = {pygame.K_PAGEUP: -1, pygame.K_PAGEDOWN: 1}
+    SEEK_FAR = 10           # Turns skipped with Shift
+    # Name of the chit card images of each animal type
+    CHIT_NAMES = {AnimalType.BABY_DRAGON: "baby_d", AnimalType.BAT: "bat",
+                  AnimalType.SALAMANDER: "sal", AnimalType.SPIDER: "spi",
+                  AnimalType.DRAGON_PIRATE: "p"}
 
     def __init__(self, page_controller, window, player_num, size=24,
-                 animal_num=4):
+                 animal_num=4, seed=None, bot_num=0, replay=None,
+                 replay_dir=None):
         """
         This method initializes the game object.
 
@@ -32,16 +75,58 @@ class Game(Page):
         - player_num: the number of players
         - size: the number of volcanoes on the gameboard
         - animal_num: the number of animal types in the game
+        - seed: the seed the board and the chit cards are shuffled from,
+                a random seed if None
+        - bot_num: the number of computer players, playing the last seats
+        - replay: the Replay of a log to play again, which gives the 
+                  players, the board and the chit cards
+        - replay_dir: the folder the replay log is written to, no log is 
+                      written if None
 
         return: None
         """
         super().__init__(page_controller, window)
+        # Wait for the images preloaded by the previous pages
+        AssetLoader.wait(self._draw_loading)
         self.player_num = player_num
+        rng = GameRng(seed)
+        self.replay = replay
+        self.replay_flip = 0    # Number of chit cards of the log flipped
+        self.paused = False
+        self.recorder = None
+        if replay is not None:
+            self.state = replay.state_at(0)
+        else:
+            self.state = GameState(player_num, size, animal_num, rng=rng)
+            if replay_dir is not None:
+                os.makedirs(replay_dir, exist_ok=True)
+                name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.state.seed}"
+                self.recorder = ReplayWriter(
+                    os.path.join(replay_dir, name + ".fdr"), self.state)
+        # One policy plays every computer player, as it searches for the
+        # current player
+        self.bot_seats = range(player_num - bot_num, player_num)
+        self.bot = None
+        if bot_num:
+            self.bot = MctsPolicy(rng.spawn("bot"), Game.BOT_BUDGET,
+                                  workers=Game.BOT_WORKERS,
+                                  mp_context=multiprocessing.get_context(
+                                      "spawn"))
+            self.bot.start()
+            self.thinker = ThreadPoolExecutor(1)
+        # Show the seed so the game can be played again with --seed
+        pygame.display.set_caption(
+            f"{page_controller.main.WINDOW_TITLE} - seed {self.state.seed}")
         # Variable named players for better readability
-        self.players = self._create_dragons()
+        self.players = self._create_dragons(size)
         self.chit_cards = self._create_cc()
         self.gameboard = GameBoard(self.window, self.players, size,
-                                   animal_num)
+                                   animal_num, self.state.volcano_animals())
+        # Large boards can be zoomed until the tiles are as large as on
+        # the rings
+        self.camera = Camera(
+            self.window.get_width(), self.window.get_height(),
+            Camera.MIN_MAX_ZOOM / self.gameboard.tile_ratio)
 
     def run(self):
         """ 
@@ -51,225 +136,483 @@ class Game(Page):
 
         return: None
         """
-        end = False
-        current_player = 0  # Track the current player
-        card_reveal = 0     # Track the number of chit cards revealed
+        self.leave = False          # Flag to change to the end page
+        self.waiting = False        # Ignore clicks while the turn changes
+        dispatcher = InputDispatcher()
+        for chit_card in self.chit_cards:
+            dispatcher.register(chit_card, self._on_chit_card_clicked)
+
+        Drawable.dirty_tracker.mark_all()
         self.update_gameboard()
-        while not end:
-            for event in pygame.event.get():
+        self._play_bot()
+        self._play_replay()
+        while not self.leave:
+            # Nothing moves on the gameboard unless a chit card is clicked,
+            # so wait for the next event or timer instead of spinning
+            events = self.scheduler.tick(idle=True)
+            moved = False
+            for event in events:
                 if event.type == pygame.QUIT:
+                    self._close()
                     Display.quit()
-
-            animal_type = None
-            step = None
-            end_turn = False
-
-            # Check if all chit cards are revealed
-            if card_reveal > len(self.chit_cards) - 1:
-                current_player, card_reveal = self._next_player(
-                    current_player, card_reveal)
-
-            for chit_card in self.chit_cards:
-                # If a chit card is clicked
-                if chit_card.is_clicked():
-                    self.update_gameboard()
-                    animal_type = chit_card.get_animal()
-                    step = chit_card.get_animal_num()
-                    card_reveal += 1
-                    break
-
-            player = self.players[current_player]
-            pos = player.get_board_pos()
-
-            if animal_type is None:
-                continue
-
-            # When card drawn is a penalty card
-            elif animal_type == AnimalType.DRAGON_PIRATE:
-                action = BackwardAction(pos, step, player,
-                                        self.gameboard.get_board(),
-                                        self.gameboard.get_cave_distance(),
-                                        self.players)
-                end_turn = action.execute()
+                moved = self._on_camera_event(event) or moved
+                self._on_replay_event(event)
+            if moved:
+                # The view is drawn again once for all the events
+                Drawable.dirty_tracker.mark_all()
                 self.update_gameboard()
+            dispatcher.dispatch(events)
 
-            # When animal type does not match
-            elif self.gameboard.get_board()[pos].get_animal() != animal_type:
-                end_turn = True
-
-            # When the animal type matches
-            else:
-                action = ForwardAction(pos, step, player,
-                                       self.gameboard.get_board(),
-                                       self.gameboard.get_cave_distance(),
-                                       self.players)
-                end_turn, end = action.execute()
-                self.update_gameboard()
+        self._close()
+        # Change to end page to show the winner
+        # The next page is imported on first use to shorten the startup
+        from gamepage.end import End
+        self.change_page(
+            End(self.page_controller, self.window,
+                self.players[self.state.winner].get_img_path(),
+                self.players[self.state.winner].get_tint()))
 
-            # if the player's turn ends, change to the next player and reset
-            # the chit cards
-            if end_turn:
-                current_player, card_reveal = self._next_player(
-                    current_player, card_reveal)
+    def _close(self):
+        """
+        This method stops the timers and the computer players, and closes 
+        the replay log.
 
-        # Change to end page to show the winner
+        return: None
+        """
+        self.scheduler.cancel_all()
+        if self.bot is not None:
+            # Wait for the search running, so it does not start the 
+            # workers again once they are stopped
+            self.thinker.shutdown(cancel_futures=True)
+            self.bot.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _on_chit_card_clicked(self, chit_card):
+        """
+        This method plays the chit card clicked by the current player.
+        Clicks are ignored while a computer player is playing, and in a 
+        replay.
+
+        input:
+        - chit_card: the chit card clicked
+
+        return: None
+        """
+        if (self.waiting or self.replay is not None or
+                self.state.current_player in self.bot_seats or
+                not chit_card.flip()):
+            return
+        self._play_chit_card(chit_card)
+
+    def _on_camera_event(self, event):
+        """
+        This method moves the camera for the zoom and pan inputs.
+
+        input:
+        - event: the event
+
+        return: bool, whether the view changed
+        """
+        camera = self.camera
+        center_x = self.window.get_width() // 2
+        center_y = self.window.get_height() // 2
+        if event.type == pygame.MOUSEWHEEL:
+            x, y = pygame.mouse.get_pos()
+            return camera.zoom_at(event.y, x, y)
+        if event.type == pygame.MOUSEMOTION and event.buttons[2]:
+            # The gameboard follows the mouse
+            return camera.pan(-event.rel[0], -event.rel[1])
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key in Game.PAN_KEYS:
+            dx, dy = Game.PAN_KEYS[event.key]
+            return camera.pan(dx * Game.PAN_DISTANCE, dy * Game.PAN_DISTANCE)
+        if event.key in Game.ZOOM_IN_KEYS:
+            return camera.zoom_at(1, center_x, center_y)
+        if event.key in Game.ZOOM_OUT_KEYS:
+            return camera.zoom_at(-1, center_x, center_y)
+        if event.key == pygame.K_HOME and not camera.is_home():
+            camera.reset()
+            return True
+        return False
+
+    def _play_chit_card(self, chit_card):
+        """
+        This method plays the chit card flipped by the current player.
+        The game state moves the player according to the chit card, then 
+        the turn changes if it ends.
+
+        input:
+        - chit_card: the chit card flipped
+
+        return: FlipResult
+        """
+        self.update_gameboard()
+        result = self.state.apply_flip(self.chit_cards.index(chit_card))
+        if self.recorder is not None:
+            self.recorder.record(result)
+        if result.moves:
+            self._move_dragons()
+            self.update_gameboard()
+
+        if result.end_game:
+            self._game_over()
+
+        # if the player's turn ends, change to the next player and reset
+        # the chit cards
+        elif result.end_turn:
+            self._next_player()
+        return result
+
+    def _play_bot(self):
+        """
+        This method starts the search of the computer player whose turn it
+        is. The search runs on a copy of the game state in a thread, and
+        is checked on a timer so the window does not stall.
+
+        return: None
+        """
+        if (self.state.winner is not None or
+                self.state.current_player not in self.bot_seats):
+            return
+        self.waiting = True
+        future = self.thinker.submit(self.bot.choose, self.state.copy())
+        self.scheduler.call_later(Game.BOT_POLL,
+                                  lambda: self._wait_bot(future))
+
+    def _wait_bot(self, future):
+        """
+        This method flips the chit card picked by the computer player once
+        the search is over, and lets him keep playing if his turn goes on.
+
+        input:
+        - future: the Future of the chit card index picked
+
+        return: None
+        """
+        if not future.done():
+            self.scheduler.call_later(Game.BOT_POLL,
+                                      lambda: self._wait_bot(future))
+            return
+        self.waiting = False
+        chit_card = self.chit_cards[future.result()]
+        chit_card.flip()
+        result = self._play_chit_card(chit_card)
+        if not (result.end_turn or result.end_game):
+            self._play_bot()
+
+    def _play_replay(self):
+        """
+        This method flips the next chit card of the replay after a delay.
+
+        return: None
+        """
+        if (self.replay is None or self.state.winner is not None or
+                self.replay_flip >= self.replay.flip_num):
+            return
+        self.scheduler.call_later(Game.REPLAY_DELAY, self._flip_replay)
+
+    def _flip_replay(self):
+        """
+        This method flips the next chit card of the replay, and the one 
+        after if the turn goes on. It waits while the replay is paused.
+
+        return: None
+        """
+        if self.paused:
+            self.scheduler.call_later(Game.REPLAY_DELAY, self._flip_replay)
+            return
+        chit_card = self.chit_cards[self.replay.cards[self.replay_flip]]
+        self.replay_flip += 1
+        chit_card.flip()
+        result = self._play_chit_card(chit_card)
+        if not (result.end_turn or result.end_game):
+            self._play_replay()
+
+    def _on_replay_event(self, event):
+        """
+        This method seeks or pauses the replay for the keys pressed.
+
+        input:
+        - event: the event
+
+        return: None
+        """
+        if self.replay is None or event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif event.key in Game.SEEK_KEYS:
+            turns = Game.SEEK_KEYS[event.key]
+            if event.mod & pygame.KMOD_SHIFT:
+                turns *= Game.SEEK_FAR
+            self._seek(self.replay.turn_of(self.replay_flip) + turns)
+
+    def _seek(self, turn):
+        """
+        This method shows the replay from the start of the turn. The game 
+        state is played from the last keyframe of the log before it.
+
+        input:
+        - turn: the number of the turn, kept within the turns of the log
+
+        return: None
+        """
+        turn = min(max(turn, 0), self.replay.turn_num - 1)
+        # Drop the flips and messages of the turn shown
+        self.scheduler.cancel_all()
+        self.state = self.replay.state_at(turn)
+        self.replay_flip = self.replay.turn_starts[turn]
+        self._move_dragons()
+        self.waiting = True
+        self._show_next_player()
+
+    def _move_dragons(self):
+        """
+        This method moves the dragons to their position in the game state.
+
+        return: None
+        """
+        board = self.gameboard.get_board()
+        for player, pos in zip(self.players, self.state.positions):
+            if player.get_board_pos() != pos:
+                player.set_pos(pos, board[pos].get_pos())
+
+    def _game_over(self):
+        """
+        This method shows the game over message and leaves the game after 
+        a delay, without blocking the event handling.
+
+        return: None
+        """
+        self.waiting = True
         Display.draw_text(self.window, "GAME OVER", 70, (0, 0, 0),
                           self.window.get_width()//2,
                           self.window.get_height()//2)
-        time.sleep(1)
-        self.change_page(
-            End(self.page_controller, self.window, player.get_img_path()))
+        self.scheduler.call_later(Game.MESSAGE_DELAY,
+                                  lambda: setattr(self, "leave", True))
 
-    def _next_player(self, current_player, card_reveal):
+    def _next_player(self):
         """
-        This method is used to change the turn to the next player.
-        The current player index will be increment by 1.
+        This method is used to show the turn change to the next player.
         All the chit cards will be reset.
+        The chit cards flipped stay visible for a moment, then the next 
+        player is announced. Clicks are ignored until the next player's 
+        turn starts.
 
-        input:
-        - current_player: the current player index
-        - card_reveal: the number of chit cards revealed
+        return: None
+        """
+        self.waiting = True
+        self.scheduler.call_later(Game.MESSAGE_DELAY, self._show_next_player)
 
-        return: int, int
+    def _show_next_player(self):
+        """
+        This method resets the chit cards and shows which player's turn it 
+        is.
+
+        return: None
         """
-        current_player = (current_player + 1) % self.player_num
-        card_reveal = 0
         for chit_card in self.chit_cards:
             chit_card.reset()
-
-        time.sleep(1)
         self.update_gameboard()
 
-        Display.draw_text(self.window, f"Player {current_player + 1}'s turn",
+        Display.draw_text(self.window,
+                          f"Player {self.state.current_player + 1}'s turn",
                           25, (0, 0, 0), self.window.get_width()//2,
                           self.window.get_height()//2)
-        time.sleep(1)
+        # The text is drawn over the gameboard, so redraw the whole window
+        Drawable.dirty_tracker.mark_all()
+        self.scheduler.call_later(Game.MESSAGE_DELAY, self._start_turn)
+
+    def _start_turn(self):
+        """
+        This method removes the message from the gameboard and lets the 
+        next player click on the chit cards.
+
+        return: None
+        """
         self.update_gameboard()
+        self.waiting = False
+        self._play_bot()
+        self._play_replay()
+
+    def _draw_loading(self, loaded, total):
+        """
+        This method shows the progress of the images loading.
 
-        return current_player, card_reveal
+        input:
+        - loaded: the number of images loaded
+        - total: the total number of images
+
+        return: None
+        """
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                Display.quit()
+
+        width = self.window.get_width() // 2
+        height = 20
+        x = (self.window.get_width() - width) // 2
+        y = self.window.get_height() // 2
+        self.window.fill(GameBoard.BG_COLOR)
+        Display.draw_text(self.window, "Loading...", 25, (0, 0, 0),
+                          self.window.get_width()//2, y - height, False)
+        pygame.draw.rect(self.window, (0, 0, 0), (x, y, width, height), 2)
+        pygame.draw.rect(self.window, (0, 0, 0),
+                         (x, y, width * loaded // total, height))
+        pygame.display.update()
 
     def update_gameboard(self):
         """
         This method updates the display of the game if there is any player 
         movement or flipping of chit cards, etc.
+        Only the regions marked in the dirty tracker are redrawn and 
+        updated on the display, unless the whole window is marked.
+        The regions are marked where the objects are at home, so the whole 
+        window is redrawn when the camera is not.
 
         return: None
         """
-        self.gameboard.draw()
-        self._draw_game_element()
-        pygame.display.update()
-
-    def _draw_game_element(self):
+        rects = Drawable.dirty_tracker.flush()
+        if rects is None or (rects and not self.camera.is_home()):
+            self.gameboard.draw(self.camera)
+            self._draw_game_element()
+            pygame.display.update()
+        elif rects:
+            for rect in rects:
+                # Restrict the drawing to the changed region, otherwise
+                # the objects redrawn could cover others outside of it
+                self.window.set_clip(rect)
+                self.gameboard.draw()
+                self._draw_game_element(rect)
+            self.window.set_clip(None)
+            pygame.display.update(rects)
+
+    def _draw_game_element(self, area=None):
         """
         This method draws the chit card and dragons on the window.
 
+        input:
+        - area: the region to draw in, the whole window if None
+
         return: None
         """
-        self._draw_chit_cards()
-        self._draw_dragons()
+        self._draw_chit_cards(area)
+        self._draw_dragons(area)
 
-    def _draw_dragons(self):
+    def _draw_dragons(self, area=None):
         """
         This method draws the dragons on the window.
 
+        input:
+        - area: only dragons overlapping the region are drawn if given
+
         return: None
         """
+        camera = None if self.camera.is_home() else self.camera
         for player in self.players:
-            player.draw(self.window)
+            if area is None or area.colliderect(player.get_rect()):
+                player.draw(self.window, camera)
 
-    def _draw_chit_cards(self):
+    def _draw_chit_cards(self, area=None):
         """
         This method draws the chit cards on the window.
 
+        input:
+        - area: only chit cards overlapping the region are drawn if given
+
         return: None
         """
         for chit_card in self.chit_cards:
-            chit_card.draw(self.window)
+            if area is None or area.colliderect(chit_card.get_rect()):
+                chit_card.draw(self.window)
 
-    def _create_dragons(self):
+    def _create_dragons(self, size):
         """
         This method creates the dragons.
+        The dragons are shrunk with the tiles of large gameboards, and 
+        players past the dragon images get a tinted one.
+
+        input:
+        - size: the number of volcanoes on the gameboard
 
         return: list
         """
-        # Image path
-        img_paths = ["Project/img/pimg/r.png", "Project/img/pimg/y.png",
-                     "Project/img/pimg/g.png", "Project/img/pimg/b.png"]
         dragons = []
-        scale = 0.11
+        ratio = GameBoard.get_tile_ratio(self.window, size, self.player_num)
+        scale = Assets.DRAGON_SCALE * max(ratio, Game.MIN_DRAGON_RATIO)
         for i in range(self.player_num):
-            dragons.append(Dragon(i, img_paths[i], scale))
+            img_path, tint = Assets.tinted(Assets.DRAGON_IMAGES, i)
+            dragons.append(Dragon(i, img_path, scale, tint))
 
         return dragons
 
     def _create_cc(self):
         """
-        This method creates the chit cards list and the randomized window 
-        display position.
+        This method creates the chit cards list and their window display 
+        position.
+        The chit cards follow the order of the shuffled deck of the game 
+        state, so their position is random.
+        The 16 chit cards of the game are laid out on a 4 by 4 grid. Larger
+        decks are laid out on a larger grid of smaller chit cards, which 
+        still fits in the middle of the gameboard.
 
         return: list
         """
-        x_pos = []
-        y_pos = []
         window_w = self.window.get_width()
         window_h = self.window.get_height()
-        interval = 75   # The interval between each chit card
-        for i in range(1, 4, 2):
-            x_pos.append(int(window_w/2 + interval*i/2))
-            x_pos.append(int(window_w/2 - interval*i/2))
-            y_pos.append(int(window_h/2 + interval*i/2))
-            y_pos.append(int(window_h/2 - interval*i/2))
-
-        pos_tuple = [(x, y) for x in x_pos for y in y_pos]
-        random.shuffle(pos_tuple)
+        columns = max(4, math.ceil(math.sqrt(len(self.state.deck))))
+        interval = Game.CHIT_INTERVAL   # The interval between each chit card
+        scale = Assets.CHIT_SCALE       # The scale of the chit card image
+        if columns > 4:
+            # The corners of the grid stay inside the middle of the spiral
+            interval = GameBoard.CENTER_SPACE / (columns + 1) / math.sqrt(2)
+            scale *= interval / Game.CHIT_INTERVAL
+        # Rows and columns from the middle out, as the first chit cards
+        # were placed
+        offsets = sorted((interval * (i - (columns - 1) / 2)
+                          for i in range(columns)),
+                         key=lambda offset: (abs(offset), -offset))
+        pos_tuple = [(int(window_w/2 + x), int(window_h/2 + y))
+                     for x in offsets for y in offsets]
 
         # Create chit cards
         chit_cards = []
-        scale = 0.05    # The scale of the chit card image
+        back_img_path = Assets.CHIT_BACK
         pos_tuple_index = 0
-        for i in range(1, 4):
-            # Create baby dragon chit cards
-            img_path = f"Project/img/ccimg/baby_d{i}.png"
-            back_img_path = "Project/img/ccimg/back.png"
+        for animal, num in self.state.deck:
+            animal_type = AnimalType(animal)
+            img_path, tint = Game._chit_front(animal_type, num)
             cc, pos_tuple_index = self._cc_helper(
                 img_path, back_img_path, pos_tuple, pos_tuple_index,
-                AnimalType.BABY_DRAGON, i, scale)
+                animal_type, num, scale, tint)
             chit_cards.append(cc)
 
-            # Create bat chit cards
-            img_path = f"Project/img/ccimg/bat{i}.png"
-            cc, pos_tuple_index = self._cc_helper(
-                img_path, back_img_path, pos_tuple, pos_tuple_index,
-                AnimalType.BAT, i, scale)
-            chit_cards.append(cc)
-
-            # Create salamander chit cards
-            img_path = f"Project/img/ccimg/sal{i}.png"
-            cc, pos_tuple_index = self._cc_helper(
-                img_path, back_img_path, pos_tuple, pos_tuple_index,
-                AnimalType.SALAMANDER, i, scale)
-            chit_cards.append(cc)
+        return chit_cards
 
-            # Create spider chit cards
-            img_path = f"Project/img/ccimg/spi{i}.png"
-            cc, pos_tuple_index = self._cc_helper(
-                img_path, back_img_path, pos_tuple, pos_tuple_index,
-                AnimalType.SPIDER, i, scale)
-            chit_cards.append(cc)
+    @staticmethod
+    def _chit_front(animal_type, num):
+        """
+        This method returns the front image of a chit card. The animal 
+        types of large boards use the image of one of the 4 animals, 
+        tinted.
 
-            # Create pirate dragon chit cards
-            if i < 3:
-                img_path = f"Project/img/ccimg/p{i}.png"
-                for _ in range(2):
-                    cc, pos_tuple_index = self._cc_helper(
-                        img_path, back_img_path, pos_tuple, pos_tuple_index,
-                        AnimalType.DRAGON_PIRATE, i, scale)
-                    chit_cards.append(cc)
+        input:
+        - animal_type: the animal type of the chit card
+        - num: the animal number of the chit card
 
-        return chit_cards
+        return: str, (r, g, b) or None
+        """
+        if animal_type == AnimalType.DRAGON_PIRATE:
+            return Assets.chit_front(Game.CHIT_NAMES[animal_type], num), None
+        animals = len(Assets.VOLCANO_IMAGES)
+        index = animal_type.index()
+        name = Game.CHIT_NAMES[AnimalType.animal(index % animals)]
+        return Assets.chit_front(name, num), Assets.tint(index // animals)
 
     def _cc_helper(self, img_path, back_img_path, pos_tuple, index,
-                   animal_type, animal_num, scale):
+                   animal_type, animal_num, scale, tint=None):
         """
         Helper function for creating chit card.
 
@@ -281,11 +624,13 @@ class Game(Page):
         - animal_type: the animal type of the chit card
         - animal_num: the animal number of the chit card
         - scale: the scale of the chit card image
+        - tint: the color the front image is tinted with, if any
 
         return: ChitCard, int
         """
         x, y = pos_tuple[index]
         index += 1
-        chit_card = ChitCard(img_path, back_img_path, scale, animal_type, animal_num)
+        chit_card = ChitCard(img_path, back_img_path, scale, animal_type,
+                             animal_num, tint)
         chit_card.set_pos(x, y)
         return chit_card, index
\ No newline at end of file
@@ -1,7 +1,10 @@
 from gamepage.page import Page
 from button import Button
-from gamepage.setup import Setup
+from input_dispatcher import InputDispatcher
 from display import Display
+from assets import Assets
+from asset_loader import AssetLoader
+from startup_profile import StartupProfile
 
 import pygame
 
@@ -30,15 +33,18 @@ class Home(Page):
 
         return: None
         """
+        # Load the images of the next pages while the home page is shown
+        AssetLoader.preload(self.window, Assets.game_images(),
+                            [Assets.SETUP_BG, Assets.END_BG])
+
         # Load images
-        home_bg = Display.load_bg(
-            self.window, 'Project/img/bg_img/home_bg.png')
-        start_button_img_path = 'Project/img/button_img/start.png'
-        quit_button_img_path = 'Project/img/button_img/quit.png'
+        home_bg = Display.load_bg(self.window, Assets.HOME_BG)
+        start_button_img_path = Assets.START_BUTTON
+        quit_button_img_path = Assets.QUIT_BUTTON
 
         # Set scale and create button instances
-        start_button_scale = 0.3
-        quit_button_scale = 0.2
+        start_button_scale = Assets.START_BUTTON_SCALE
+        quit_button_scale = Assets.QUIT_BUTTON_SCALE
         start_button = Button(start_button_img_path, start_button_scale)
         quit_button = Button(quit_button_img_path, quit_button_scale)
 
@@ -48,21 +54,40 @@ class Home(Page):
         quit_button.set_pos(self.window.get_width()//2,
                             self.window.get_height()*2.2//3)
 
-        run = True
-        while run:
-            self.window.blit(home_bg, (0, 0))
-            start_button.draw(self.window)
-            quit_button.draw(self.window)
+        # Route the clicks to the buttons
+        dispatcher = InputDispatcher()
+        dispatcher.register(start_button, self._on_start_clicked)
+        dispatcher.register(quit_button, lambda button: Display.quit())
 
-            if start_button.is_clicked():
-                run = False
-            if quit_button.is_clicked():
-                Display.quit()
+        # The page does not change, so draw it once
+        frame = self.compose(home_bg)
+        start_button.draw(frame)
+        quit_button.draw(frame)
 
-            for event in pygame.event.get():
+        self.present(frame)
+        StartupProfile.first_frame()
+        self.run_page = True
+        while self.run_page:
+            # The page is static, so wait for the next event
+            events = self.scheduler.tick(idle=True)
+            for event in events:
                 if event.type == pygame.QUIT:
                     Display.quit()
+                elif self.is_exposed(event):
+                    self.present(frame)
+            dispatcher.dispatch(events)
 
-            pygame.display.update()
-
+        # The next page is imported on first use to shorten the startup
+        from gamepage.setup import Setup
         self.change_page(Setup(self.page_controller, self.window))
+
+    def _on_start_clicked(self, button):
+        """
+        This method leaves the home page when the start button is clicked.
+
+        input:
+        - button: the start button
+
+        return: None
+        """
+        self.run_page = False
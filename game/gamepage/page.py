@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+import pygame
+
 
 class Page(ABC):
     """
@@ -20,6 +22,47 @@ class Page(ABC):
         """
         self.page_controller = page_controller
         self.window = window
+        self.scheduler = page_controller.get_scheduler()
+
+    def compose(self, background):
+        """
+        Create a frame of the page to draw the static content on.
+        Pages draw their content once on a frame and only copy the frame 
+        to the window afterwards.
+
+        input:
+        - background: the background image of the page
+
+        return: Surface
+        """
+        # The background is shared through the image cache, so draw on a
+        # copy of it
+        return background.convert()
+
+    def present(self, frame):
+        """
+        Copy the frame to the window and update the display.
+
+        input:
+        - frame: the frame to show
+
+        return: None
+        """
+        self.window.blit(frame, (0, 0))
+        pygame.display.update()
+
+    @staticmethod
+    def is_exposed(event):
+        """
+        Check if the event asks for the window to be drawn again, for 
+        example after the window was hidden.
+
+        input:
+        - event: the event to check
+
+        return: bool
+        """
+        return event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
 
     def change_page(self, page):
         """
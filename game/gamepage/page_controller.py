@@ -25,3 +25,38 @@ class PageController:
         return: None
         """
         self.main.set_state(page)
+
+    def get_scheduler(self):
+        """
+        Get the frame scheduler shared by the pages.
+
+        return: FrameScheduler
+        """
+        return self.main.scheduler
+
+    def get_seed(self):
+        """
+        This method returns the seed the games are played with.
+
+        return: int, or None for a random seed
+        """
+        return self.main.seed
+
+    def get_board(self):
+        """
+        This method returns the size of the gameboard the games are 
+        played on.
+
+        return: int, the number of volcanoes, and int, the number of 
+                animal types
+        """
+        return self.main.size, self.main.animal_num
+
+    def get_replay_dir(self):
+        """
+        This method returns the folder the replay logs of the games are 
+        written to.
+
+        return: str, or None if no log is written
+        """
+        return self.main.replay_dir
@@ -1,16 +1,18 @@
 from gamepage.page import Page
 from display import Display
-from gamepage.game import Game
+from assets import Assets
 
 import pygame
-import time
 
 
 class Setup(Page):
     """
     Setup page of the game.
-    Used to get the number of players from the user.
+    Used to get the number of players and how many of them are played by
+    the computer from the user.
     """
+    MESSAGE_DELAY = 1000    # How long a message is shown, in milliseconds
+    MAX_PLAYERS = 16        # Past 4 players, the gameboard is a spiral
 
     def __init__(self, page_controller, window):
         """
@@ -31,8 +33,16 @@ class Setup(Page):
         return: None
         """
         player_num = self._get_player_num()
+        bot_num = self._get_bot_num(player_num)
+        size, animal_num = self.page_controller.get_board()
+        replay_dir = self.page_controller.get_replay_dir()
+        # The next page is imported on first use to shorten the startup
+        from gamepage.game import Game
         self.change_page(Game(self.page_controller, self.window,
-                              player_num))
+                              player_num, size, animal_num,
+                              seed=self.page_controller.get_seed(),
+                              bot_num=bot_num,
+                              replay_dir=replay_dir))
 
     def _get_player_num(self):
         """
@@ -40,46 +50,93 @@ class Setup(Page):
         If the input is invalid, display an error message and ask for 
         input again.
 
+        return: int
+        """
+        return self._ask(
+            f"Enter the number of players. (2-{Setup.MAX_PLAYERS})", 2,
+            Setup.MAX_PLAYERS)
+
+    def _get_bot_num(self, player_num):
+        """
+        Get the number of computer players from the user. The computer
+        plays the last seats.
+
+        input:
+        - player_num: the number of players
+
+        return: int
+        """
+        return self._ask(
+            f"Enter the number of computer players. (0-{player_num})", 0,
+            player_num)
+
+    def _ask(self, prompt, low, high):
+        """
+        Ask the user for a number between low and high.
+        If the input is invalid, display an error message and ask for 
+        input again.
+
+        input:
+        - prompt: the question shown to the user
+        - low: the smallest valid number
+        - high: the largest valid number
+
         return: int
         """
         # Load image
-        setup_bg = Display.load_bg(
-            self.window, 'Project/img/bg_img/setup_bg.png')
+        setup_bg = Display.load_bg(self.window, Assets.SETUP_BG)
+
+        # Draw the static content of the page once
+        prompt_frame = self.compose(setup_bg)
+        Display.draw_text(prompt_frame, prompt, 24,
+                          (255, 255, 255), self.window.get_width()//2,
+                          self.window.get_height()//3, False)
+        invalid_frame = self.compose(setup_bg)
+        Display.draw_text(invalid_frame, "Invalid input!",
+                          50, (255, 255, 255),
+                          self.window.get_width()//2,
+                          self.window.get_height()*1.6//4, False)
 
         input = ""
+        self.invalid = False    # Whether the error message is shown
+        shown = None            # The state shown on the window
         run = True
         while run:
-            self.window.blit(setup_bg, (0, 0))
-            Display.draw_text(self.window,
-                              "Enter the number of players. (2-4)", 24,
-                              (255, 255, 255), self.window.get_width()//2,
-                              self.window.get_height()//3, False)
-
-            Display.draw_text(self.window, input, 32, (255, 255, 255),
-                              self.window.get_width()//2,
-                              self.window.get_height()*1.5//3, True)
+            # Only draw the page again if the input changed what is shown
+            if (self.invalid, input) != shown:
+                if self.invalid:
+                    self.window.blit(invalid_frame, (0, 0))
+                else:
+                    self.window.blit(prompt_frame, (0, 0))
+                    Display.draw_text(self.window, input, 32,
+                                      (255, 255, 255),
+                                      self.window.get_width()//2,
+                                      self.window.get_height()*1.5//3, False)
+                pygame.display.update()
+                shown = (self.invalid, input)
 
-            for event in pygame.event.get():
+            # The page only changes on input, so wait for the next event
+            for event in self.scheduler.tick(idle=True):
                 if event.type == pygame.QUIT:
                     Display.quit()
+                elif self.is_exposed(event):
+                    shown = None
                 elif event.type == pygame.KEYDOWN:
                     # Check if the user pressed enter (indicates the user
                     # has finished the input)
                     if event.key == pygame.K_RETURN:
                         # Check valid input
-                        valid = ['2', '3', '4']
+                        valid = [str(i) for i in range(low, high + 1)]
                         if input in valid:
                             return int(input)
                         # If input is invalid, display error message and
                         # prompt user to input again
                         else:
                             input = ""
-                            self.window.blit(setup_bg, (0, 0))
-                            Display.draw_text(self.window, "Invalid input!",
-                                              50, (255, 255, 255),
-                                              self.window.get_width()//2,
-                                              self.window.get_height()*1.6//4)
-                            time.sleep(1)
+                            self.invalid = True
+                            self.scheduler.call_later(
+                                Setup.MESSAGE_DELAY,
+                                lambda: setattr(self, "invalid", False))
                     # Check if the user pressed backspace
                     elif event.key == pygame.K_BACKSPACE:
                         input = input[:-1]
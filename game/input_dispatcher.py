@@ -0,0 +1,119 @@
+import pygame
+
+
+class InputDispatcher:
+    """
+    This class is used to route mouse clicks to the clickable object under
+    the cursor.
+    The objects are indexed in a grid of square cells covering the window,
+    so finding the object under the cursor only checks the few objects of
+    one cell, however many objects are on the window.
+    Clicks are taken from the events of the frame, so a click shorter than
+    a frame is not missed.
+    """
+    CELL_SIZE = 64  # Side of a grid cell in pixels
+
+    def __init__(self):
+        """
+        This method initializes the input dispatcher.
+
+        return: None
+        """
+        self.cells = {}     # Lists of (object, callback) keyed by cell
+        self.rects = {}     # Rect of each object registered
+
+    def register(self, widget, callback):
+        """
+        This method registers the object to be clicked.
+        The object must not move while it is registered, otherwise it has
+        to be registered again.
+
+        input:
+        - widget: the drawable object that can be clicked
+        - callback: the function called with the object when it is clicked
+
+        return: None
+        """
+        self.unregister(widget)
+        rect = widget.get_rect()
+        self.rects[widget] = rect
+        for cell in self._cells_of(rect):
+            self.cells.setdefault(cell, []).append((widget, callback))
+
+    def unregister(self, widget):
+        """
+        This method stops the object from receiving clicks.
+
+        input:
+        - widget: the drawable object registered
+
+        return: None
+        """
+        rect = self.rects.pop(widget, None)
+        if rect is None:
+            return
+        for cell in self._cells_of(rect):
+            entries = [entry for entry in self.cells[cell]
+                       if entry[0] is not widget]
+            if entries:
+                self.cells[cell] = entries
+            else:
+                del self.cells[cell]
+
+    def clear(self):
+        """
+        This method unregisters every object.
+
+        return: None
+        """
+        self.cells = {}
+        self.rects = {}
+
+    def hit(self, pos):
+        """
+        This method finds the object at the position.
+        If objects overlap, the one registered last is returned, as it is
+        usually the one drawn on top.
+
+        input:
+        - pos: the (x, y) position in the window
+
+        return: (object, callback), or None if there is no object
+        """
+        cell = (pos[0] // InputDispatcher.CELL_SIZE,
+                pos[1] // InputDispatcher.CELL_SIZE)
+        for entry in reversed(self.cells.get(cell, ())):
+            if self.rects[entry[0]].collidepoint(pos):
+                return entry
+        return None
+
+    def dispatch(self, events):
+        """
+        This method calls the callback of the object clicked for each left
+        mouse button press in the events.
+
+        input:
+        - events: the events of the frame
+
+        return: None
+        """
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                entry = self.hit(event.pos)
+                if entry is not None:
+                    widget, callback = entry
+                    callback(widget)
+
+    def _cells_of(self, rect):
+        """
+        This method returns the grid cells covered by the rect.
+
+        input:
+        - rect: the region covered
+
+        return: list of (column, row)
+        """
+        size = InputDispatcher.CELL_SIZE
+        return [(column, row)
+                for column in range(rect.left // size, (rect.right - 1) // size + 1)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)]
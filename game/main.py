@@ -1,7 +1,15 @@
-from gamepage.home import Home
-from gamepage.page_controller import PageController
+from startup_profile import StartupProfile
 
-import pygame
+import argparse
+
+# Time the imports for the startup profile, only the first page is
+# imported here, the other pages are imported on first use
+with StartupProfile.measure("import pygame"):
+    import pygame
+with StartupProfile.measure("import home page"):
+    from gamepage.home import Home
+    from gamepage.page_controller import PageController
+    from scheduler import FrameScheduler
 
 
 class Main:
@@ -14,19 +22,47 @@ class Main:
     WINDOW_WIDTH = 800
     WINDOW_HEIGHT = 600
     WINDOW_TITLE = "Fiery Dragons"
+    FPS = 60    # Maximum number of frames per second
 
-    def __init__(self):
+    def __init__(self, seed=None, size=24, animal_num=4,
+                 replay_dir="replays", replay=None):
         """
         This method initializes the main class.
 
+        input:
+        - seed: the seed the games are played with, a random seed for
+                each game if None
+        - size: the number of volcanoes of the games
+        - animal_num: the number of animal types of the games
+        - replay_dir: the folder the replay logs of the games are written 
+                      to, no log is written if None
+        - replay: the Replay of a log to play again instead of showing 
+                  the home page
+
         return: None
         """
-        pygame.init()
-        self.window = pygame.display.set_mode(
-            (self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
-        pygame.display.set_caption(self.WINDOW_TITLE)
+        self.seed = seed
+        self.size = size
+        self.animal_num = animal_num
+        self.replay_dir = replay_dir
+        # Only initialize the subsystems used by the game, audio and
+        # joystick are not
+        with StartupProfile.measure("init display and font"):
+            pygame.display.init()
+            pygame.font.init()
+        with StartupProfile.measure("open window"):
+            self.window = pygame.display.set_mode(
+                (self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
+            pygame.display.set_caption(self.WINDOW_TITLE)
+        self.scheduler = FrameScheduler(self.FPS)
         self.page_controller = PageController(self)
-        self.state = Home(self.page_controller, self.window)
+        if replay is not None:
+            from gamepage.game import Game
+            self.state = Game(self.page_controller, self.window,
+                              replay.player_num, replay.size,
+                              replay.animal_num, replay=replay)
+        else:
+            self.state = Home(self.page_controller, self.window)
 
     def set_state(self, state):
         """
@@ -50,5 +86,41 @@ class Main:
 
 
 if __name__ == "__main__":
-    main = Main()
+    parser = argparse.ArgumentParser(description=Main.WINDOW_TITLE)
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print the import and initialization times "
+                             "when the first frame is shown")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="play the game with this seed again, as shown "
+                             "in the window title")
+    parser.add_argument("--size", type=int, default=24,
+                        help="the number of volcanoes, large boards are "
+                             "drawn on a spiral")
+    parser.add_argument("--animals", type=int, default=4,
+                        help="the number of animal types, which must "
+                             "divide the number of volcanoes")
+    parser.add_argument("--replay-dir", default="replays",
+                        help="the folder the replay log of each game is "
+                             "written to")
+    parser.add_argument("--replay", default=None, metavar="LOG",
+                        help="play a game again from its replay log, Page "
+                             "Up and Page Down go to another turn")
+    args = parser.parse_args()
+    from engine.game_rng import GameRng
+    from engine.game_state import GameState
+    if args.seed is not None and not 0 <= args.seed < 1 << GameRng.SEED_BITS:
+        parser.error(f"the seed must be from 0 to "
+                     f"{(1 << GameRng.SEED_BITS) - 1}")
+    replay = None
+    try:
+        # Check the board before the pages are shown
+        GameState(2, args.size, args.animals)
+        if args.replay is not None:
+            from engine.replay_log import Replay
+            replay = Replay.load(args.replay)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    StartupProfile.enabled = args.startup_profile
+
+    main = Main(args.seed, args.size, args.animals, args.replay_dir, replay)
     main.run()
@@ -0,0 +1,54 @@
+from engine.replay_log import Replay
+
+import argparse
+import time
+
+
+if __name__ == "__main__":
+    # Run from the game folder, or with its path:
+    #     python Project/game/replay.py replays/20260101-120000-42.fdr
+    parser = argparse.ArgumentParser(
+        description="Play a game again from its replay log without "
+                    "display, checking every flip against the log.")
+    parser.add_argument("log", help="the replay log of the game")
+    parser.add_argument("--turn", type=int, default=None,
+                        help="show the positions at the start of this turn")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        replay = Replay.load(args.log)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    loaded = time.perf_counter() - start
+    per_flip = replay.byte_num / max(replay.flip_num, 1)
+    print(f"{replay.player_num} players, {replay.size} volcanoes, "
+          f"{replay.animal_num} animal types, --seed {replay.seed}")
+    print(f"{replay.flip_num} chit cards flipped in {replay.turn_num} turns, "
+          f"{replay.byte_num} bytes ({per_flip:.1f} per flip), read in "
+          f"{loaded * 1000:.1f} ms")
+    if replay.truncated:
+        print(f"The log is cut off, it is read up to the start of turn "
+              f"{replay.turn_num - 1}")
+
+    start = time.perf_counter()
+    try:
+        state = replay.play()
+    except ValueError as error:
+        parser.exit(1, f"{error}, the rules changed since it was played\n")
+    seconds = time.perf_counter() - start
+    outcome = ("nobody won yet" if state.winner is None
+               else f"player {state.winner + 1} won")
+    print(f"Played again in {seconds * 1000:.1f} ms "
+          f"({replay.flip_num / max(seconds, 1e-9):.0f} flips/s): {outcome}")
+
+    if args.turn is not None:
+        start = time.perf_counter()
+        try:
+            state = replay.state_at(args.turn)
+        except ValueError as error:
+            parser.error(str(error))
+        seconds = time.perf_counter() - start
+        print(f"Turn {args.turn}: player {state.current_player + 1} to play, "
+              f"positions {list(state.positions)}, found in "
+              f"{seconds * 1000:.2f} ms")
@@ -0,0 +1,111 @@
+from assets import Assets
+from board.gameboard import GameBoard
+from dragon import Dragon
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from engine.transition_table import TransitionTable
+
+import argparse
+import os
+import pygame
+import time
+
+
+def time_call(function):
+    """
+    This function calls the function and times it.
+
+    input:
+    - function: the function to call, without arguments
+
+    return: the result of the function, float of the seconds taken
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def measure(window, player_num, size, animal_num, flips, seed):
+    """
+    This function times building a board of the size, resolving moves on
+    it and drawing it.
+
+    input:
+    - window: the pygame window
+    - player_num: the number of players
+    - size: the number of volcanoes
+    - animal_num: the number of animal types
+    - flips: the number of chit cards flipped to time the moves
+    - seed: the seed of the board
+
+    return: dict of the seconds taken by each step
+    """
+    # Nothing is reused from the previous sizes
+    GameState.layouts.clear()
+    TransitionTable.tables.clear()
+    rng = GameRng(seed)
+    state, build = time_call(lambda: GameState(
+        player_num, size, animal_num, rng=rng, journal=False))
+
+    flip_rng = rng.spawn("flips")
+    played = 0
+    start = time.perf_counter()
+    while played < flips:
+        if state.winner is not None:
+            state = GameState(player_num, size, animal_num,
+                              rng=rng.spawn("game", played), journal=False)
+        state.apply_flip(flip_rng.choice(state.hidden_cards()))
+        played += 1
+    move = (time.perf_counter() - start) / flips
+
+    ratio = GameBoard.get_tile_ratio(window, size, player_num)
+    players = []
+    for seat in range(player_num):
+        path, tint = Assets.tinted(Assets.DRAGON_IMAGES, seat)
+        players.append(Dragon(seat, path, Assets.DRAGON_SCALE * ratio, tint))
+    gameboard, layout = time_call(lambda: GameBoard(
+        window, players, size, animal_num, state.volcano_animals()))
+    _, render = time_call(gameboard._render_layer)
+    return {"build": build, "move": move, "layout": layout,
+            "render": render}
+
+
+if __name__ == "__main__":
+    # Run from the folder of the Project folder, as the game:
+    #     python Project/game/scaling_benchmark.py --players 16 --animals 16
+    parser = argparse.ArgumentParser(
+        description="Time building, playing on and drawing boards of "
+                    "growing size, to check each step grows at most "
+                    "linearly with the board.")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[96, 960, 9600, 96000],
+                        help="the numbers of volcanoes")
+    parser.add_argument("--players", type=int, default=16,
+                        help="the number of players")
+    parser.add_argument("--animals", type=int, default=16,
+                        help="the number of animal types on the volcanoes")
+    parser.add_argument("--flips", type=int, default=20000,
+                        help="the number of chit cards flipped on each board")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="the seed of the boards")
+    args = parser.parse_args()
+
+    # The gameboard is rendered without showing a window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    window = pygame.display.set_mode((800, 600))
+    print(f"{args.players} players, {args.animals} animal types")
+    print(f"{'volcanoes':>9} {'build ms':>9} {'us/tile':>8} {'move us':>8} "
+          f"{'layout ms':>10} {'us/tile':>8} {'render ms':>10} {'us/tile':>8}")
+    for size in args.sizes:
+        times = measure(window, args.players, size, args.animals,
+                        args.flips, args.seed)
+        tiles = size + max(GameState.MIN_CAVE, args.players)
+        print(f"{size:>9} {times['build'] * 1e3:>9.1f} "
+              f"{times['build'] / tiles * 1e6:>8.2f} "
+              f"{times['move'] * 1e6:>8.2f} "
+              f"{times['layout'] * 1e3:>10.1f} "
+              f"{times['layout'] / tiles * 1e6:>8.2f} "
+              f"{times['render'] * 1e3:>10.1f} "
+              f"{times['render'] / tiles * 1e6:>8.2f}")
+    pygame.quit()
@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import pygame
+import time
+
+
+class FrameScheduler:
+    """
+    This class is used to pace the loop of every page.
+    It caps the number of frames per second, runs the timers and tweens
+    that are due, and returns the events of the frame.
+    When nothing is animating, the page can let the scheduler block until
+    an event arrives or a timer is due instead of spinning.
+    """
+    # Longest wait for an event, so that Python can still handle signals
+    # such as Ctrl+C while the page is idle
+    MAX_WAIT = 250  # In milliseconds
+
+    def __init__(self, fps):
+        """
+        This method initializes the frame scheduler.
+
+        input:
+        - fps: the maximum number of frames per second
+
+        return: None
+        """
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.timers = []    # Heap of (due time, order, callback)
+        self.tweens = []    # List of [start time, duration, update, done]
+        self.order = itertools.count()  # Run timers due together in order
+
+    @staticmethod
+    def now():
+        """
+        This method returns the current time in milliseconds.
+        pygame.time.get_ticks is not used as it only works once every 
+        pygame module is initialized.
+
+        return: int
+        """
+        return int(time.perf_counter() * 1000)
+
+    def call_later(self, delay, callback):
+        """
+        This method schedules the callback to be called after the delay.
+
+        input:
+        - delay: the delay in milliseconds
+        - callback: the function to call, without argument
+
+        return: None
+        """
+        heapq.heappush(self.timers, (FrameScheduler.now() + delay,
+                                     next(self.order), callback))
+
+    def tween(self, duration, update, done=None):
+        """
+        This method calls update on every frame during the duration with
+        the progress of the tween, from 0 to 1.
+        The last call always has a progress of 1.
+
+        input:
+        - duration: the duration of the tween in milliseconds
+        - update: the function to call with the progress
+        - done: the function to call, without argument, when it finishes
+
+        return: None
+        """
+        self.tweens.append([FrameScheduler.now(), duration, update, done])
+
+    def cancel_all(self):
+        """
+        This method removes every scheduled timer and tween.
+        Usually called when leaving a page.
+
+        return: None
+        """
+        self.timers = []
+        self.tweens = []
+
+    def is_busy(self):
+        """
+        This method checks if there is any timer or tween scheduled.
+
+        return: bool
+        """
+        return bool(self.timers or self.tweens)
+
+    def tick(self, idle=False):
+        """
+        This method waits for the next frame and returns its events.
+        In idle mode, if no tween is running, it blocks until an event
+        arrives or the next timer is due, so that the game does not use
+        the processor while nothing happens on the screen.
+
+        input:
+        - idle: whether the page has nothing to animate
+
+        return: list
+        """
+        if idle and not self.tweens:
+            timeout = FrameScheduler.MAX_WAIT
+            if self.timers:
+                timeout = min(self.timers[0][0] - FrameScheduler.now(),
+                              timeout)
+            event = pygame.event.wait(max(timeout, 1))
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+            # Keep the clock in sync so the next capped frame is not late
+            self.clock.tick()
+        else:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+
+        self._run_due()
+        return events
+
+    def _run_due(self):
+        """
+        This method calls the timers that are due and updates the tweens.
+
+        return: None
+        """
+        now = FrameScheduler.now()
+        while self.timers and self.timers[0][0] <= now:
+            _, _, callback = heapq.heappop(self.timers)
+            callback()
+
+        tweens = self.tweens
+        # Tweens added by the callbacks are appended to the new list
+        self.tweens = []
+        for tween in tweens:
+            start, duration, update, done = tween
+            progress = min((now - start) / duration, 1) if duration > 0 else 1
+            update(progress)
+            if progress < 1:
+                self.tweens.append(tween)
+            elif done is not None:
+                done()
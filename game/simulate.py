@@ -0,0 +1,93 @@
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from engine.policy import POLICIES
+from engine.simulator import Simulator
+
+import argparse
+import time
+
+
+if __name__ == "__main__":
+    # Run from the game folder, or with its path:
+    #     python Project/game/simulate.py --games 10000 --players 4
+    parser = argparse.ArgumentParser(
+        description="Play complete games without display and report the "
+                    "win rate by seat, the game length and the penalties.")
+    parser.add_argument("--games", type=int, default=10000,
+                        help="the number of games to play")
+    parser.add_argument("--players", type=int, default=4,
+                        help="the number of players")
+    parser.add_argument("--size", type=int, default=24,
+                        help="the number of volcanoes")
+    parser.add_argument("--animals", type=int, default=4,
+                        help="the number of animal types on the volcanoes")
+    parser.add_argument("--policy", choices=sorted(POLICIES),
+                        default="random", help="how players pick chit cards")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="the number of processes, one per core if "
+                             "not given")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="the seed to repeat a simulation")
+    parser.add_argument("--batch", type=int, default=None,
+                        help="play this many games at once in lockstep "
+                             "with NumPy, in one process with the random "
+                             "policy")
+    parser.add_argument("--replay", type=int, default=None, metavar="SEED",
+                        help="play again the game with the seed, such as "
+                             "the longest game reported")
+    parser.add_argument("--exact", action="store_true",
+                        help="compute the race length of each seat on the "
+                             "board of --seed with the Markov chain solver "
+                             "instead of playing games")
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        state, (turns, flips, penalties, _) = Simulator.play_game(
+            args.players, args.size, args.animals, args.policy, args.replay)
+        winner = ("nobody" if state.winner is None
+                  else f"player {state.winner + 1}")
+        print(f"Game {args.replay}: {winner} won after {turns} turns, "
+              f"{flips} chit cards flipped, {penalties} dragon pirates")
+        parser.exit()
+
+    # The seed is printed so the simulation can be repeated
+    seed = GameRng(args.seed).seed_value
+
+    if args.exact:
+        # NumPy and SciPy are only needed for the solver
+        from engine.race_solver import RaceSolver
+        start = time.perf_counter()
+        solver = RaceSolver(GameState(args.players, args.size, args.animals,
+                                      rng=GameRng(seed)))
+        wins = solver.win_probabilities()
+        print("Turns to reach the cave, if the dragons never meet")
+        for seat in range(args.players):
+            finish = solver.finish_distribution(seat, 2000).cumsum()
+            print(f"  player {seat + 1}: mean "
+                  f"{solver.expected_turns(seat):.1f}, median "
+                  f"{finish.searchsorted(0.5) + 1}, 90% "
+                  f"{finish.searchsorted(0.9) + 1}, wins {wins[seat]:.2%}")
+        print(f"Solved in {time.perf_counter() - start:.2f} s, --seed {seed}")
+        parser.exit()
+    start = time.perf_counter()
+    if args.batch:
+        # NumPy is only needed for the lockstep simulator
+        from engine.batch_simulator import BatchSimulator
+        if args.policy != "random":
+            parser.error("--batch only plays the random policy")
+        try:
+            batch = BatchSimulator(args.players, args.size, args.animals,
+                                   args.batch, seed)
+        except ValueError as error:
+            parser.error(str(error))
+        stats = batch.run(args.games)
+        runner = f"batches of {args.batch}"
+    else:
+        simulator = Simulator(args.players, args.size, args.animals,
+                              args.policy, args.workers)
+        stats = simulator.run(args.games, seed)
+        runner = f"{simulator.workers} processes"
+    seconds = time.perf_counter() - start
+    stats.report()
+    print(f"{stats.games} games in {seconds:.2f} s with {runner} "
+          f"({stats.games / seconds:.0f} games/s), --seed {seed}")
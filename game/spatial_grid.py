@@ -0,0 +1,100 @@
+import pygame
+
+
+class SpatialGrid:
+    """
+    This class is used to find the rectangles overlapping a region.
+    The rectangles are indexed in a grid of square cells, so a query only
+    checks the rectangles of the cells the region covers, however many
+    rectangles there are.
+    """
+
+    def __init__(self, cell_size):
+        """
+        This method initializes an empty grid.
+
+        input:
+        - cell_size: the side of a grid cell in pixels
+
+        return: None
+        """
+        self.cell_size = cell_size
+        self.cells = {}     # Lists of item indexes keyed by cell
+        self.rects = []     # Rect of each item, by index
+
+    def __len__(self):
+        """
+        This method returns the number of items in the grid.
+
+        return: int
+        """
+        return len(self.rects)
+
+    def insert(self, rect):
+        """
+        This method adds a rectangle to the grid.
+
+        input:
+        - rect: the region covered by the item
+
+        return: int, the index of the item
+        """
+        index = len(self.rects)
+        rect = pygame.Rect(rect)
+        self.rects.append(rect)
+        for cell in self._cells_of(rect):
+            self.cells.setdefault(cell, []).append(index)
+        return index
+
+    def query(self, rect):
+        """
+        This method finds the items overlapping the region.
+
+        input:
+        - rect: the region
+
+        return: list of item indexes, in the order they were added
+        """
+        rect = pygame.Rect(rect)
+        columns, rows = self._span(rect)
+        if len(columns) * len(rows) > len(self.cells):
+            # The region covers most of the grid, only visit the cells
+            # holding items
+            lists = [items for (column, row), items in self.cells.items()
+                     if column in columns and row in rows]
+        else:
+            lists = [self.cells[cell] for cell in
+                     ((column, row) for column in columns for row in rows)
+                     if cell in self.cells]
+        found = set()
+        for items in lists:
+            found.update(items)
+        rects = self.rects
+        return sorted(index for index in found
+                      if rects[index].colliderect(rect))
+
+    def _span(self, rect):
+        """
+        This method returns the columns and rows of the cells covered by
+        the rect.
+
+        input:
+        - rect: the region covered
+
+        return: range of columns, range of rows
+        """
+        size = self.cell_size
+        return (range(int(rect.left // size), int((rect.right - 1) // size) + 1),
+                range(int(rect.top // size), int((rect.bottom - 1) // size) + 1))
+
+    def _cells_of(self, rect):
+        """
+        This method returns the grid cells covered by the rect.
+
+        input:
+        - rect: the region covered
+
+        return: list of (column, row)
+        """
+        columns, rows = self._span(rect)
+        return [(column, row) for column in columns for row in rows]
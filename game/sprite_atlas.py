@@ -0,0 +1,134 @@
+from assets import Assets
+
+import json
+import os
+import pygame
+
+
+class SpriteAtlas:
+    """
+    This class is used to get pre-scaled images from the sprite atlases
+    baked by build_assets.py.
+    An atlas is a single image holding many small sprites, so the game
+    loads a few small files instead of decoding and scaling every full
+    size image at runtime.
+    A sprite is only used if its source image has not changed since the
+    atlas was built, otherwise the caller loads the source image itself.
+    """
+    MANIFEST = Assets.ATLAS_DIR + "/manifest.json"
+    VERSION = 1
+
+    manifest = None     # Loaded on first use, empty if there is no atlas
+    sheets = {}         # Loaded atlas images keyed by file name
+    fresh = {}          # Whether a source image matches the atlas
+
+    @staticmethod
+    def sprite_key(path, scale=None, size=None):
+        """
+        This method returns the key of a sprite in the manifest.
+
+        input:
+        - path: the path of the source image
+        - scale: the scale of the sprite
+        - size: the (width, height) of the sprite if it is not scaled by
+                a factor
+
+        return: str
+        """
+        if size is not None:
+            return f"{path}@{size[0]}x{size[1]}"
+        return f"{path}@{scale}"
+
+    @staticmethod
+    def source_stamp(path):
+        """
+        This method returns the size and modification time of the source
+        image, used to detect a change without reading the file.
+
+        input:
+        - path: the path of the source image
+
+        return: list
+        """
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def get(path, scale=None, size=None):
+        """
+        This method returns the sprite of the image at the scale or size.
+
+        input:
+        - path: the path of the source image
+        - scale: the scale of the sprite
+        - size: the (width, height) of the sprite if it is not scaled by
+                a factor
+
+        return: Surface, or None if the atlases do not have the sprite
+        """
+        manifest = SpriteAtlas._load_manifest()
+        sprite = manifest.get("sprites", {}).get(
+            SpriteAtlas.sprite_key(path, scale, size))
+        if sprite is None or not SpriteAtlas._is_fresh(path):
+            return None
+
+        sheet = SpriteAtlas.sheets.get(sprite["sheet"])
+        if sheet is None:
+            sheet = pygame.image.load(
+                os.path.join(Assets.ATLAS_DIR, sprite["sheet"])).convert_alpha()
+            SpriteAtlas.sheets[sprite["sheet"]] = sheet
+        return sheet.subsurface(pygame.Rect(sprite["rect"]))
+
+    @staticmethod
+    def reset():
+        """
+        This method forgets the loaded manifest and atlases, so they are
+        loaded again on next use.
+        Usually called after the atlases are rebuilt.
+
+        return: None
+        """
+        SpriteAtlas.manifest = None
+        SpriteAtlas.sheets = {}
+        SpriteAtlas.fresh = {}
+
+    @staticmethod
+    def _load_manifest():
+        """
+        This method loads the manifest of the atlases once.
+        A missing or outdated manifest is treated as an empty one.
+
+        return: dict
+        """
+        if SpriteAtlas.manifest is None:
+            try:
+                with open(SpriteAtlas.MANIFEST) as file:
+                    manifest = json.load(file)
+            except (OSError, ValueError):
+                manifest = {}
+            if manifest.get("version") != SpriteAtlas.VERSION:
+                manifest = {}
+            SpriteAtlas.manifest = manifest
+        return SpriteAtlas.manifest
+
+    @staticmethod
+    def _is_fresh(path):
+        """
+        This method checks if the source image is unchanged since the
+        atlases were built.
+
+        input:
+        - path: the path of the source image
+
+        return: bool
+        """
+        fresh = SpriteAtlas.fresh.get(path)
+        if fresh is None:
+            source = SpriteAtlas.manifest.get("sources", {}).get(path)
+            try:
+                fresh = (source is not None and
+                         source["stamp"] == SpriteAtlas.source_stamp(path))
+            except OSError:
+                fresh = False
+            SpriteAtlas.fresh[path] = fresh
+        return fresh
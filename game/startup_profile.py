@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+
+import sys
+import time
+
+
+class StartupProfile:
+    """
+    This class is used to measure how long the game takes to start.
+    The steps of the startup, such as imports and initialization, are
+    timed and reported when the first frame is shown, if the game is
+    started with --startup-profile.
+    """
+    start = time.perf_counter()     # Time this module was imported
+    enabled = False
+    reported = False
+    records = []    # List of (step, seconds)
+
+    @staticmethod
+    @contextmanager
+    def measure(step):
+        """
+        This method times the code run inside the with statement.
+
+        input:
+        - step: the name of the step
+
+        return: None
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            StartupProfile.records.append((step, time.perf_counter() - start))
+
+    @staticmethod
+    def first_frame():
+        """
+        This method reports the startup times once the first frame is
+        shown. Only the first call reports.
+
+        return: None
+        """
+        if not StartupProfile.enabled or StartupProfile.reported:
+            return
+        StartupProfile.reported = True
+        StartupProfile.report(time.perf_counter() - StartupProfile.start)
+
+    @staticmethod
+    def report(first_frame, file=sys.stdout):
+        """
+        This method prints the time of each step and the time to the first
+        frame.
+
+        input:
+        - first_frame: the seconds from the start to the first frame
+        - file: the file to print to
+
+        return: None
+        """
+        print("Startup profile", file=file)
+        for step, seconds in StartupProfile.records:
+            print(f"  {step:<28}{seconds * 1000:8.1f} ms", file=file)
+        print(f"  {'time to first frame':<28}{first_frame * 1000:8.1f} ms",
+              file=file)
+        # The game keeps running, so do not wait for the buffer to fill
+        file.flush()
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+
+import threading
+
+
+class SurfaceCache:
+    """
+    This class is used to share loaded surfaces across the game.
+    Surfaces are stored under a key and handed out to every caller asking
+    for the same key, so an asset is decoded and scaled only once.
+    The least recently used surfaces are evicted once the total size of
+    the cached surfaces exceeds the byte budget.
+    """
+
+    def __init__(self, byte_budget):
+        """
+        This method initializes the surface cache.
+
+        input:
+        - byte_budget: the maximum number of bytes of pixel data kept in
+                       the cache
+
+        return: None
+        """
+        self.byte_budget = byte_budget
+        self.byte_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.surfaces = OrderedDict()
+        # Assets may be loaded from a worker thread while a page is drawn
+        self.lock = threading.RLock()
+
+    def get(self, key, loader):
+        """
+        This method returns the surface stored under the key.
+        If the key is not cached, the loader is called to create the
+        surface and the result is cached.
+        The loader runs without holding the lock, so a slow load in one 
+        thread does not block other threads using the cache.
+
+        input:
+        - key: the hashable key of the surface
+        - loader: a function without argument that returns the surface
+
+        return: The cached surface
+        """
+        with self.lock:
+            surface = self.surfaces.get(key)
+            if surface is not None:
+                self.surfaces.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+
+        surface = loader()
+        with self.lock:
+            # Another thread may have loaded the same surface meanwhile
+            if key in self.surfaces:
+                return self.surfaces[key]
+            self.put(key, surface)
+            return surface
+
+    def put(self, key, surface):
+        """
+        This method stores the surface under the key and evicts the least
+        recently used surfaces if the byte budget is exceeded.
+        The surface just stored is never evicted, even if it alone is
+        larger than the budget.
+
+        input:
+        - key: the hashable key of the surface
+        - surface: the surface to store
+
+        return: None
+        """
+        with self.lock:
+            if key in self.surfaces:
+                self.byte_size -= SurfaceCache.surface_bytes(
+                    self.surfaces.pop(key))
+            self.surfaces[key] = surface
+            self.byte_size += SurfaceCache.surface_bytes(surface)
+            while self.byte_size > self.byte_budget and len(self.surfaces) > 1:
+                _, evicted = self.surfaces.popitem(last=False)
+                self.byte_size -= SurfaceCache.surface_bytes(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        This method removes every surface from the cache.
+        The hit and miss counters are kept.
+
+        return: None
+        """
+        with self.lock:
+            self.surfaces.clear()
+            self.byte_size = 0
+
+    def stats(self):
+        """
+        This method returns the counters of the cache.
+
+        return: dict
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions,
+                    "entries": len(self.surfaces),
+                    "bytes": self.byte_size}
+
+    def __contains__(self, key):
+        return key in self.surfaces
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    @staticmethod
+    def surface_bytes(surface):
+        """
+        This method returns the number of bytes of pixel data of the 
+        surface.
+        The row length of the surface is used rather than its pitch, as a 
+        subsurface shares the pitch of the larger surface it is part of.
+
+        input:
+        - surface: the surface to measure
+
+        return: int
+        """
+        return (surface.get_width() * surface.get_height() *
+                surface.get_bytesize())
@@ -4,10 +4,47 @@ from gamepage.game import Game
 from gamepage.page_controller import PageController
 from action.forward_action import ForwardAction
 from action.backward_action import BackwardAction
+from asset_loader import AssetLoader
+from assets import Assets
+from build_assets import AtlasBuilder
+from display import Display
+from camera import Camera
+from dirty_tracker import DirtyTracker
+from input_dispatcher import InputDispatcher
+from scheduler import FrameScheduler
+from sprite_atlas import SpriteAtlas
+from engine.expectimax_policy import ExpectimaxPolicy
+from engine.game_rng import GameRng
+from engine.game_state import GameState
+from engine.mcts_policy import MctsPolicy
+from engine.policy import RandomPolicy
+from engine.replay_log import Replay, ReplayLog, ReplayWriter
+from engine.simulator import Simulator
+from engine.tournament import EloRatings, Tournament
+from engine.transition_table import TransitionTable
+from engine.transposition_table import TranspositionTable
+from gamecard.animal_type import AnimalType
 
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
+from unittest import mock
 import pygame
 
+try:
+    from engine.batch_simulator import BatchSimulator
+except ImportError:     # NumPy is optional
+    BatchSimulator = None
+try:
+    from engine.race_solver import RaceSolver
+except ImportError:     # NumPy and SciPy are optional
+    RaceSolver = None
+
 class TestGame(unittest.TestCase):
     # Test the initial state of the game
     def test_game(self):
@@ -193,5 +230,639 @@ class TestGame(unittest.TestCase):
         # Check player's display x and y coordinate, noted that player's x coordinate is increased by 10 so that it does not block the animal image
         self.assertEqual((player4.x-10, player4.y), game.gameboard.get_board()[21].get_pos())
 
+#---------------------test for display---------------------#
+    # Test whether every image asset is decoded only once when creating a game
+    def test_image_cache(self):
+        window = pygame.display.set_mode((800, 800))
+        page_controller = PageController(Main())
+        # The home page preloads the images on a thread, which must be
+        # done before the cache is checked
+        AssetLoader.wait()
+        Display.image_cache.clear()
+        misses = Display.image_cache.misses
+        game = Game(page_controller, window, 4)
+        # Every cached image is a miss exactly once, the rest are hits
+        self.assertEqual(Display.image_cache.misses - misses, len(Display.image_cache))
+        # Chit cards share the same back image
+        self.assertIs(game.chit_cards[0].back_image, game.chit_cards[1].back_image)
+        self.assertIs(game.chit_cards[0].image, game.chit_cards[0].back_image)
+
+    # Test the sprites baked in the atlases are the same pixels as the
+    # images scaled at runtime
+    def test_sprite_atlas(self):
+        window = pygame.display.set_mode((800, 600))
+        AssetLoader.wait()
+        with tempfile.TemporaryDirectory() as folder, \
+                mock.patch.object(Assets, "ATLAS_DIR", folder), \
+                mock.patch.object(SpriteAtlas, "MANIFEST",
+                                  os.path.join(folder, "manifest.json")):
+            # Without atlases the images are scaled at runtime
+            SpriteAtlas.reset()
+            Display.image_cache.clear()
+            images = {(path, scale): Display.load_img(path, scale)
+                      for path, scale in Assets.scaled_images()}
+            backgrounds = {path: Display.load_bg(window, path)
+                           for path in Assets.BACKGROUNDS}
+
+            self.assertTrue(AtlasBuilder(window.get_size()).build(force=True))
+            SpriteAtlas.reset()
+            for (path, scale), image in images.items():
+                sprite = SpriteAtlas.get(path, scale=scale)
+                self.assertEqual(pygame.image.tobytes(sprite, "RGBA"),
+                                 pygame.image.tobytes(image, "RGBA"), path)
+            for path, image in backgrounds.items():
+                sprite = SpriteAtlas.get(path, size=window.get_size())
+                self.assertEqual(pygame.image.tobytes(sprite, "RGBA"),
+                                 pygame.image.tobytes(image, "RGBA"), path)
+            SpriteAtlas.reset()
+            Display.image_cache.clear()
+
+    # Test drawing a text again reuses its font and rendered surface, and
+    # another size or color is rendered on its own
+    def test_text_cache(self):
+        window = pygame.display.set_mode((800, 600))
+        pygame.font.init()
+        Display.fonts.clear()
+        Display.text_cache.clear()
+        hits = Display.text_cache.hits
+        misses = Display.text_cache.misses
+        with mock.patch.object(pygame.font, "SysFont",
+                               wraps=pygame.font.SysFont) as sys_font:
+            for _ in range(3):
+                Display.draw_text(window, "Player 1's turn", 25, (0, 0, 0),
+                                  400, 300, update_display=False)
+            self.assertEqual(sys_font.call_count, 1)
+            self.assertEqual(Display.text_cache.misses - misses, 1)
+            self.assertEqual(Display.text_cache.hits - hits, 2)
+            surface = Display.render_text("Player 1's turn", 25, [0, 0, 0])
+            self.assertIs(Display.render_text("Player 1's turn", 25,
+                                              (0, 0, 0)), surface)
+
+            larger = Display.render_text("Player 1's turn", 30, (0, 0, 0))
+            red = Display.render_text("Player 1's turn", 25, (255, 0, 0))
+            self.assertIsNot(larger, surface)
+            self.assertIsNot(red, surface)
+            self.assertGreater(larger.get_height(), surface.get_height())
+            self.assertEqual(sys_font.call_count, 2)
+        self.assertEqual(len(Display.text_cache), 3)
+        self.assertEqual(sorted(Display.fonts),
+                         [(Display.FONT_FAMILY, 25), (Display.FONT_FAMILY, 30)])
+
+    # Test the timers run in order once due, the tweens end on a progress
+    # of 1 and the idle wait ends by the next timer, with a fake clock
+    def test_frame_scheduler(self):
+        pygame.display.set_mode((800, 600))
+        clock = [1000]
+        calls = []
+        scheduler = FrameScheduler(1000)
+        with mock.patch.object(FrameScheduler, "now", lambda: clock[0]):
+            scheduler.call_later(50, lambda: calls.append("b"))
+            scheduler.call_later(20, lambda: calls.append("a"))
+            scheduler.call_later(50, lambda: calls.append("c"))
+            scheduler.tween(100, calls.append, lambda: calls.append("done"))
+            scheduler.tick()
+            self.assertEqual(calls, [0])
+            clock[0] = 1050
+            scheduler.tick()
+            self.assertEqual(calls, [0, "a", "b", "c", 0.5])
+            clock[0] = 1200
+            scheduler.tick()
+            self.assertEqual(calls[5:], [1, "done"])
+            self.assertFalse(scheduler.is_busy())
+
+            with mock.patch.object(
+                    pygame.event, "wait",
+                    return_value=pygame.event.Event(pygame.NOEVENT)) as wait:
+                scheduler.tick(idle=True)
+                wait.assert_called_with(FrameScheduler.MAX_WAIT)
+                scheduler.call_later(30, lambda: calls.append("d"))
+                scheduler.tick(idle=True)
+                wait.assert_called_with(30)
+                clock[0] = 1230
+                scheduler.tick(idle=True)
+                self.assertEqual(calls[-1], "d")
+                # A tween running is not waited for
+                scheduler.tween(100, calls.append)
+                scheduler.tick(idle=True)
+                self.assertEqual(wait.call_count, 3)
+            scheduler.cancel_all()
+            self.assertFalse(scheduler.is_busy())
+
+    # Test the regions changed are merged only when they overlap, and the
+    # whole window is updated when it is marked
+    def test_dirty_tracker(self):
+        tracker = DirtyTracker()
+        self.assertIsNone(tracker.flush())  # Nothing is drawn at the start
+        tracker.mark((0, 0, 10, 10))
+        tracker.mark((5, 5, 10, 10))
+        tracker.mark((15, 0, 5, 5))     # Next to the first two
+        tracker.mark((40, 0, 10, 10))
+        tracker.mark((30, 40, 10, 10))
+        tracker.mark((35, 5, 10, 40))   # Overlaps the fourth and fifth
+        self.assertEqual(tracker.flush(), [pygame.Rect(0, 0, 15, 15),
+                                           pygame.Rect(15, 0, 5, 5),
+                                           pygame.Rect(30, 0, 20, 50)])
+        self.assertEqual(tracker.flush(), [])
+
+        tracker.mark((0, 0, 10, 10))
+        tracker.mark_all()
+        tracker.mark((5, 5, 10, 10))
+        self.assertIsNone(tracker.flush())
+        self.assertEqual(tracker.flush(), [])
+        # Too many regions are cheaper to update at once
+        for x in range(DirtyTracker.MAX_RECTS + 1):
+            tracker.mark((x * 20, 0, 10, 10))
+        self.assertIsNone(tracker.flush())
+
+    # Test a click goes to the object under it, on the edges of the grid
+    # cells, and to the one registered last where objects overlap
+    def test_input_dispatcher(self):
+        class Button:
+            def __init__(self, rect):
+                self.rect = pygame.Rect(rect)
+
+            def get_rect(self):
+                return self.rect
+
+        clicked = []
+        dispatcher = InputDispatcher()
+        size = InputDispatcher.CELL_SIZE
+        below = Button((size - 4, size - 4, 8, 8))  # Across 4 cells
+        above = Button((size, size, 20, 20))
+        dispatcher.register(below, clicked.append)
+        dispatcher.register(above, clicked.append)
+        self.assertIs(dispatcher.hit((size - 4, size - 4))[0], below)
+        self.assertIs(dispatcher.hit((size - 1, size + 3))[0], below)
+        self.assertIs(dispatcher.hit((size, size))[0], above)
+        self.assertIs(dispatcher.hit((size + 19, size + 19))[0], above)
+        self.assertIsNone(dispatcher.hit((size - 5, size)))
+        self.assertIsNone(dispatcher.hit((size + 20, size)))
+
+        # Only left button presses are clicks
+        events = [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1,
+                                     pos=(size + 2, size + 2)),
+                  pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=3,
+                                     pos=(size - 4, size - 4)),
+                  pygame.event.Event(pygame.MOUSEBUTTONUP, button=1,
+                                     pos=(size - 4, size - 4)),
+                  pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1,
+                                     pos=(size - 4, size - 4))]
+        dispatcher.dispatch(events)
+        self.assertEqual(clicked, [above, below])
+
+        dispatcher.unregister(above)
+        self.assertIs(dispatcher.hit((size + 2, size + 2))[0], below)
+        self.assertIsNone(dispatcher.hit((size + 10, size + 10)))
+        # An object moved is registered again at its new place
+        below.rect.topleft = (0, 0)
+        dispatcher.register(below, clicked.append)
+        self.assertIsNone(dispatcher.hit((size + 2, size + 2)))
+        self.assertIs(dispatcher.hit((7, 7))[0], below)
+
+#---------------------test for game state---------------------#
+    # Move the player of the seat to the board position in the game state
+    def _place(self, state, seat, pos):
+        state.occupants[state.positions[seat]] = GameState.NO_SEAT
+        state.positions[seat] = pos
+        state.occupants[pos] = seat
+
+    # Test the position of player after a matching chit card is flipped
+    def test_state_forward(self):
+        state = GameState(4, deck=[(AnimalType.BAT, 2), (AnimalType.SPIDER, 1)])
+        self._place(state, 0, 3)
+        state.animals[3] = AnimalType.BAT.value
+        result = state.apply_flip(0)
+        self.assertEqual(state.positions[0], 5)
+        self.assertEqual(result.moves, [(0, 3, 5)])
+        self.assertEqual(result.end_turn, False)
+        self.assertEqual(state.current_player, 0)
+
+    # Test the turn ends when the animal type does not match
+    def test_state_mismatch(self):
+        state = GameState(4, deck=[(AnimalType.BAT, 2), (AnimalType.SPIDER, 1)])
+        self._place(state, 0, 3)
+        state.animals[3] = AnimalType.SPIDER.value
+        result = state.apply_flip(0)
+        self.assertEqual(state.positions[0], 3)
+        self.assertEqual(result.end_turn, True)
+        self.assertEqual(state.current_player, 1)
+        self.assertEqual(state.hidden_cards(), [0, 1])
+
+    # Test the dragon on the destination moves back to the previous volcano
+    def test_state_displacement(self):
+        state = GameState(4, deck=[(AnimalType.BAT, 2), (AnimalType.SPIDER, 1)])
+        self._place(state, 0, 3)
+        self._place(state, 1, 5)
+        state.animals[3] = AnimalType.BAT.value
+        state.apply_flip(0)
+        self.assertEqual(list(state.positions), [5, 4, 14, 21])
+        self.assertEqual(state.occupants[5], 0)
+        self.assertEqual(state.occupants[4], 1)
+
+    # Test the displaced dragon skips the previous volcano if a third
+    # dragon is on it, instead of sharing it
+    def test_state_pile_up(self):
+        state = GameState(4, deck=[(AnimalType.BAT, 2), (AnimalType.SPIDER, 1)])
+        self._place(state, 0, 3)
+        self._place(state, 1, 5)
+        self._place(state, 2, 4)
+        state.animals[3] = AnimalType.BAT.value
+        result = state.apply_flip(0)
+        self.assertEqual(result.moves, [(0, 3, 5), (1, 5, 3)])
+        self.assertEqual(list(state.positions), [5, 3, 4, 21])
+        self.assertEqual([state.occupants[tile] for tile in (3, 4, 5)],
+                         [1, 2, 0])
+
+    # Test whether the game stops if a player lands on his cave
+    def test_state_win(self):
+        state = GameState(4, deck=[(AnimalType.BAT, 2), (AnimalType.SPIDER, 1)])
+        state.current_player = 3
+        self._place(state, 3, 19)
+        state.animals[19] = AnimalType.BAT.value
+        result = state.apply_flip(0)
+        self.assertEqual(result.end_game, True)
+        self.assertEqual(state.winner, 3)
+        self.assertEqual(state.positions[3], 21)
+
+    # Test the moves looked up for the second player of a 2 player game,
+    # whose cave is the opposite one
+    def test_transition_table(self):
+        table = GameState(2).table
+        self.assertIs(GameState(2).table, table)
+        # Landing exactly on his cave wins
+        self.assertEqual(table.lookup(1, 12, 2), (14, TransitionTable.END_GAME))
+        # Passing his cave, the player stays
+        self.assertEqual(table.lookup(1, 13, 2),
+                         (TransitionTable.NO_MOVE, TransitionTable.END_TURN))
+        # The cave of the first seat and the empty caves are skipped
+        self.assertEqual(table.lookup(1, 6, 1), (8, 0))
+        self.assertEqual(table.lookup(1, 27, 1), (1, 0))
+        # A dragon pirate stops the player in his cave
+        self.assertEqual(table.lookup(1, 16, -2), (14, 0))
+        self.assertEqual(table.lookup(1, 14, -1), (TransitionTable.NO_MOVE, 0))
+
+    # Test the displaced dragon jumps over the occupied volcano and the cave
+    def test_occupancy_index(self):
+        state = GameState(4)
+        occupancy = state.occupancy
+        self.assertEqual(occupancy.place(1, 8), (1, 7, 8))
+        self.assertTrue(occupancy.is_free(7))
+        self.assertEqual(state.occupants[8], 1)
+        self.assertEqual(occupancy.free_volcano_before(9), 6)
+        self.assertEqual(occupancy.free_volcano_before(1), 27)
+
+    # Test the game state fits in a few hundred bytes and shares its layout
+    def test_state_compact(self):
+        state = GameState(4)
+        other = GameState(4)
+        self.assertIs(state.lands, other.lands)
+        self.assertFalse(hasattr(state, "__dict__"))
+        size = sys.getsizeof(state) + sum(
+            sys.getsizeof(getattr(state, name)) for name in
+            ["animals", "deck_animals", "deck_steps", "positions",
+             "occupants", "revealed"])
+        self.assertLess(size, 1024)
+
+    # Test undoing every flip of a game restores each state, and redoing
+    # plays the same game again
+    def test_state_undo(self):
+        state = GameState(3, rng=GameRng(11))
+        rng = random.Random(5)
+        snapshots = []
+        results = []
+        while state.winner is None:
+            snapshots.append((list(state.positions), list(state.occupants),
+                              bytes(state.revealed), state.revealed_num,
+                              state.current_player))
+            results.append(state.apply_flip(rng.choice(state.hidden_cards())))
+        for snapshot in reversed(snapshots):
+            state.undo()
+            self.assertEqual((list(state.positions), list(state.occupants),
+                              bytes(state.revealed), state.revealed_num,
+                              state.current_player), snapshot)
+        self.assertIsNone(state.winner)
+        self.assertRaises(ValueError, state.undo)
+        for result in results:
+            self.assertEqual(state.redo(), result)
+        self.assertRaises(ValueError, state.redo)
+
+        # Flipping another chit card drops the flips undone
+        state.undo()
+        state.undo()
+        state.apply_flip(state.hidden_cards()[0])
+        self.assertEqual(state.undone, [])
+
+    # Test undoing and flipping on a copy leaves the journal of the game
+    # state copied unchanged
+    def test_state_copy_undo(self):
+        state = GameState(3, rng=GameRng(2))
+        rng = random.Random(2)
+        while not (state.history and state.history[-1][0].end_turn and
+                   state.history[-1][1].count(1) >= 2):
+            state.apply_flip(rng.choice(state.hidden_cards()))
+        journal = [(result, None if revealed is None else bytes(revealed))
+                   for result, revealed in state.history]
+        snapshot = (bytes(state.revealed), state.revealed_num,
+                    state.current_player)
+
+        copy = state.copy()
+        copy.undo()     # Back in the turn that ended
+        copy.apply_flip(copy.hidden_cards()[0])
+        self.assertEqual([(result, None if revealed is None
+                           else bytes(revealed))
+                          for result, revealed in state.history], journal)
+        self.assertEqual((bytes(state.revealed), state.revealed_num,
+                          state.current_player), snapshot)
+        state.undo()
+        self.assertEqual(state.revealed_num,
+                         len(state.revealed) - state.revealed.count(0))
+
+    # Test the search only knows the chit cards flipped, keeps to its
+    # budget and leaves the game state unchanged
+    def test_mcts_policy(self):
+        state = GameState(2, rng=GameRng(4))
+        first = state.hidden_cards()[0]
+        state.apply_flip(first)
+        known, unknown, pool = MctsPolicy.knowledge(state)
+        self.assertEqual(list(known), [first])
+        self.assertEqual(len(unknown), len(pool))
+        self.assertEqual(sorted(pool + list(known.values())),
+                         sorted(zip(state.deck_animals, state.deck_steps)))
+
+        snapshot = (list(state.positions), bytes(state.revealed),
+                    state.current_player, len(state.history))
+        stats = MctsPolicy.search(state, 1, 10, iterations=50)
+        self.assertEqual(sum(visits for visits, _ in stats.values()), 50)
+        self.assertTrue(set(stats) <= set(state.hidden_cards()))
+        self.assertEqual((list(state.positions), bytes(state.revealed),
+                          state.current_player, len(state.history)),
+                         snapshot)
+
+        policy = MctsPolicy(GameRng(1), budget=0.5)
+        start = time.perf_counter()
+        self.assertIn(policy.choose(state), state.hidden_cards())
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+        # A search started after the deadline of the move stops at once
+        stats = MctsPolicy.search(state, 1, 10, deadline=time.time())
+        self.assertEqual(sum(visits for visits, _ in stats.values()), 1)
+        # Workers spawned as in the game keep to the budget, even the
+        # first move which waits for them to start
+        policy = MctsPolicy(GameRng(1), budget=0.5, workers=2,
+                            mp_context=multiprocessing.get_context("spawn"))
+        policy.start()
+        for _ in range(2):
+            start = time.perf_counter()
+            self.assertIn(policy.choose(state), state.hidden_cards())
+            # The processes starting slow down this one, give it a frame
+            self.assertLess(time.perf_counter() - start, 0.55)
+        start = time.perf_counter()
+        policy.close()
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    # Test the transposition table keeps the deeper search of a slot,
+    # until a new move starts
+    def test_transposition_table(self):
+        table = TranspositionTable(4)
+        table.new_search()
+        table.store(0x21, 3, 1.5)
+        self.assertEqual(table.probe(0x21, 2), 1.5)
+        self.assertIsNone(table.probe(0x21, 4))
+        self.assertIsNone(table.probe(0x31, 1))
+        table.store(0x31, 2, 2.5)     # Same slot, shallower
+        self.assertEqual(table.probe(0x21, 3), 1.5)
+        table.new_search()
+        table.store(0x31, 2, 2.5)
+        self.assertEqual(table.probe(0x31, 2), 2.5)
+        self.assertIsNone(table.probe(0x21, 1))
+
+    # Test the expectimax player always flips a chit card he remembers
+    # when it wins the game
+    def test_expectimax_policy(self):
+        for seed in range(3):
+            state = GameState(2, rng=GameRng(seed))
+            player = RandomPolicy(GameRng(seed))
+            policy = ExpectimaxPolicy(GameRng(seed))
+            while state.winner is None:
+                known, _, _ = MctsPolicy.knowledge(state)
+                if any(state.copy().apply_flip(card).end_game
+                       for card in state.hidden_cards() if card in known):
+                    card = policy.choose(state)
+                    self.assertTrue(state.copy().apply_flip(card).end_game)
+                state.apply_flip(player.choose(state))
+
+    # Test a tournament plays every seat rotation, keeps the ratings
+    # balanced and goes on from its results file
+    def test_tournament(self):
+        entrants = ["random", "expectimax:depth=2", "expectimax"]
+        tournament = Tournament(entrants, workers=1)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "results.jsonl")
+            ratings = tournament.run(2, path, seed=1)
+            _, records = Tournament.load(path)
+            games = [record for record in records if "seats" in record]
+            self.assertEqual(len(games), 2 * 3 * 2)
+            first = [game["seats"] for game in games if game["key"][1] == 0]
+            self.assertEqual(first[0], first[1][::-1])
+            self.assertAlmostEqual(sum(ratings.ratings.values()),
+                                   len(entrants) * EloRatings.START)
+
+            # Cut the file in the middle of a game record
+            with open(path) as file:
+                lines = file.readlines()
+            with open(path, "w") as file:
+                file.writelines(lines[:6] + [lines[6][:10]])
+            resumed = tournament.run(2, path)
+            self.assertEqual(resumed.standings(), ratings.standings())
+            self.assertRaises(ValueError, Tournament(entrants[:2]).run, 2,
+                              path)
+
+    # Test the simulation plays every game and is repeatable with a seed
+    def test_simulation(self):
+        simulator = Simulator(3, workers=1)
+        stats = simulator.run(20, seed=7)
+        self.assertEqual(stats.games, 20)
+        self.assertEqual(sum(stats.wins) + stats.unfinished, 20)
+        self.assertEqual(sum(stats.turns.values()), sum(stats.wins))
+        self.assertEqual(simulator.run(20, seed=7).wins, stats.wins)
+
+    # Test the statistics do not depend on how games are split in batches,
+    # and a game can be played again from its seed
+    def test_simulation_streams(self):
+        stats = Simulator(2, workers=1).run(12, seed=3)
+        batch_size = Simulator.BATCH_SIZE
+        Simulator.BATCH_SIZE = 5
+        try:
+            split = Simulator(2, workers=1).run(12, seed=3)
+        finally:
+            Simulator.BATCH_SIZE = batch_size
+        self.assertEqual((split.wins, split.turns, split.longest),
+                         (stats.wins, stats.turns, stats.longest))
+        turns, seed = stats.longest
+        _, counts = Simulator.play_game(2, 24, 4, "random", seed)
+        self.assertEqual(counts[0], turns)
+
+    # Test a game with the same seed has the same board and chit cards
+    def test_seeded_game(self):
+        window = pygame.display.set_mode((800, 800))
+        page_controller = PageController(Main())
+        game = Game(page_controller, window, 4, seed=42)
+        again = Game(page_controller, window, 4, seed=42)
+        self.assertEqual(game.state.seed, 42)
+        self.assertEqual(list(game.state.animals), list(again.state.animals))
+        self.assertEqual(game.state.deck, again.state.deck)
+        self.assertEqual([land.get_animal() for land in game.gameboard.get_board()],
+                         [land.get_animal() for land in again.gameboard.get_board()])
+
+    # Test a large board of many players is drawn on a spiral in the window
+    def test_large_board(self):
+        window = pygame.display.set_mode((800, 600))
+        page_controller = PageController(Main())
+        game = Game(page_controller, window, 16, 960, 16, seed=3)
+        board = game.gameboard.get_board()
+        self.assertEqual([land.get_animal().value for land in board],
+                         list(game.state.animals))
+        self.assertEqual(len(game.chit_cards), 16 * 3 + 4)
+        self.assertLess(game.gameboard.tile_ratio, 1)
+        self.assertTrue(all(window.get_rect().collidepoint(land.get_pos())
+                            for land in board))
+        # Tinted images are made once and shared by the tiles of an animal
+        volcanoes = [land for land in board
+                     if land.get_animal() == AnimalType.ANIMAL_16]
+        self.assertIs(volcanoes[0].image, volcanoes[1].image)
+        for i in range(GameState.MAX_ANIMALS):
+            self.assertEqual(AnimalType.animal(i).index(), i)
+
+    # Test a zoomed camera only draws the tiles it shows
+    def test_camera(self):
+        window = pygame.display.set_mode((800, 600))
+        camera = Camera(800, 600, 40)
+        self.assertTrue(camera.is_home())
+        self.assertEqual(camera.to_screen(123, 45), (123, 45))
+        # The position under the mouse stays in place
+        self.assertTrue(camera.zoom_at(3, 600, 100))
+        self.assertAlmostEqual(camera.to_world(600, 100)[0], 600)
+        self.assertAlmostEqual(camera.to_world(600, 100)[1], 100)
+        # The whole gameboard is shown when not zoomed
+        self.assertTrue(camera.zoom_at(-3, 0, 0))
+        self.assertTrue(camera.is_home())
+        self.assertFalse(camera.pan(10, 0))
+
+        page_controller = PageController(Main())
+        game = Game(page_controller, window, 4, 960, 8, seed=3)
+        gameboard = game.gameboard
+        camera = game.camera
+        x, y = gameboard.get_board()[0].get_pos()
+        camera.zoom_at(12, *camera.to_screen(x, y))
+        visible = gameboard.get_visible_tiles(camera)
+        self.assertIn(gameboard.get_board()[0], visible)
+        self.assertLess(len(visible), len(gameboard.get_board()) // 10)
+        viewport = camera.get_viewport()
+        self.assertEqual(visible, [tile for tile in gameboard.tiles
+                                   if viewport.colliderect(tile.get_rect())])
+        # The zoomed images are made once per zoom level
+        gameboard.draw(camera)
+        self.assertIs(visible[0].get_image(camera.zoom),
+                      visible[0].get_image(camera.zoom))
+
+    # Test a game played again from its replay log ends the same, and
+    # seeking from a keyframe finds the state of the game at that turn
+    def test_replay_log(self):
+        state = GameState(4, rng=GameRng(11))
+        rng = random.Random(11)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "game.fdr")
+            writer = ReplayWriter(path, state, keyframe_turns=4)
+            turns = [(state.current_player, tuple(state.positions))]
+            while state.winner is None:
+                result = state.apply_flip(rng.choice(state.hidden_cards()))
+                writer.record(result)
+                if result.end_turn:
+                    turns.append((state.current_player,
+                                  tuple(state.positions)))
+            writer.close()
+            replay = Replay.load(path)
+
+        self.assertGreater(len(replay.keyframes), 1)
+        played = replay.play()
+        self.assertEqual(played.winner, state.winner)
+        self.assertEqual(list(played.positions), list(state.positions))
+        for turn in range(replay.turn_num):
+            seeked = replay.state_at(turn)
+            self.assertEqual((seeked.current_player,
+                              tuple(seeked.positions)), turns[turn])
+        with self.assertRaises(ValueError):
+            replay.state_at(replay.turn_num)
+
+        # A log cut off in a record is read up to the last turn ended
+        for cut in range(1, 4):
+            truncated = Replay(replay.data[:-cut])
+            self.assertTrue(truncated.truncated)
+            self.assertEqual(truncated.turn_starts,
+                             replay.turn_starts[:truncated.turn_num])
+            self.assertEqual(truncated.flip_num, truncated.turn_starts[-1])
+            self.assertEqual(list(truncated.play().positions),
+                             list(replay.state_at(truncated.turn_num - 1)
+                                  .positions))
+        self.assertFalse(replay.truncated)
+        with self.assertRaises(ValueError):
+            Replay(replay.data[:ReplayLog.HEADER.size + 3])
+
+        # The seed must fit in the header, no log is made otherwise
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "game.fdr")
+            for seed in (-1, ReplayLog.MAX_SEED):
+                with self.assertRaises(ValueError):
+                    ReplayWriter(path, GameState(4, rng=GameRng(seed)))
+                self.assertFalse(os.path.exists(path))
+
+        # A log that does not match the rules is caught
+        data = bytearray(replay.data)
+        flip = replay.offsets[-1]
+        data[flip + 1] ^= ReplayLog.END_GAME
+        with self.assertRaises(ValueError):
+            Replay(bytes(data)).play()
+
+    # Test the lockstep simulator plays the same moves as the game state
+    @unittest.skipIf(BatchSimulator is None, "NumPy is not installed")
+    def test_batch_simulator(self):
+        states = [GameState(4) for _ in range(20)]
+        batch = BatchSimulator.from_states(states)
+        for _ in range(300):
+            cards = [0] * len(states)
+            for i, state in enumerate(states):
+                if not state.is_over():
+                    cards[i] = state.hidden_cards()[0]
+                    state.apply_flip(cards[i])
+            batch.step(cards)
+        for i, state in enumerate(states):
+            self.assertEqual(list(batch.positions[i]), list(state.positions))
+            self.assertEqual(list(batch.occupants[i]), list(state.occupants))
+            self.assertEqual(batch.current[i], state.current_player)
+        # Chit cards are picked at random from 16 at most
+        with self.assertRaises(ValueError):
+            BatchSimulator(2, 48, 8)
+
+    # Test the turns computed by the solver add up
+    @unittest.skipIf(RaceSolver is None, "SciPy is not installed")
+    def test_race_solver(self):
+        solver = RaceSolver(GameState(1))
+        for pos in [0, 3, 27]:
+            self.assertAlmostEqual(sum(solver.turn_outcomes(0, pos).values()), 1)
+        # A player in his cave flipping a dragon pirate does not move
+        self.assertGreater(solver.turn_outcomes(0, 0)[0], 0)
+        finish = solver.finish_distribution(0, 5000)
+        self.assertAlmostEqual(finish.sum(), 1, places=4)
+        mean = sum((turn + 1) * p for turn, p in enumerate(finish))
+        self.assertAlmostEqual(solver.expected_turns(0), mean, places=1)
+        self.assertAlmostEqual(solver.win_probabilities(5000)[0], 1, places=4)
+
+    # Test the game state does not need pygame
+    def test_state_headless(self):
+        code = ("import sys; import engine.game_state; "
+                "sys.exit('pygame' in sys.modules)")
+        self.assertEqual(subprocess.call([sys.executable, "-c", code],
+                                         cwd=os.path.dirname(os.path.abspath(__file__))), 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
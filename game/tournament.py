@@ -0,0 +1,52 @@
+from engine.tournament import Tournament
+
+import argparse
+import time
+
+
+if __name__ == "__main__":
+    # Run from the game folder, or with its path:
+    #     python Project/game/tournament.py random expectimax mcts:budget=0.1
+    parser = argparse.ArgumentParser(
+        description="Play bots against each other without display and "
+                    "rate them with Elo ratings.")
+    parser.add_argument("entrants", nargs="+",
+                        help="the policies playing, with their parameters "
+                             "such as mcts:budget=0.1,workers=1")
+    parser.add_argument("--rounds", type=int, default=10,
+                        help="the number of rounds")
+    parser.add_argument("--pairing", choices=Tournament.PAIRINGS,
+                        default="round-robin",
+                        help="how the entrants playing together are picked "
+                             "each round")
+    parser.add_argument("--players", type=int, default=2,
+                        help="the number of players of a game")
+    parser.add_argument("--size", type=int, default=24,
+                        help="the number of volcanoes")
+    parser.add_argument("--animals", type=int, default=4,
+                        help="the number of animal types on the volcanoes")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="the number of processes, one per core if "
+                             "not given")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="the seed to repeat a tournament")
+    parser.add_argument("--results", default="tournament.jsonl",
+                        help="the file the games are written to, a "
+                             "tournament stopped goes on from it")
+    args = parser.parse_args()
+
+    try:
+        tournament = Tournament(args.entrants, args.players, args.size,
+                                args.animals, args.pairing, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+    start = time.perf_counter()
+    try:
+        ratings = tournament.run(args.rounds, args.results, args.seed)
+    except ValueError as error:
+        parser.error(f"{error}, use another --results file")
+    except KeyboardInterrupt:
+        parser.exit(1, f"Stopped, run again to go on from {args.results}\n")
+    ratings.report()
+    print(f"{args.rounds} rounds in {time.perf_counter() - start:.2f} s, "
+          f"results in {args.results}")